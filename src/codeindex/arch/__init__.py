@@ -1,7 +1,8 @@
 from __future__ import annotations
+
 import asyncio
-from dataclasses import dataclass
 import os
+from dataclasses import dataclass
 from pathlib import Path
 
 from ..logger import logger
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import json
 import os
+import re
 from dataclasses import dataclass, field
 from functools import cached_property
 from pathlib import Path
-import re
+
 from ..store import load_jsonl
 
 
@@ -42,7 +43,7 @@ class ArchBuilder:
         self.component_by_pkg, self.components = self._map_components()
 
     @classmethod
-    def from_index(cls, index_dir: os.PathLike[str] | str) -> "ArchBuilder":
+    def from_index(cls, index_dir: os.PathLike[str] | str) -> ArchBuilder:
         index_path = _ensure_path(index_dir)
         nodes = {}
         nodes_file = index_path / "nodes.jsonl"
@@ -290,7 +291,7 @@ class ArchBuilder:
                 continue
             if any(tok in path for tok in ("/routes/", "router", "api/")):
                 tags.add("api")
-            if path.endswith(".tsx") or path.endswith(".jsx") or "components/" in path:
+            if path.endswith((".tsx", ".jsx")) or "components/" in path:
                 tags.add("frontend")
             if "worker" in path or "workflow" in path or "temporal" in path:
                 tags.add("worker")
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import re
+from collections import defaultdict
 from pathlib import Path
 
-from collections import defaultdict
 from .builder import ArchBuilder
 
 
@@ -84,7 +84,7 @@ def write_connectivity_mermaid(
     Produce a higher-level diagram that clusters components by inferred role tags.
     """
     role_clusters = defaultdict(set)
-    for comp, packages in builder.components.items():
+    for comp in builder.components:
         tags = builder.component_role_tags(comp)
         if not tags:
             role_clusters["other"].add(comp)
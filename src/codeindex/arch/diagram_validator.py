@@ -1,10 +1,9 @@
 from __future__ import annotations
 
+import re
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
-import re
-from typing import Iterable, Mapping
-
 
 _GRAPH_HEADER_RE = re.compile(r"^\s*graph\s+(?:LR|TD|RL|BT)\b", re.IGNORECASE)
 _NODE_ID_RE = re.compile(r"^\s*([A-Za-z][\w\-]*)\s*(.*)$")
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from collections.abc import Iterable
 from pathlib import Path
-from typing import Iterable
 
 from .builder import ArchBuilder, ArchNode
 from .flows import FlowSummary
@@ -101,7 +101,7 @@ def _infer_component_roles(component: str, nodes: Iterable[ArchNode]) -> list[st
             continue
         if "routes" in path or "router" in path or "api/" in path:
             tags.add("api")
-        if path.endswith(".tsx") or path.endswith(".jsx") or "components/" in path:
+        if path.endswith((".tsx", ".jsx")) or "components/" in path:
             tags.add("frontend")
         if "/worker" in path or "/workflow" in path:
             tags.add("worker")
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List
 
 from .builder import ArchBuilder, ArchNode
 
@@ -34,7 +33,7 @@ def extract_flows(
     builder: ArchBuilder, limit_per_component: int = 12
 ) -> list[FlowSummary]:
     """Heuristically identify important entry points and their immediate call fan-out."""
-    flows_by_component: Dict[str, List[FlowSummary]] = {}
+    flows_by_component: dict[str, list[FlowSummary]] = {}
     seen: set[str] = set()
 
     def record(node: ArchNode, category: str):
@@ -72,9 +71,8 @@ def extract_flows(
         parent = builder.nodes_by_id.get(node.parent_id) if node.parent_id else None
         if parent and parent.kind not in ("file", "class"):
             continue
-        if not parent or parent.kind == "file":
-            if _looks_like_entry(node):
-                record(node, _classify_category(node.path or "", node.symbol or ""))
+        if (not parent or parent.kind == "file") and _looks_like_entry(node):
+            record(node, _classify_category(node.path or "", node.symbol or ""))
         if (
             parent
             and parent.kind == "file"
@@ -84,7 +82,7 @@ def extract_flows(
 
     # Trim per component
     final: list[FlowSummary] = []
-    for component, summaries in flows_by_component.items():
+    for summaries in flows_by_component.values():
         summaries.sort(
             key=lambda s: (
                 _category_rank(s.category),
@@ -129,9 +127,7 @@ def _looks_like_entry(node: ArchNode) -> bool:
         return True
     if any(token in path for token in ("workflow", "worker", "routes", "cli")):
         return True
-    if sym.startswith("handle_") or sym.endswith("_handler"):
-        return True
-    return False
+    return sym.startswith("handle_") or sym.endswith("_handler")
 
 
 def _collect_calls(builder: ArchBuilder, node_id: str) -> list[str]:
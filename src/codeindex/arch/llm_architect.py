@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any
 
 from ..logger import logger
 from .builder import ArchBuilder
@@ -45,7 +45,7 @@ class LLMArchitect:
             required_coverage=config.coverage_threshold,
         )
         self.uses_llm = config.diagram_mode != "deterministic"
-        self.client: Optional[LLMClient] = None
+        self.client: LLMClient | None = None
         if self.uses_llm:
             self.client = LLMClient(
                 LLMConfig(
@@ -57,7 +57,7 @@ class LLMArchitect:
                     stub_enabled=config.stub,
                 )
             )
-        self.last_summary: Optional[DiagramValidationSummary] = None
+        self.last_summary: DiagramValidationSummary | None = None
 
     async def generate(self) -> None:
         docs_dir = self.config.out_dir / "docs"
@@ -65,11 +65,10 @@ class LLMArchitect:
         docs_dir.mkdir(parents=True, exist_ok=True)
         diagrams_dir.mkdir(parents=True, exist_ok=True)
 
-        contexts: Dict[str, Dict[str, Any]] = {}
+        contexts: dict[str, dict[str, Any]] = {}
         component_deps_raw = self.builder.component_dependencies()
         component_deps = {
-            component: sorted(list(deps))
-            for component, deps in component_deps_raw.items()
+            component: sorted(deps) for component, deps in component_deps_raw.items()
         }
 
         if self.config.diagram_mode == "deterministic" or not self.uses_llm:
@@ -80,8 +79,8 @@ class LLMArchitect:
             return
 
         (docs_dir / "components").mkdir(exist_ok=True)
-        component_diagrams: Dict[str, str] = {}
-        diagram_paths: Dict[str, Path] = {}
+        component_diagrams: dict[str, str] = {}
+        diagram_paths: dict[str, Path] = {}
 
         for component in self.component_names:
             context = self._build_component_context(component, component_deps)
@@ -133,8 +132,8 @@ class LLMArchitect:
         (docs_dir / "index.md").write_text(overview, encoding="utf-8")
 
     def _build_component_context(
-        self, component: str, component_deps: Dict[str, List[str]]
-    ) -> Dict[str, Any]:
+        self, component: str, component_deps: dict[str, list[str]]
+    ) -> dict[str, Any]:
         packages = [
             self.builder.packages[pkg_id].path
             for pkg_id in self.builder.components.get(component, [])
@@ -156,7 +155,7 @@ class LLMArchitect:
             for f in select_important_files(self.builder.component_files(component))
         ]
 
-        context: Dict[str, Any] = {
+        context: dict[str, Any] = {
             "name": component,
             "packages": packages[:20],
             "stats": stats,
@@ -170,7 +169,7 @@ class LLMArchitect:
     async def _render_component(
         self,
         component: str,
-        context: Dict[str, Any],
+        context: dict[str, Any],
         *,
         feedback: str | None = None,
     ) -> tuple[str, str]:
@@ -187,7 +186,7 @@ class LLMArchitect:
 
     async def _render_system_diagram(
         self,
-        contexts: Dict[str, Dict[str, Any]],
+        contexts: dict[str, dict[str, Any]],
         *,
         feedback: str | None = None,
     ) -> str:
@@ -212,9 +211,9 @@ class LLMArchitect:
 
     async def _redraft_diagrams(
         self,
-        contexts: Dict[str, Dict[str, Any]],
-        component_diagrams: Dict[str, str],
-        diagram_paths: Dict[str, Path],
+        contexts: dict[str, dict[str, Any]],
+        component_diagrams: dict[str, str],
+        diagram_paths: dict[str, Path],
         docs_dir: Path,
         diagrams_dir: Path,
         summary: DiagramValidationSummary,
@@ -260,12 +259,12 @@ class LLMArchitect:
             )
         return updated_summary
 
-    def _build_feedback(self, summary: DiagramValidationSummary) -> Dict[str, str]:
-        feedback: Dict[str, str] = {}
+    def _build_feedback(self, summary: DiagramValidationSummary) -> dict[str, str]:
+        feedback: dict[str, str] = {}
         allowed = ", ".join(sorted(self.validator.allowed_nodes))
 
         for result in summary.results:
-            reasons: List[str] = []
+            reasons: list[str] = []
             if result.errors:
                 reasons.extend(result.errors)
             if result.invalid_nodes:
@@ -305,14 +304,14 @@ class LLMArchitect:
         self,
         docs_dir: Path,
         diagrams_dir: Path,
-        component_deps: Dict[str, List[str]],
+        component_deps: dict[str, list[str]],
         *,
-        contexts: Dict[str, Dict[str, Any]] | None = None,
+        contexts: dict[str, dict[str, Any]] | None = None,
     ) -> DiagramValidationSummary:
         contexts = contexts or {}
         (docs_dir / "components").mkdir(exist_ok=True)
-        component_diagrams: Dict[str, str] = {}
-        diagram_paths: Dict[str, Path] = {}
+        component_diagrams: dict[str, str] = {}
+        diagram_paths: dict[str, Path] = {}
 
         for component in self.component_names:
             context = contexts.get(component)
@@ -345,7 +344,7 @@ class LLMArchitect:
         (docs_dir / "index.md").write_text(overview, encoding="utf-8")
         return summary
 
-    def _deterministic_component_doc(self, context: Dict[str, Any]) -> str:
+    def _deterministic_component_doc(self, context: dict[str, Any]) -> str:
         name = context["name"]
         roles = ", ".join(context.get("roles", [])) or "unknown"
         stats = context.get("stats", {})
@@ -374,7 +373,7 @@ class LLMArchitect:
         return "\n".join(lines)
 
     def _deterministic_component_diagram(
-        self, component: str, context: Dict[str, Any]
+        self, component: str, context: dict[str, Any]
     ) -> str:
         allowed = set(self.validator.allowed_nodes)
         lines = ["graph TD", f'    {component}["{component}"]']
@@ -394,7 +393,7 @@ class LLMArchitect:
         return "\n".join(lines) + "\n"
 
     def _deterministic_system_diagram(
-        self, component_deps: Dict[str, List[str]]
+        self, component_deps: dict[str, list[str]]
     ) -> str:
         lines = ["graph TD"]
         for comp in self.component_names:
@@ -414,7 +413,7 @@ class LLMArchitect:
                 lines.append(f"    {src} --> {dst}")
         return "\n".join(lines) + "\n"
 
-    def _deterministic_overview_doc(self, contexts: Dict[str, Dict[str, Any]]) -> str:
+    def _deterministic_overview_doc(self, contexts: dict[str, dict[str, Any]]) -> str:
         lines = ["# Repository Overview", ""]
         lines.append("## Components")
         lines.append("")
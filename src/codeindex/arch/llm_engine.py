@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass
 import re
-from typing import Any, Dict, List, Sequence
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
 
 from ..logger import logger
 
@@ -50,11 +51,11 @@ class LLMClient:
 
     async def component_doc(
         self,
-        context: Dict[str, Any],
+        context: dict[str, Any],
         *,
         allowed_nodes: Sequence[str] | None = None,
         feedback: str | None = None,
-    ) -> Dict[str, str]:
+    ) -> dict[str, str]:
         if self.stub:
             return self._stub_component_doc(context, allowed_nodes=allowed_nodes)
 
@@ -64,7 +65,7 @@ class LLMClient:
             "feedback": feedback,
         }
         prompt = json.dumps(payload, ensure_ascii=False)
-        messages: List[Dict[str, str]] = [
+        messages: list[dict[str, str]] = [
             {
                 "role": "system",
                 "content": (
@@ -96,7 +97,8 @@ class LLMClient:
         except json.JSONDecodeError as exc:
             raise RuntimeError(f"LLM response was not valid JSON: {response}") from exc
         if not isinstance(data, dict):
-            raise RuntimeError("LLM response must be a JSON object.")
+            # Bad LLM output, reported like the JSON error above.
+            raise RuntimeError("LLM response must be a JSON object.")  # noqa: TRY004
         return {
             "documentation_md": data.get("documentation_md", "").strip(),
             "diagram_mermaid": data.get("diagram_mermaid", "").strip(),
@@ -104,7 +106,7 @@ class LLMClient:
 
     async def overview_diagram(
         self,
-        components: Sequence[Dict[str, Any]],
+        components: Sequence[dict[str, Any]],
         *,
         allowed_nodes: Sequence[str],
         feedback: str | None = None,
@@ -143,7 +145,7 @@ class LLMClient:
         response = await self._complete(messages)
         return response.strip()
 
-    async def overview_doc(self, components: List[Dict[str, Any]]) -> str:
+    async def overview_doc(self, components: list[dict[str, Any]]) -> str:
         if self.stub:
             lines = ["# Repository Overview", ""]
             for comp in components:
@@ -172,7 +174,7 @@ class LLMClient:
         raw = _sanitize_json_like(raw) if raw.strip().startswith("{") else raw
         return raw.strip() + "\n"
 
-    async def _complete(self, messages: List[Dict[str, str]]) -> str:
+    async def _complete(self, messages: list[dict[str, str]]) -> str:
         self._ensure_client()
         logger.debug(
             "LLM request: model=%s tokens=%d",
@@ -180,7 +182,7 @@ class LLMClient:
             self.config.max_completion_tokens,
         )
         is_reasoning_model = "gpt-5" in self.config.model.lower()
-        params: Dict[str, Any] = {
+        params: dict[str, Any] = {
             "model": self.config.model,
             "messages": messages,
             "max_completion_tokens": self.config.max_completion_tokens,
@@ -198,8 +200,8 @@ class LLMClient:
         return completion.choices[0].message.content or ""
 
     def _stub_component_doc(
-        self, context: Dict[str, Any], *, allowed_nodes: Sequence[str] | None = None
-    ) -> Dict[str, str]:
+        self, context: dict[str, Any], *, allowed_nodes: Sequence[str] | None = None
+    ) -> dict[str, str]:
         name = context.get("name", "component")
         deps = ", ".join(context.get("dependencies", [])) or "none"
         dependents = ", ".join(context.get("dependents", [])) or "none"
@@ -232,7 +234,7 @@ class LLMClient:
 
     def _stub_overview_diagram(
         self,
-        components: Sequence[Dict[str, Any]],
+        components: Sequence[dict[str, Any]],
         *,
         allowed_nodes: Sequence[str],
     ) -> str:
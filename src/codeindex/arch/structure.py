@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
 
 from .builder import ArchBuilder, ArchNode
 
@@ -31,7 +31,7 @@ class DirectorySummary:
     role_tags: list[str] = field(default_factory=list)
     stats: dict[str, int] = field(default_factory=dict)
     important: list[ImportantFile] = field(default_factory=list)
-    children: list["DirectorySummary"] = field(default_factory=list)
+    children: list[DirectorySummary] = field(default_factory=list)
 
     def to_dict(self) -> dict:
         return {
@@ -135,9 +135,7 @@ def _infer_role_tags(pkg: ArchNode, files: Iterable[ArchNode]) -> set[str]:
         for name in file_names
     ):
         tags.add("search")
-    if any(
-        name.endswith("_routes.py") or name.endswith("_api.py") for name in file_names
-    ):
+    if any(name.endswith(("_routes.py", "_api.py")) for name in file_names):
         tags.add("web")
     return tags
 
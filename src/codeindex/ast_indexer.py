@@ -3,7 +3,7 @@ from __future__ import annotations
 import ast
 import hashlib
 import os
-import textwrap
+from collections.abc import Iterator
 from typing import Any
 
 from .logger import logger
@@ -16,27 +16,45 @@ from .nodes import (
     NodeKind,
 )
 
-
 DEFAULT_CALLSITE_CAP = 200
+# Bump when the emitted nodes/edges change so cached per-file results are dropped.
+INDEXER_VERSION = 3
 
 
 def stable_id(
     kind: str,
-    path: str,
+    path: str | bytes,
     symbol: str | None,
     start: int | None,
     end: int | None,
 ) -> str:
-    s = f"{kind}\t{path}\t{symbol or ''}\t{start or 0}\t{end or 0}"
-    import hashlib
-
-    return hashlib.sha1(s.encode()).hexdigest()
+    # ``path`` may be passed pre-encoded; indexers reuse one encoding per file.
+    if isinstance(path, str):
+        path = path.encode()
+    buf = b"%s\t%s\t%s\t%d\t%d" % (
+        kind.encode(),
+        path,
+        (symbol or "").encode(),
+        start or 0,
+        end or 0,
+    )
+    return hashlib.sha1(buf).hexdigest()
+
+
+def count_lines(text: str | bytes) -> int:
+    """Number of lines in ``text``, as ``len(text.splitlines())`` counts them for
+    ``\n``/``\r\n`` line endings, without building the list."""
+    nl = "\n" if isinstance(text, str) else b"\n"
+    return text.count(nl) + (1 if text and not text.endswith(nl) else 0)
 
 
 def first_line(s: str | None) -> str | None:
+    # Docstrings arrive cleaned by ast.get_docstring, so no dedent is needed.
     if not s:
         return None
-    return textwrap.dedent(s).strip().splitlines()[0][:400]
+    s = s.strip()
+    i = s.find("\n")
+    return (s if i < 0 else s[:i])[:400] or None
 
 
 class PyFileIndexer(ast.NodeVisitor):
@@ -49,6 +67,7 @@ class PyFileIndexer(ast.NodeVisitor):
         call_cap: int = DEFAULT_CALLSITE_CAP,
     ):
         self.rel_path = rel_path
+        self._rel_path_b = rel_path.encode()
         self.text = file_text
         self.nodes: list[Node] = []
         self.edges: list[dict[str, Any]] = []
@@ -70,6 +89,8 @@ class PyFileIndexer(ast.NodeVisitor):
         }
         self.file_node: Node | None = None
         self.class_stack: list[str] = []
+        # The AST is never mutated while indexing, so node identity is a safe key.
+        self._unparse_cache: dict[int, str | None] = {}
 
     def parent_id(self) -> str | None:
         return self.stack[-1] if self.stack else None
@@ -86,7 +107,7 @@ class PyFileIndexer(ast.NodeVisitor):
         start = getattr(node, "lineno", None)
         end = getattr(node, "end_lineno", None) or start
         n = Node(
-            node_id=stable_id(kind.value, self.rel_path, name, start, end),
+            node_id=stable_id(kind.value, self._rel_path_b, name, start, end),
             parent_id=self.parent_id(),
             kind=kind,
             path=self.rel_path,
@@ -107,9 +128,10 @@ class PyFileIndexer(ast.NodeVisitor):
     def index(
         self,
     ) -> tuple[list[Node], list[dict[str, Any]], list[CallsiteRecord], dict[str, int]]:
-        tree = ast.parse(self.text)
+        # Only positions are consumed downstream; keep the parser off type comments.
+        tree = ast.parse(self.text, filename=self.rel_path, type_comments=False)
         mod_doc = ast.get_docstring(tree)
-        total_lines = len(self.text.splitlines())
+        total_lines = count_lines(self.text)
         fnode_extra = None
         if self.enrich:
             fnode_extra = {
@@ -119,7 +141,7 @@ class PyFileIndexer(ast.NodeVisitor):
                 }
             }
         fnode = Node(
-            node_id=stable_id("file", self.rel_path, None, 1, total_lines),
+            node_id=stable_id("file", self._rel_path_b, None, 1, total_lines),
             parent_id=None,
             kind=NodeKind.FILE,
             path=self.rel_path,
@@ -138,12 +160,12 @@ class PyFileIndexer(ast.NodeVisitor):
         super().generic_visit(tree)
         self.stack.pop()
         self._collect_import_edges(tree, fnode)
-        for fn_id, names in self.calls.items():
-            for nm in sorted(names):
-                dst = self.defined_symbols.get(nm, nm)
-                self.edges.append(
-                    {"src": fn_id, "dst": dst, "type": "call", "detail": nm}
-                )
+        defined = self.defined_symbols
+        self.edges.extend(
+            {"src": fn_id, "dst": defined.get(nm, nm), "type": "call", "detail": nm}
+            for fn_id, names in self.calls.items()
+            for nm in sorted(names)
+        )
         return self.nodes, self.edges, self.callsites, self.stats
 
     def visit_ClassDef(self, node: ast.ClassDef):
@@ -248,9 +270,7 @@ class PyFileIndexer(ast.NodeVisitor):
         names: set[str] = set()
         call_records: list[CallsiteRecord] = []
 
-        for call in ast.walk(node):
-            if not isinstance(call, ast.Call):
-                continue
+        for call in self._iter_own_calls(node):
             edge_symbol, display_symbol = self._symbol_from_call(call)
             if edge_symbol is None and display_symbol is None:
                 continue
@@ -327,18 +347,15 @@ class PyFileIndexer(ast.NodeVisitor):
         if isinstance(func, ast.Name):
             return func.id, func.id
         if isinstance(func, ast.Attribute):
-            try:
-                display = ast.unparse(func)
-            except Exception:
-                display = func.attr
-            return func.attr, display
+            return func.attr, self._expr_to_str(func) or func.attr
         return None, None
 
     def _collect_import_edges(self, tree: ast.AST, file_node: Node) -> None:
+        emit = self.edges.append
         for node in ast.walk(tree):
             if isinstance(node, ast.Import):
                 for alias in node.names:
-                    self.edges.append(
+                    emit(
                         {
                             "src": file_node.node_id,
                             "dst": alias.name,
@@ -350,7 +367,7 @@ class PyFileIndexer(ast.NodeVisitor):
                 module = node.module or ""
                 for alias in node.names:
                     qual = f"{module}.{alias.name}" if module else alias.name
-                    self.edges.append(
+                    emit(
                         {
                             "src": file_node.node_id,
                             "dst": qual,
@@ -362,10 +379,17 @@ class PyFileIndexer(ast.NodeVisitor):
     def _expr_to_str(self, node: ast.AST | None) -> str | None:
         if node is None:
             return None
+        key = id(node)
         try:
-            return ast.unparse(node)
-        except Exception:
-            return None
+            return self._unparse_cache[key]
+        except KeyError:
+            pass
+        try:
+            text = ast.unparse(node)
+        except (ValueError, TypeError, AttributeError, RecursionError):
+            text = None
+        self._unparse_cache[key] = text
+        return text
 
     def _visibility(self, name: str) -> str:
         if name.startswith("__") and not name.endswith("__"):
@@ -374,6 +398,29 @@ class PyFileIndexer(ast.NodeVisitor):
             return "protected"
         return "public"
 
+    @staticmethod
+    def _iter_own_calls(node: ast.AST) -> Iterator[ast.Call]:
+        """Yield calls attributed to ``node`` in source order.
+
+        Nested ``def``/``lambda`` bodies are pruned; they run in their own
+        scope. Their decorators, defaults and annotations are still walked,
+        as are ``node``'s own.
+        """
+        stack: list[ast.AST] = list(reversed(list(ast.iter_child_nodes(node))))
+        while stack:
+            cur = stack.pop()
+            if isinstance(cur, ast.Call):
+                yield cur
+            if isinstance(cur, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                children = [*cur.decorator_list, cur.args]
+                if cur.returns is not None:
+                    children.append(cur.returns)
+            elif isinstance(cur, ast.Lambda):
+                children = [cur.args]
+            else:
+                children = list(ast.iter_child_nodes(cur))
+            stack.extend(reversed(children))
+
     def _collect_raises(self, node: ast.AST) -> list[str]:
         if not self.enrich:
             return []
@@ -390,13 +437,19 @@ class PyFileIndexer(ast.NodeVisitor):
         return sorted(seen)
 
     def _is_generator(self, node: ast.AST) -> bool:
-        for child in ast.walk(node):
-            if isinstance(child, (ast.Yield, ast.YieldFrom)):
+        # Yields inside nested defs/lambdas belong to those scopes.
+        stack: list[ast.AST] = list(getattr(node, "body", []))
+        while stack:
+            cur = stack.pop()
+            if isinstance(cur, (ast.Yield, ast.YieldFrom)):
                 return True
+            if isinstance(cur, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+                continue
+            stack.extend(ast.iter_child_nodes(cur))
         return False
 
     def _format_params(self, node: ast.AST) -> tuple[str, list[FunctionParam]]:
-        arguments: ast.arguments = getattr(node, "args")  # type: ignore[assignment]
+        arguments: ast.arguments = node.args  # type: ignore[attr-defined]
         params_meta: list[FunctionParam] = []
         parts: list[str] = []
 
@@ -1,97 +1,284 @@
 from __future__ import annotations
 
-import json
+import heapq
 import math
+import mmap
 import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from operator import itemgetter
 
-from .tokens import tokenize
+from .store import json_dumps, json_loads
+from .tokens import tokenize, tokenize_many
+
+BM25_FILENAME = "bm25.bin"
+LEGACY_BM25_FILENAME = "bm25.json"
+_MAGIC = b"CIBM25\x00\x01"
 
 
 class BM25Index:
+    """Okapi BM25 over node texts.
+
+    Documents are buffered as term-frequency dicts by ``add_doc`` and packed
+    by ``finalize`` into int32 CSR arrays: ``indptr[i]:indptr[i + 1]`` slices
+    ``term_ids``/``tfs`` for document ``i``, with terms mapped through
+    ``vocab``. The transposed postings (``post_indptr``/``post_docs``/
+    ``post_tfs``, one slice per term id) drive ``search``.
+    """
+
+    _ARRAYS = ("df", "doc_len", "indptr", "term_ids", "tfs")
+    _POSTING_ARRAYS = ("post_indptr", "post_docs", "post_tfs")
+
     def __init__(self, k1: float = 1.5, b: float = 0.75):
         self.k1 = k1
         self.b = b
         self.N = 0
         self.avgdl = 0.0
-        self.df: dict[str, int] = {}
-        self.docs: dict[str, dict] = {}
+        self.vocab: dict[str, int] = {}
+        self.doc_ids: list[str] = []
+        self.df = array("i")
+        self.doc_len = array("i")
+        self.indptr = array("i", [0])
+        self.term_ids = array("i")
+        self.tfs = array("i")
+        self.post_indptr = array("i", [0])
+        self.post_docs = array("i")
+        self.post_tfs = array("i")
+        self._doc_index: dict[str, int] = {}
+        self._idf: list[float] = []
+        self._norm: list[float] = []
+        self._pending: dict[str, tuple[int, dict[str, int]]] = {}
 
     def add_doc(self, doc_id: str, text: str, limit_terms: int | None = 300):
-        tokens = tokenize(text)
-        tf: dict[str, int] = {}
-        for t in tokens:
-            tf[t] = tf.get(t, 0) + 1
+        self._add_tokens(doc_id, tokenize(text), limit_terms)
+
+    def add_docs_batch(
+        self,
+        doc_ids: Sequence[str],
+        texts: Sequence[str],
+        limit_terms: int | None = 300,
+    ):
+        for doc_id, tokens in zip(doc_ids, tokenize_many(texts)):
+            self._add_tokens(doc_id, tokens, limit_terms)
+
+    def _add_tokens(self, doc_id: str, tokens: list[str], limit_terms: int | None):
+        # Counter's C counting loop; keys stay in first-occurrence order.
+        tf: dict[str, int] = Counter(tokens)
         if limit_terms is not None and len(tf) > limit_terms:
-            tf = dict(
-                sorted(tf.items(), key=lambda kv: kv[1], reverse=True)[:limit_terms]
-            )
-        dl = sum(tf.values())
-        self.docs[doc_id] = {"dl": dl, "tf": tf}
+            tf = dict(heapq.nlargest(limit_terms, tf.items(), key=itemgetter(1)))
+            dl = sum(tf.values())
+        else:
+            dl = len(tokens)
+        self._pending[doc_id] = (dl, tf)
         self.N += 1
 
     def finalize(self):
-        total = 0
-        df: dict[str, int] = {}
-        for doc in self.docs.values():
-            total += doc["dl"]
-            for t in doc["tf"].keys():
-                df[t] = df.get(t, 0) + 1
+        self._pack((doc_id, dl, tf) for doc_id, (dl, tf) in self._pending.items())
+        self._pending = {}
+
+    def _pack(self, docs: Iterable[tuple[str, int, dict[str, int]]]) -> None:
+        vocab: dict[str, int] = {}
+        df = array("i")
+        doc_ids: list[str] = []
+        doc_len = array("i")
+        indptr = array("i", [0])
+        term_ids = array("i")
+        tfs = array("i")
+        for doc_id, dl, tf in docs:
+            doc_ids.append(doc_id)
+            doc_len.append(dl)
+            for t, count in tf.items():
+                tid = vocab.get(t)
+                if tid is None:
+                    tid = vocab[t] = len(df)
+                    df.append(0)
+                df[tid] += 1
+                term_ids.append(tid)
+                tfs.append(count)
+            indptr.append(len(term_ids))
+        self.vocab = vocab
+        self.doc_ids = doc_ids
         self.df = df
-        self.avgdl = (total / self.N) if self.N else 0.0
+        self.doc_len = doc_len
+        self.indptr = indptr
+        self.term_ids = term_ids
+        self.tfs = tfs
+        self.N = len(doc_ids)
+        self.avgdl = (sum(doc_len) / self.N) if self.N else 0.0
+        self._build_postings()
+        self._prepare()
+
+    def _build_postings(self) -> None:
+        """Transpose the per-doc CSR arrays into per-term postings."""
+        post_indptr = array("i", [0])
+        running = 0
+        for n in self.df:
+            running += n
+            post_indptr.append(running)
+        fill = array("i", post_indptr[:-1])
+        post_docs = array("i", bytes(running * 4))
+        post_tfs = array("i", bytes(running * 4))
+        indptr = self.indptr
+        term_ids = self.term_ids
+        tfs = self.tfs
+        for i in range(len(self.doc_ids)):
+            for j in range(indptr[i], indptr[i + 1]):
+                tid = term_ids[j]
+                slot = fill[tid]
+                post_docs[slot] = i
+                post_tfs[slot] = tfs[j]
+                fill[tid] = slot + 1
+        self.post_indptr = post_indptr
+        self.post_docs = post_docs
+        self.post_tfs = post_tfs
+
+    def _prepare(self) -> None:
+        self._doc_index = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+        N = self.N
+        self._idf = [math.log((N - n + 0.5) / (n + 0.5) + 1.0) for n in self.df]
+        k1, b, avgdl = self.k1, self.b, self.avgdl or 1
+        self._norm = [k1 * (1 - b + b * (dl or 1) / avgdl) for dl in self.doc_len]
 
     def idf(self, term: str) -> float:
-        n = self.df.get(term, 0)
+        tid = self.vocab.get(term)
+        n = self.df[tid] if tid is not None else 0
         return math.log((self.N - n + 0.5) / (n + 0.5) + 1.0)
 
-    def score(self, doc_id: str, query_terms: list[str]) -> float:
-        doc = self.docs.get(doc_id)
-        if not doc:
-            return 0.0
-        score = 0.0
-        dl = doc["dl"] or 1
+    def _query_counts(self, query_terms: list[str]) -> dict[int, int]:
+        """Map query terms to ``{term_id: occurrences}``, dropping unknown terms."""
+        counts: dict[int, int] = {}
         for t in query_terms:
-            tf = doc["tf"].get(t, 0)
-            if tf == 0:
-                continue
-            idf = self.idf(t)
-            denom = tf + self.k1 * (1 - self.b + self.b * dl / (self.avgdl or 1))
-            score += idf * (tf * (self.k1 + 1)) / denom
+            tid = self.vocab.get(t)
+            if tid is not None:
+                counts[tid] = counts.get(tid, 0) + 1
+        return counts
+
+    def _score_doc(self, i: int, qcounts: dict[int, int]) -> float:
+        k1 = self.k1
+        norm = self._norm[i]
+        idf = self._idf
+        term_ids = self.term_ids
+        tfs = self.tfs
+        score = 0.0
+        for j in range(self.indptr[i], self.indptr[i + 1]):
+            tid = term_ids[j]
+            occurrences = qcounts.get(tid)
+            if occurrences:
+                tf = tfs[j]
+                score += occurrences * idf[tid] * (tf * (k1 + 1)) / (tf + norm)
         return score
 
+    def score(self, doc_id: str, query_terms: list[str]) -> float:
+        i = self._doc_index.get(doc_id)
+        if i is None:
+            return 0.0
+        return self._score_doc(i, self._query_counts(query_terms))
+
     def search(self, query: str, top_k: int = 20) -> list[tuple[str, float]]:
-        q = tokenize(query)
-        cand = []
-        terms = set(q)
-        for doc_id, doc in self.docs.items():
-            if terms & doc["tf"].keys():
-                cand.append(doc_id)
-        scored = [(d, self.score(d, q)) for d in cand]
-        scored = [s for s in scored if s[1] > 0]
-        scored.sort(key=lambda x: x[1], reverse=True)
-        return scored[:top_k]
+        qcounts = self._query_counts(tokenize(query))
+        if not qcounts:
+            return []
+        k1 = self.k1
+        norm = self._norm
+        post_indptr = self.post_indptr
+        post_docs = self.post_docs
+        post_tfs = self.post_tfs
+        acc: dict[int, float] = {}
+        for tid, occurrences in qcounts.items():
+            weight = occurrences * self._idf[tid] * (k1 + 1)
+            lo, hi = post_indptr[tid], post_indptr[tid + 1]
+            for d, tf in zip(post_docs[lo:hi], post_tfs[lo:hi]):
+                acc[d] = acc.get(d, 0.0) + weight * tf / (tf + norm[d])
+        # Ties keep document order, as the full scan did.
+        ranked = sorted(
+            ((d, s) for d, s in acc.items() if s > 0), key=lambda x: (-x[1], x[0])
+        )
+        doc_ids = self.doc_ids
+        return [(doc_ids[d], s) for d, s in ranked[:top_k]]
 
     def save(self, path: str):
+        """Persist the index as an orjson header followed by int32 CSR postings."""
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "k1": self.k1,
-                    "b": self.b,
-                    "N": self.N,
-                    "avgdl": self.avgdl,
-                    "df": self.df,
-                    "docs": self.docs,
-                },
-                f,
-            )
+        arrays = {
+            name: getattr(self, name) for name in self._ARRAYS + self._POSTING_ARRAYS
+        }
+        header = json_dumps(
+            {
+                "k1": self.k1,
+                "b": self.b,
+                "N": self.N,
+                "avgdl": self.avgdl,
+                "terms": list(self.vocab),
+                "doc_ids": self.doc_ids,
+                "arrays": {name: len(arr) for name, arr in arrays.items()},
+            }
+        )
+        header += b" " * (-len(header) % 4)  # keep the int32 arrays aligned
+        # Loaded indexes map the file, so replace it rather than truncating
+        # pages another process may still be reading.
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            for arr in arrays.values():
+                if sys.byteorder == "big":
+                    arr = array("i", arr)
+                    arr.byteswap()
+                f.write(arr)
+        os.replace(tmp, path)
 
     @classmethod
-    def load(cls, path: str) -> "BM25Index":
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    def load(cls, path: str) -> BM25Index:
+        """Load a saved index; the int32 arrays of a binary index are
+        memory-mapped int views, so only pages that are read get loaded."""
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                f.seek(0)
+                return cls._from_legacy_json(json_loads(f.read()))
+            raw = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        offset = len(_MAGIC)
+        (header_len,) = struct.unpack_from("<I", raw, offset)
+        offset += 4
+        meta = json_loads(bytes(raw[offset : offset + header_len]))
+        offset += header_len
+
+        obj = cls(k1=meta.get("k1", 1.5), b=meta.get("b", 0.75))
+        for name, length in meta["arrays"].items():
+            end = offset + length * 4
+            if sys.byteorder == "big":
+                arr = array("i")
+                arr.frombytes(raw[offset:end])
+                arr.byteswap()
+            else:
+                arr = raw[offset:end].cast("i")
+            setattr(obj, name, arr)
+            offset = end
+        obj.N = meta["N"]
+        obj.avgdl = meta["avgdl"]
+        obj.vocab = {t: i for i, t in enumerate(meta["terms"])}
+        obj.doc_ids = meta["doc_ids"]
+        if not all(name in meta["arrays"] for name in cls._POSTING_ARRAYS):
+            obj._build_postings()
+        obj._prepare()
+        return obj
+
+    @classmethod
+    def _from_legacy_json(cls, data: dict) -> BM25Index:
         obj = cls(k1=data.get("k1", 1.5), b=data.get("b", 0.75))
-        obj.N = data["N"]
-        obj.avgdl = data["avgdl"]
-        obj.df = data["df"]
-        obj.docs = data["docs"]
+        obj._pack(
+            (doc_id, doc["dl"], doc["tf"]) for doc_id, doc in data["docs"].items()
+        )
         return obj
+
+
+def index_path(index_dir: str) -> str:
+    """Return the BM25 file inside ``index_dir``, preferring the binary format."""
+    path = os.path.join(index_dir, BM25_FILENAME)
+    if os.path.exists(path):
+        return path
+    legacy = os.path.join(index_dir, LEGACY_BM25_FILENAME)
+    return legacy if os.path.exists(legacy) else path
@@ -1,18 +1,20 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
-import webbrowser
 from pathlib import Path
 
-from .arch import ArchConfig, generate_architecture
-from .indexer import build
 from .logger import logger
-from .searcher import build_trace_html, search, search_llm
+
+# Command implementations import their heavy dependencies (rich, openai,
+# tree-sitter) lazily so `codeindex --help` stays fast.
 
 
 def cmd_build(args):
+    from .indexer import build
+
     logger.info(
         "Starting build; repo=%s out=%s summarizer=%s min_loc=%s",
         args.repo,
@@ -26,11 +28,14 @@ def cmd_build(args):
         summarizer=args.summarizer,
         min_loc_for_summary=args.min_loc,
         summary_scope=args.summary_scope,
+        index_workers=args.workers,
     )
     logger.info("Index written to: %s", out)
 
 
 def cmd_search(args):
+    from .searcher import search, search_llm
+
     if args.mode == "llm":
         logger.info("Using LLM-guided search (reasoning mode)")
         res = search_llm(
@@ -51,6 +56,10 @@ def cmd_search(args):
 
 
 def cmd_trace(args):
+    import webbrowser
+
+    from .searcher import build_trace_html
+
     ok = build_trace_html(args.index)
     html = os.path.join(args.index, "trace", "trace.html")
     if ok and os.path.exists(html):
@@ -63,6 +72,8 @@ def cmd_trace(args):
 
 
 def cmd_arch(args):
+    from .arch import ArchConfig, generate_architecture
+
     verbosity = None if args.llm_verbosity == "off" else args.llm_verbosity
     config = ArchConfig(
         index_dir=Path(args.index),
@@ -80,7 +91,8 @@ def cmd_arch(args):
     generate_architecture(config)
 
 
-def main():
+@functools.lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         prog="codeindex",
         description="LLM-powered reasoning search over code with hierarchical indexing",
@@ -110,6 +122,15 @@ def main():
             "'files' summarizes only whole files, 'none' disables summaries."
         ),
     )
+    p_b.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=(
+            "Index files in N worker processes (0 = one per CPU). "
+            "Default: in-process, or CODEINDEX_INDEX_WORKERS when set."
+        ),
+    )
     p_b.set_defaults(func=cmd_build)
     p_s = sub.add_parser("search", help="Search with BM25 or LLM reasoning")
     p_s.add_argument("--index", default="./index")
@@ -189,7 +210,11 @@ def main():
         help="Maximum LLM redraft attempts before failing or falling back (default: 2)",
     )
     p_a.set_defaults(func=cmd_arch)
-    args = p.parse_args()
+    return p
+
+
+def main(argv: list[str] | None = None):
+    args = _get_parser().parse_args(argv)
     args.func(args)
 
 
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from typing import Iterable
+import io
 
 from .nodes import FunctionParam, Node, NodeKind
 
+_ARGS_HEADER = "Args:\n"
+_RET_HEADER = "Returns:\n    "
+_RAISES_HEADER = "Raises:\n"
+
 
 def render_node_doc(node: Node) -> str:
     if node.kind in (NodeKind.FUNC, NodeKind.BLOCK):
@@ -11,60 +15,67 @@ def render_node_doc(node: Node) -> str:
     if node.kind == NodeKind.CLASS:
         return _render_class_doc(node)
     if node.kind == NodeKind.FILE:
-        meta = (node.extra or {}).get("doc", {})
-        docstring = meta.get("docstring") if isinstance(meta, dict) else None
-        return (docstring or node.summary or "").strip()
+        return (_docstring(node) or node.summary or "").strip()
     return node.summary or ""
 
 
 def _render_function_doc(node: Node) -> str:
-    meta = (node.extra or {}).get("doc", {})
-    lines: list[str] = []
-
-    docstring = meta.get("docstring") if isinstance(meta, dict) else None
-    if docstring:
-        lines.extend(_split_and_strip(docstring))
-        lines.append("")
-
-    params = _coerce_params(meta.get("params")) if isinstance(meta, dict) else []
+    meta = _doc_meta(node)
+    docstring = meta.get("docstring")
+    doc_lines = _split_and_strip(docstring) if docstring else []
+    params = _coerce_params(meta.get("params"))
+    returns = meta.get("returns")
+    raises = meta.get("raises")
+
+    if not (doc_lines or params or returns is not None or raises):
+        # no metadata available
+        return node.summary.strip() if node.summary else ""
+
+    out = io.StringIO()
+    sep = ""
+    if doc_lines:
+        out.write("\n".join(doc_lines))
+        sep = "\n\n"
     if params:
-        lines.append("Args:")
-        for param in params:
-            descr = _format_param(param)
-            lines.append(f"    {descr}")
-        lines.append("")
-
-    returns = meta.get("returns") if isinstance(meta, dict) else None
+        out.write(sep)
+        out.write(_ARGS_HEADER)
+        out.write("\n".join("    " + _format_param(p).rstrip() for p in params))
+        sep = "\n\n"
     if returns is not None:
-        lines.append("Returns:")
-        lines.append(f"    {returns or 'None'}")
-        lines.append("")
-
-    raises = meta.get("raises") if isinstance(meta, dict) else []
+        out.write(sep)
+        out.write(_RET_HEADER)
+        out.write((returns or "None").rstrip())
+        sep = "\n\n"
     if raises:
-        lines.append("Raises:")
-        for exc in raises:
-            lines.append(f"    {exc}")
-        lines.append("")
-
-    rendered = "\n".join(line.rstrip() for line in lines).strip()
-    if rendered:
-        return rendered
-    if node.summary:
-        return node.summary.strip()
-    return ""  # no metadata available
+        out.write(sep)
+        out.write(_RAISES_HEADER)
+        out.write("\n".join(("    " + exc).rstrip() for exc in raises))
+    return out.getvalue().strip()
 
 
 def _render_class_doc(node: Node) -> str:
-    meta = (node.extra or {}).get("doc", {})
-    docstring = meta.get("docstring") if isinstance(meta, dict) else None
+    docstring = _docstring(node)
     if docstring:
         return "\n".join(_split_and_strip(docstring)).strip()
     return node.summary or ""
 
 
-def _coerce_params(params: object) -> list[FunctionParam]:
-    if not isinstance(params, Iterable):
+def _doc_meta(node: Node) -> dict:
+    meta = node.extra.get("doc") if node.extra else None
+    return meta if isinstance(meta, dict) else {}
+
+
+def _docstring(node: Node) -> str | None:
+    # Most FILE/CLASS nodes carry no doc metadata; avoid building a dict.
+    if not node.extra:
+        return None
+    meta = node.extra.get("doc")
+    return meta.get("docstring") if isinstance(meta, dict) else None
+
+
+def _coerce_params(params: list | None) -> list[FunctionParam]:
+    # The indexers always emit params as a list of dicts.
+    if not params:
         return []
     result: list[FunctionParam] = []
     for item in params:
@@ -1,9 +1,23 @@
 from __future__ import annotations
 
-import asyncio
-import json
+import functools
+import hashlib
+import logging
+import multiprocessing
 import os
+import pickle
 import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from contextlib import ExitStack
+from itertools import accumulate
+from typing import NamedTuple
 
 from rich.console import Console
 from rich.progress import (
@@ -15,20 +29,40 @@ from rich.progress import (
     TimeRemainingColumn,
 )
 
-from .ast_indexer import DEFAULT_CALLSITE_CAP, PyFileIndexer, stable_id
-from .bm25 import BM25Index
-from .logger import logger
-from .nodes import CallsiteRecord, Node, NodeKind
-from .store import write_edges, write_jsonl, write_nodes, write_xref_calls
-from .summarizer import summarize_many_async
-from .ts_indexer import TSFileIndexer
+from .ast_indexer import DEFAULT_CALLSITE_CAP, PyFileIndexer, count_lines, stable_id
+from .ast_indexer import INDEXER_VERSION as PY_INDEXER_VERSION
+from .bm25 import BM25_FILENAME, BM25Index
+from .logger import TRACE, logger
+from .nodes import Node, NodeKind
+from .store import JsonlWriter, json_dumps
+from .summarizer import run_async, summarize_many_async
+from .ts_indexer import INDEXER_VERSION as TS_INDEXER_VERSION
+from .ts_indexer import TSParseError, index_file
 
 PY_EXTS = {".py"}
 JS_TS_EXTS = {".js", ".jsx", ".ts", ".tsx"}
+SUPPORTED_EXTS = frozenset(PY_EXTS | JS_TS_EXTS)
+# Extension -> language tag, resolved in one lookup
+_EXT_LANG = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+}
 
 FEATURE_FLAG_ENV = "CODEINDEX_FEATURE_DOCS_NODES_ENHANCED"
 LEGACY_ENRICH_ENV = "CODEINDEX_ENRICH"
 CALLSITE_CAP_ENV = "CODEINDEX_CALLSITE_CAP"
+INDEX_WORKERS_ENV = "CODEINDEX_INDEX_WORKERS"
+INDEX_CACHE_ENV = "CODEINDEX_INDEX_CACHE"
+# Files read ahead of the parser when indexing in-process
+READ_AHEAD = 8
+# Below this many files, spawning worker processes costs more than it saves
+MIN_PARALLEL_FILES = 8
+# Allowance for filesystems with coarse mtime resolution when pruning
+_CACHE_MTIME_SLACK = 2.0
+PROGRESS_BATCH = 32
 
 # Directories to exclude from indexing (dependencies, caches, build artifacts)
 EXCLUDED_DIRS = {
@@ -77,44 +111,101 @@ EXCLUDED_DIRS = {
 }
 
 
+_EXCLUDED_FROZEN = frozenset(EXCLUDED_DIRS)
+
+
+@functools.lru_cache(maxsize=4096)
 def should_exclude_dir(dirname: str) -> bool:
     """Check if a directory should be excluded from indexing."""
-    # Exclude if in the excluded set
-    if dirname in EXCLUDED_DIRS:
-        return True
-    # Exclude if it matches a pattern (e.g., *.egg-info)
-    if dirname.endswith(".egg-info") or dirname.endswith("-info"):
-        return True
-    # Exclude hidden directories (start with .)
-    if dirname.startswith("."):
-        return True
-    return False
+    return (
+        # Exclude if in the excluded set
+        dirname in _EXCLUDED_FROZEN
+        # Exclude if it matches a pattern (e.g., *.egg-info, *.dist-info)
+        or dirname.endswith("-info")
+        # Exclude hidden directories (start with .)
+        or dirname.startswith(".")
+    )
 
 
 def is_supported_file(path: str) -> bool:
-    ext = os.path.splitext(path)[1].lower()
-    if ext in PY_EXTS or ext in JS_TS_EXTS:
-        base = os.path.basename(path)
-        return not base.startswith(".")
-    return False
+    return _classify(os.path.basename(path)) is not None
+
+
+def _file_ext(name: str) -> str:
+    """Lower-cased extension of a file name, like ``os.path.splitext``."""
+    i = name.rfind(".")
+    return name[i:].lower() if i > 0 else ""
+
+
+def _classify(name: str) -> str | None:
+    """Language tag for an indexable file name; ``None`` for dotfiles and
+    unsupported extensions."""
+    if name.startswith("."):
+        return None
+    return _EXT_LANG.get(_file_ext(name))
+
+
+def _scan_repo(
+    root: str,
+) -> Iterator[tuple[str, list[str], list[tuple[str, str]]]]:
+    """Single top-down scandir pass over ``root``, in ``os.walk`` order.
+
+    Yields ``(dirpath, excluded_dirnames, [(file_path, ext), ...])``. Excluded
+    directories are not descended into and, as with ``os.walk``, symlinked
+    directories are listed but not followed.
+    """
+    stack = [root]
+    while stack:
+        dirpath = stack.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        subdirs: list[str] = []
+        excluded: list[str] = []
+        supported: list[tuple[str, str]] = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            name = entry.name
+            if is_dir:
+                if should_exclude_dir(name):
+                    excluded.append(name)
+                elif not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif not name.startswith("."):
+                ext = _file_ext(name)
+                if ext in SUPPORTED_EXTS:
+                    supported.append((entry.path, ext))
+        yield dirpath, excluded, supported
+        stack.extend(reversed(subdirs))
 
 
 def is_python_file(path: str) -> bool:
-    return os.path.splitext(path)[1].lower() in PY_EXTS and not os.path.basename(
-        path
-    ).startswith(".")
+    return _classify(os.path.basename(path)) == "python"
 
 
 def is_js_ts_file(path: str) -> bool:
-    return os.path.splitext(path)[1].lower() in JS_TS_EXTS and not os.path.basename(
-        path
-    ).startswith(".")
+    return _classify(os.path.basename(path)) in ("javascript", "typescript")
 
 
 def rel(root: str, path: str) -> str:
     return os.path.relpath(path, root).replace(os.sep, "/")
 
 
+def _scanned_rel(root: str, path: str) -> str:
+    """``rel(root, path)`` for a path ``_scan_repo`` yielded under the absolute,
+    normalized ``root``: a prefix slice instead of two ``abspath`` calls."""
+    prefix = root if root.endswith(os.sep) else root + os.sep
+    if path.startswith(prefix):
+        r = path[len(prefix) :]
+        return r.replace(os.sep, "/") if os.sep != "/" else r
+    return rel(root, path)
+
+
 def _env_truthy(name: str) -> bool:
     value = os.getenv(name)
     if value is None:
@@ -149,12 +240,296 @@ def _resolve_callsite_cap(default: int = DEFAULT_CALLSITE_CAP) -> int:
     return cap
 
 
-def _compress_text_for_summary(text: str, max_chars: int = 6000) -> str:
-    if len(text) <= max_chars:
+def _resolve_index_workers(file_count: int, requested: int | None = None) -> int:
+    """Phase 1 worker processes; in-process (1) unless the caller opts in.
+
+    The pool uses the spawn start method, so scripts that call ``build()`` with
+    more than one worker need an ``if __name__ == "__main__":`` guard.
+    ``0`` means one worker per CPU.
+    """
+    if requested is None:
+        raw = os.getenv(INDEX_WORKERS_ENV)
+        if not raw:
+            return 1
+        try:
+            requested = int(raw)
+        except ValueError:
+            logger.warning(
+                "WARNING: invalid %s=%s, indexing in-process", INDEX_WORKERS_ENV, raw
+            )
+            return 1
+    if file_count < MIN_PARALLEL_FILES:
+        return 1
+    workers = requested if requested > 0 else (os.cpu_count() or 1)
+    return max(1, min(workers, file_count))
+
+
+def _is_index_cache_enabled() -> bool:
+    if os.getenv(INDEX_CACHE_ENV) is None:
+        return True
+    return _env_truthy(INDEX_CACHE_ENV)
+
+
+def _cache_key(
+    data: bytes, rpath: str, enrich: bool, call_cap: int, indexer_version: int
+) -> str:
+    h = hashlib.sha256(
+        f"{indexer_version}\t{rpath}\t{int(enrich)}\t{call_cap}\n".encode()
+    )
+    h.update(data)
+    return h.hexdigest()
+
+
+def _read_cache_entry(path: str) -> tuple | None:
+    try:
+        with open(path, "rb") as f:
+            entry = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError) as e:
+        logger.debug("Ignoring unreadable index cache entry %s: %s", path, e)
+        return None
+    # Refresh the mtime so the entry survives _prune_index_cache.
+    try:
+        os.utime(path)
+    except OSError as e:
+        logger.debug("Could not touch index cache entry %s: %s", path, e)
+    return entry
+
+
+def _write_cache_entry(path: str, entry: tuple) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug("Could not write index cache entry %s: %s", path, e)
+
+
+def _prune_index_cache(cache_dir: str, started: float) -> int:
+    """Remove cache entries not written or hit since ``started``.
+
+    Entries for deleted or edited files are never looked up again, so
+    anything older than this build is dead weight.
+    """
+    cutoff = started - _CACHE_MTIME_SLACK
+    removed = 0
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError:
+                    continue
+    except OSError as e:
+        logger.debug("Could not prune cache %s: %s", cache_dir, e)
+    return removed
+
+
+class _Source(NamedTuple):
+    text: str
+    data: bytes  # UTF-8 encoding of ``text``
+
+
+def _read_source(fp: str, rpath: str) -> _Source | None:
+    try:
+        with open(fp, "rb") as fh:
+            data = fh.read()
+        text = data.decode("utf-8")
+        # Same result as text-mode universal newlines, but only paid for
+        # files that actually contain carriage returns.
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+            data = text.encode("utf-8")
+        return _Source(text, data)
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning("Skipping unreadable file %s: %s", rpath, e)
+        logger.trace("TRACE: skipped %s due to unreadable file", rpath)
+        return None
+
+
+def _prefetch_sources(
+    jobs: list[_IndexJob], window: int = READ_AHEAD
+) -> Iterator[_Source | None]:
+    """Yield each job's file source in order, reading up to ``window`` files ahead
+    on a thread pool so disk reads overlap with parsing."""
+    with ThreadPoolExecutor(max_workers=window) as reader:
+        pending: deque[Future] = deque()
+        it = iter(jobs)
+        for job in it:
+            pending.append(reader.submit(_read_source, job.fp, job.rpath))
+            if len(pending) >= window:
+                break
+        while pending:
+            fut = pending.popleft()
+            job = next(it, None)
+            if job is not None:
+                pending.append(reader.submit(_read_source, job.fp, job.rpath))
+            yield fut.result()
+
+
+class _IndexJob(NamedTuple):
+    fp: str
+    rpath: str
+    ext: str
+    parent_id: str | None
+    enrich: bool
+    call_cap: int
+    cache_dir: str | None
+    summary_scope: str
+    min_loc: int
+
+
+def _index_one_file(job: _IndexJob) -> Node | tuple | None:
+    """Read and index a single file; runs inside a Phase 1 worker process."""
+    return _index_text(job, _read_source(job.fp, job.rpath))
+
+
+def _index_text(job: _IndexJob, source: _Source | None) -> Node | tuple | None:
+    """Index one file's already-read ``source``.
+
+    Returns ``None`` when the file is skipped, a bare file ``Node`` when a
+    TS/JS file fails to parse, otherwise
+    ``(snippets, nodes, edges, calls, stats, cache_hit)`` where ``snippets``
+    are the ``(node_id, source)`` pairs queued for summarization.
+    """
+    _, rpath, ext, parent_id, enrich_enabled, call_cap, cache_dir, scope, min_loc = job
+    if source is None:
+        return None
+    text = source.text
+
+    # Dispatch by extension
+    cache_path = None
+    if cache_dir is not None:
+        version = PY_INDEXER_VERSION if ext in PY_EXTS else TS_INDEXER_VERSION
+        key = _cache_key(source.data, rpath, enrich_enabled, call_cap, version)
+        cache_path = os.path.join(cache_dir, f"{key}.pkl")
+        cached = _read_cache_entry(cache_path)
+        if cached is not None:
+            logger.trace("TRACE: index cache hit for %s", rpath)
+            snippets = _summary_snippets(cached[0], text, scope, min_loc)
+            return (snippets, *cached, True)
+
+    lang_label = _EXT_LANG[ext]
+    tracing = logger.isEnabledFor(TRACE)
+    start_time = time.perf_counter() if tracing else 0.0
+    if lang_label == "python":
+        idx = PyFileIndexer(rpath, text, enrich=enrich_enabled, call_cap=call_cap)
+        try:
+            f_nodes, f_edges, f_calls, f_stats = idx.index()
+        except SyntaxError as exc:
+            logger.warning("Skipping %s due to syntax error: %s", rpath, exc)
+            logger.trace("TRACE: skipped %s due to syntax error", rpath)
+            return None
+    else:
+        try:
+            f_nodes, f_edges, f_calls, f_stats = index_file(
+                rpath, source.data, enrich=enrich_enabled, call_cap=call_cap
+            )
+        except TSParseError as e:
+            logger.warning("TS/JS parse failed for %s: %s", rpath, e)
+            logger.trace("TRACE: skipped %s due to ts/JS parse failure", rpath)
+            # Fallback: treat as a file node only
+            total_lines = count_lines(text)
+            return Node(
+                node_id=stable_id("file", rpath, None, 1, total_lines),
+                parent_id=parent_id,
+                kind=NodeKind.FILE,
+                path=rpath,
+                lang=lang_label,
+                symbol=os.path.basename(rpath),
+                start_line=1,
+                end_line=total_lines,
+                loc=total_lines,
+            )
+
+    if tracing:
+        logger.trace(
+            "TRACE: indexed %s (lang=%s nodes=%d edges=%d calls=%d) in %.1fms",
+            rpath,
+            lang_label,
+            len(f_nodes),
+            len(f_edges),
+            len(f_calls),
+            (time.perf_counter() - start_time) * 1000,
+        )
+    if cache_path is not None:
+        _write_cache_entry(cache_path, (f_nodes, f_edges, f_calls, f_stats))
+    snippets = _summary_snippets(f_nodes, text, scope, min_loc)
+    return snippets, f_nodes, f_edges, f_calls, f_stats, False
+
+
+def _summary_snippets(
+    f_nodes: list[Node], text: str, scope: str, min_loc: int
+) -> list[tuple[str, str]]:
+    """Source snippets to summarize for one file, as ``(node_id, snippet)``."""
+    work: list[tuple[str, str]] = []
+    if scope == "none":
+        return work
+    starts = None
+    for n in f_nodes:
+        if n.summary:
+            continue
+        if scope == "files":
+            if n.kind != NodeKind.FILE or (n.loc or 0) < min_loc:
+                continue
+            work.append((n.node_id, _compress_text_for_summary(text)))
+            break  # only need the file-level summary
+        # structured
+        if (
+            n.kind in (NodeKind.FILE, NodeKind.CLASS, NodeKind.FUNC)
+            and (n.loc or 0) >= min_loc
+        ):
+            if starts is None:
+                starts = _line_starts(text)
+            work.append((n.node_id, _slice_lines(text, starts, n)))
+    return work
+
+
+def _line_starts(text: str) -> list[int]:
+    """Offset of each line's first character, plus ``len(text) + 1``.
+
+    Line ``i`` (0-based) is ``text[starts[i] : starts[i + 1] - 1]``.
+    """
+    return [0, *accumulate(map((1).__add__, map(len, text.split("\n"))))]
+
+
+def _slice_lines(text: str, starts: list[int], n: Node) -> str:
+    """``"\n".join(text.splitlines()[start - 1 : end])`` for a node's line span,
+    cut straight out of ``text``."""
+    last = len(starts) - 1
+    begin = starts[min((n.start_line or 1) - 1, last)]
+    stop = starts[min(n.end_line or 1, last)] - 1
+    if stop == len(text) and text.endswith("\n"):
+        stop -= 1  # splitlines() has no empty line after a final newline
+    return text[begin:stop]
+
+
+_SUMMARY_MAX_CHARS = 6000
+_SUMMARY_HEAD = int(_SUMMARY_MAX_CHARS * 0.7)
+_SUMMARY_TAIL = int(_SUMMARY_MAX_CHARS * 0.25)
+
+
+def _compress_text_for_summary(
+    text: str,
+    *,
+    head: int = _SUMMARY_HEAD,
+    tail: int = _SUMMARY_TAIL,
+    limit: int = _SUMMARY_MAX_CHARS,
+) -> str:
+    if len(text) <= limit:
         return text
-    head = text[: int(max_chars * 0.7)]
-    tail = text[-int(max_chars * 0.25) :]
-    return head.rstrip() + "\n...\n" + tail.lstrip()
+    # Cut on line boundaries so neither side starts or ends mid-line.
+    head_end = text.rfind("\n", 0, head)
+    if head_end <= 0:
+        head_end = head
+    tail_start = text.find("\n", len(text) - tail) + 1
+    if tail_start <= 0:
+        tail_start = len(text) - tail
+    return "".join((text[:head_end], "\n...\n", text[tail_start:]))
 
 
 def build(
@@ -164,6 +539,7 @@ def build(
     summarizer: str = "gpt-5-nano-2025-08-07",
     min_loc_for_summary: int = 20,
     summary_scope: str = "structured",
+    index_workers: int | None = None,
 ) -> str:
     repo_path = os.path.abspath(repo_path)
     repo_name = os.path.basename(repo_path)
@@ -176,8 +552,11 @@ def build(
         min_loc_for_summary,
     )
 
+    # Environment-driven settings are resolved once, before any scanning.
     enrich_enabled = _is_enrichment_enabled()
     call_cap = _resolve_callsite_cap()
+    # Higher default for the global summary batch
+    summary_concurrency = int(os.getenv("CODEINDEX_SUMMARY_CONCURRENCY", "50"))
     if enrich_enabled:
         logger.info(
             "INFO: docs.nodes.enhanced enabled (flag=%s, cap=%d)",
@@ -195,7 +574,6 @@ def build(
         "callsites_total": 0,
         "callsite_cap_hits": 0,
     }
-    callsites: list[CallsiteRecord] = []
     scope_env = os.getenv("CODEINDEX_SUMMARY_SCOPE")
     if scope_env:
         summary_scope = scope_env
@@ -211,8 +589,9 @@ def build(
     logger.debug("Summary scope: %s", summary_scope)
     os.makedirs(out_dir, exist_ok=True)
     nodes: list[Node] = []
-    edges: list[dict] = []
-    node_text_rows = []  # for search text index
+    # Search text index rows, kept as parallel lists
+    text_ids: list[str] = []
+    texts: list[str] = []
 
     # L0 repo
     repo_id = stable_id("repo", repo_path, None, None, None)
@@ -227,35 +606,40 @@ def build(
     )
 
     # L1 packages: any directory that contains a supported file
+    # L2/L3/L4: the supported files themselves, collected in the same pass
     pkg_map: dict[str, str] = {}
+    files_to_index = []
     excluded_count = 0
     logger.info("Scanning repository tree for supported packages...")
-    for dirpath, dirnames, filenames in os.walk(repo_path):
-        # Filter out excluded directories in-place to skip traversal
-        excluded = [d for d in dirnames if should_exclude_dir(d)]
+    # Checked once: the per-directory messages below build their args eagerly.
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for dirpath, excluded, supported in _scan_repo(repo_path):
         if excluded:
             excluded_count += len(excluded)
-            logger.debug(
-                "Excluding directories in %s: %s", rel(repo_path, dirpath), excluded
-            )
-        dirnames[:] = [d for d in dirnames if not should_exclude_dir(d)]
-
-        if any(is_supported_file(os.path.join(dirpath, f)) for f in filenames):
-            rid = stable_id("pkg", rel(repo_path, dirpath), None, None, None)
-            parent_dir = os.path.dirname(dirpath)
-            parent_id = repo_id
-            if parent_dir in pkg_map:
-                parent_id = pkg_map[parent_dir]
-            n = Node(
-                node_id=rid,
-                parent_id=parent_id,
-                kind=NodeKind.PKG,
-                path=rel(repo_path, dirpath),
-                symbol=os.path.basename(dirpath),
-            )
-            nodes.append(n)
-            pkg_map[dirpath] = rid
+            if debug:
+                logger.debug(
+                    "Excluding directories in %s: %s",
+                    _scanned_rel(repo_path, dirpath),
+                    excluded,
+                )
+        if not supported:
+            continue
+        rdir = _scanned_rel(repo_path, dirpath)
+        rid = stable_id("pkg", rdir, None, None, None)
+        # Parents are scanned first, so a package's parent is already mapped.
+        parent_id = pkg_map.get(os.path.dirname(dirpath), repo_id)
+        n = Node(
+            node_id=rid,
+            parent_id=parent_id,
+            kind=NodeKind.PKG,
+            path=rdir,
+            symbol=os.path.basename(dirpath),
+        )
+        nodes.append(n)
+        pkg_map[dirpath] = rid
+        if debug:
             logger.debug("Registered package node: %s -> %s", dirpath, rid)
+        files_to_index.extend((fp, ext, rid) for fp, ext in supported)
 
     if excluded_count > 0:
         logger.info(
@@ -263,18 +647,6 @@ def build(
             excluded_count,
         )
 
-    # L2/L3/L4 for all supported languages
-    # First pass: count files to show accurate progress
-    logger.info("Scanning files for progress tracking...")
-    files_to_index = []
-    for dirpath, dirnames, filenames in os.walk(repo_path):
-        dirnames[:] = [d for d in dirnames if not should_exclude_dir(d)]
-        parent_id = pkg_map.get(dirpath, repo_id)
-        for fn in filenames:
-            fp = os.path.join(dirpath, fn)
-            if is_supported_file(fp):
-                files_to_index.append((fp, parent_id))
-
     logger.info("Indexing %d files...", len(files_to_index))
 
     # Phase 1: Index all files and collect nodes (fast)
@@ -282,8 +654,10 @@ def build(
     console = Console()
 
     # Data structures to accumulate work
-    file_data_list = []  # List of (rpath, text, f_nodes, f_edges, f_calls, f_stats)
-    global_summary_work = []  # List of (file_idx, node_idx, node, snippet) for summarization
+    # (rpath, f_nodes, f_edges, f_calls, f_stats) per file; source text is not kept
+    file_data_list: deque[tuple] = deque()
+    global_summary_work = []  # List of (node_id, snippet) for summarization
+    summary_by_node_id: dict[str, str] = {}
 
     with Progress(
         SpinnerColumn(),
@@ -293,128 +667,109 @@ def build(
         TimeRemainingColumn(),
         console=console,
         transient=False,
+        refresh_per_second=4,
     ) as progress:
         # Phase 1: Index all files quickly
         task = progress.add_task(
             "[cyan]Phase 1: Indexing files", total=len(files_to_index)
         )
 
-        for file_idx, (fp, parent_id) in enumerate(files_to_index):
-            rpath = rel(repo_path, fp)
-            # Shorten path for display
-            short_path = rpath if len(rpath) < 50 else "..." + rpath[-47:]
-            progress.update(task, description=f"[cyan]{short_path}")
-            try:
-                text = open(fp, "r", encoding="utf-8").read()
-            except Exception as e:
-                logger.warning("Skipping unreadable file %s: %s", rpath, e)
-                logger.trace("TRACE: skipped %s due to unreadable file", rpath)
-                progress.advance(task)
-                continue
-
-            # Dispatch by extension
-            ext = os.path.splitext(fp)[1].lower()
-            if ext in PY_EXTS:
-                idx = PyFileIndexer(
-                    rpath, text, enrich=enrich_enabled, call_cap=call_cap
+        cache_dir = None
+        if _is_index_cache_enabled():
+            cache_dir = os.path.join(out_dir, ".cache", "ast")
+            os.makedirs(cache_dir, exist_ok=True)
+        phase1_started = time.time()
+        jobs = [
+            _IndexJob(
+                fp,
+                _scanned_rel(repo_path, fp),
+                ext,
+                parent_id,
+                enrich_enabled,
+                call_cap,
+                cache_dir,
+                summary_scope,
+                min_loc_for_summary,
+            )
+            for fp, ext, parent_id in files_to_index
+        ]
+        workers = _resolve_index_workers(len(jobs), index_workers)
+        logger.debug("Phase 1 using %d worker process(es)", workers)
+
+        # Progress is flushed every PROGRESS_BATCH files rather than per file.
+        done = 0
+
+        def _advance(job_idx: int) -> None:
+            nonlocal done
+            done += 1
+            if done % PROGRESS_BATCH == 0:
+                name = jobs[job_idx].rpath.rsplit("/", 1)[-1]
+                progress.update(
+                    task, description=f"[cyan]{name}", advance=PROGRESS_BATCH
                 )
-                lang_label = "python"
-            else:
-                try:
-                    idx = TSFileIndexer(
-                        rpath, text, enrich=enrich_enabled, call_cap=call_cap
-                    )
-                    lang_label = (
-                        "javascript" if ext in {".js", ".jsx"} else "typescript"
-                    )
-                except Exception as e:
-                    logger.warning("TS/JS parse failed for %s: %s", rpath, e)
-                    logger.trace("TRACE: skipped %s due to ts/JS parse failure", rpath)
-                    # Fallback: treat as a file node only
-                    n = Node(
-                        node_id=stable_id(
-                            "file", rpath, None, 1, len(text.splitlines())
-                        ),
-                        parent_id=parent_id,
-                        kind=NodeKind.FILE,
-                        path=rpath,
-                        lang="javascript" if ext in {".js", ".jsx"} else "typescript",
-                        symbol=os.path.basename(rpath),
-                        start_line=1,
-                        end_line=len(text.splitlines()),
-                        loc=len(text.splitlines()),
-                    )
-                    nodes.append(n)
-                    node_text_rows.append(
-                        {
-                            "node_id": n.node_id,
-                            "text": " ".join([rpath, n.symbol or ""]),
-                        }
-                    )
-                    progress.advance(task)
-                    continue
 
-            start_time = time.perf_counter()
-            try:
-                f_nodes, f_edges, f_calls, f_stats = idx.index()
-            except SyntaxError as exc:
-                logger.warning("Skipping %s due to syntax error: %s", rpath, exc)
-                logger.trace("TRACE: skipped %s due to syntax error", rpath)
-                progress.advance(task)
+        # Results land in file order so the emitted index stays deterministic,
+        # while progress follows actual completion.
+        results: list = [None] * len(jobs)
+        if workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                futures = {
+                    pool.submit(_index_one_file, job): job_idx
+                    for job_idx, job in enumerate(jobs)
+                }
+                for fut in as_completed(futures):
+                    job_idx = futures[fut]
+                    results[job_idx] = fut.result()
+                    _advance(job_idx)
+        else:
+            for job_idx, source in enumerate(_prefetch_sources(jobs)):
+                results[job_idx] = _index_text(jobs[job_idx], source)
+                _advance(job_idx)
+        progress.update(
+            task,
+            description="[cyan]Phase 1: Indexing files",
+            advance=done % PROGRESS_BATCH,
+        )
+
+        cache_hits = 0
+        for file_idx, result in enumerate(results):
+            results[file_idx] = None
+            rpath = jobs[file_idx].rpath
+            if result is None:
                 continue
-            duration_ms = (time.perf_counter() - start_time) * 1000
-            logger.trace(
-                "TRACE: indexed %s (lang=%s nodes=%d edges=%d calls=%d) in %.1fms",
-                rpath,
-                lang_label,
-                len(f_nodes),
-                len(f_edges),
-                len(f_calls),
-                duration_ms,
-            )
+            parent_id = jobs[file_idx].parent_id
+            if isinstance(result, Node):
+                # TS/JS parse failure: keep a bare file node
+                result.parent_id = parent_id
+                nodes.append(result)
+                text_ids.append(result.node_id)
+                texts.append(" ".join([rpath, result.symbol or ""]))
+                continue
+            snippets, f_nodes, f_edges, f_calls, f_stats, cache_hit = result
+            cache_hits += cache_hit
             # fix parent
             f_nodes[0].parent_id = parent_id
 
             # Store file data for Phase 2
-            file_data_list.append(
-                (rpath, text, f_nodes, f_edges, f_calls, f_stats, parent_id)
-            )
+            file_data_list.append((rpath, f_nodes, f_edges, f_calls, f_stats))
+            # Snippets were cut in the worker; the source text stays there
+            global_summary_work.extend(snippets)
 
-            # Collect nodes that need summarization (don't summarize yet)
-            if summarizer != "off" and summary_scope != "none":
-                lines = text.splitlines() if summary_scope == "structured" else None
-                for node_idx, n in enumerate(f_nodes):
-                    if n.summary:
-                        continue
-                    if summary_scope == "files":
-                        if (
-                            n.kind != NodeKind.FILE
-                            or (n.loc or 0) < min_loc_for_summary
-                        ):
-                            continue
-                        snippet = _compress_text_for_summary(text)
-                        global_summary_work.append((file_idx, node_idx, n, snippet))
-                        break  # only need the file-level summary
-                    else:  # structured
-                        if (
-                            n.kind in (NodeKind.FILE, NodeKind.CLASS, NodeKind.FUNC)
-                            and (n.loc or 0) >= min_loc_for_summary
-                        ):
-                            snippet_lines = lines[
-                                (n.start_line or 1) - 1 : (n.end_line or 1)
-                            ]  # type: ignore[index]
-                            global_summary_work.append(
-                                (file_idx, node_idx, n, "\n".join(snippet_lines))
-                            )
-
-            # Update progress bar
-            progress.advance(task)
+        if cache_dir is not None:
+            logger.info(
+                "Phase 1 index cache: %d hit(s), %d miss(es)",
+                cache_hits,
+                len(file_data_list) - cache_hits,
+            )
+            pruned = _prune_index_cache(cache_dir, phase1_started)
+            if pruned:
+                logger.debug("Pruned %d stale index cache entries", pruned)
 
         # Phase 2: Batch summarize ALL nodes at once
         if global_summary_work and summarizer != "off":
-            conc = int(
-                os.getenv("CODEINDEX_SUMMARY_CONCURRENCY", "50")
-            )  # Higher default for global batch
+            conc = summary_concurrency
             logger.info(
                 "Phase 2: Batch summarizing %d nodes across all files with concurrency=%d",
                 len(global_summary_work),
@@ -425,12 +780,20 @@ def build(
                 "[yellow]Phase 2: Batch summarizing", total=len(global_summary_work)
             )
 
-            # Extract texts for summarization
-            texts = [work[3] for work in global_summary_work]
+            snippets = [work[1] for work in global_summary_work]
+            summary_cache_dir = None
+            if _is_index_cache_enabled():
+                summary_cache_dir = os.path.join(out_dir, ".cache", "summaries")
+            phase2_started = time.time()
 
             try:
-                summaries = asyncio.run(
-                    summarize_many_async(texts, model=summarizer, concurrency=conc)
+                summaries = run_async(
+                    summarize_many_async(
+                        snippets,
+                        model=summarizer,
+                        concurrency=conc,
+                        cache_dir=summary_cache_dir,
+                    )
                 )
                 success_count = sum(1 for s in summaries if s is not None)
                 logger.info(
@@ -439,13 +802,17 @@ def build(
                     len(global_summary_work),
                 )
 
-                # Assign summaries back to nodes
-                for (file_idx, node_idx, node, _), summary in zip(
-                    global_summary_work, summaries
-                ):
-                    if summary:
-                        node.summary = summary
-                    progress.advance(task2)
+                # Installed on the nodes while Phase 3 writes them
+                summary_by_node_id = {
+                    node_id: summary
+                    for (node_id, _), summary in zip(global_summary_work, summaries)
+                    if summary
+                }
+                progress.update(task2, completed=len(global_summary_work))
+                if summary_cache_dir is not None:
+                    pruned = _prune_index_cache(summary_cache_dir, phase2_started)
+                    if pruned:
+                        logger.debug("Pruned %d stale summary cache entries", pruned)
 
             except Exception as e:
                 logger.error(
@@ -453,39 +820,81 @@ def build(
                     type(e).__name__,
                     e,
                 )
+                logger.debug("Batch summarization traceback", exc_info=True)
 
-        # Phase 3: Consolidate all data
+        # Only the summary map is needed from here on; drop the snippets.
+        global_summary_work.clear()
+
+        # Phase 3: Consolidate and stream results straight to disk
         logger.info("Phase 3: Consolidating results...")
         task3 = progress.add_task(
             "[green]Phase 3: Consolidating", total=len(file_data_list)
         )
 
-        for (
-            rpath,
-            text,
-            f_nodes,
-            f_edges,
-            f_calls,
-            f_stats,
-            parent_id,
-        ) in file_data_list:
-            nodes.extend(f_nodes)
-            edges.extend(f_edges)
-            if f_calls:
-                callsites.extend(f_calls)
-            for key, value in f_stats.items():
-                metrics[key] = metrics.get(key, 0) + value
-
-            for n in f_nodes:
-                node_text_rows.append(
-                    {
-                        "node_id": n.node_id,
-                        "text": " ".join(
-                            [rpath, n.symbol or "", n.signature or "", n.summary or ""]
-                        ),
-                    }
+        bm25 = BM25Index()
+        with ExitStack() as stack:
+            node_w = stack.enter_context(
+                JsonlWriter(os.path.join(out_dir, "nodes.jsonl"))
+            )
+            edge_w = stack.enter_context(
+                JsonlWriter(os.path.join(out_dir, "edges.jsonl"))
+            )
+            text_w = stack.enter_context(
+                JsonlWriter(os.path.join(out_dir, "node_texts.jsonl"))
+            )
+            xref_w = (
+                stack.enter_context(
+                    JsonlWriter(os.path.join(out_dir, "xref_calls.jsonl"))
                 )
-            progress.advance(task3)
+                if enrich_enabled
+                else None
+            )
+
+            def _emit_texts(ids: list[str], texts: list[str]) -> None:
+                text_w.write_many(
+                    {"node_id": node_id, "text": text}
+                    for node_id, text in zip(ids, texts)
+                )
+                bm25.add_docs_batch(ids, texts)
+
+            node_w.write_many(nodes)
+            _emit_texts(text_ids, texts)
+            nodes.clear()
+            text_ids.clear()
+            texts.clear()
+
+            while file_data_list:
+                # Pop each file so its objects are released once written
+                rpath, f_nodes, f_edges, f_calls, f_stats = file_data_list.popleft()
+                if summary_by_node_id:
+                    for n in f_nodes:
+                        summ = summary_by_node_id.get(n.node_id)
+                        if summ:
+                            n.summary = summ
+                node_w.write_many(f_nodes)
+                edge_w.write_many(f_edges)
+                if xref_w is not None and f_calls:
+                    xref_w.write_many(f_calls)
+                for key, value in f_stats.items():
+                    metrics[key] = metrics.get(key, 0) + value
+
+                _emit_texts(
+                    [n.node_id for n in f_nodes],
+                    [
+                        " ".join(
+                            (rpath, n.symbol or "", n.signature or "", n.summary or "")
+                        )
+                        for n in f_nodes
+                    ],
+                )
+                progress.advance(task3)
+
+        logger.info(
+            "Persisted artifacts: %d nodes, %d edges, %d node text rows",
+            node_w.count,
+            edge_w.count,
+            text_w.count,
+        )
 
     if enrich_enabled:
         logger.info(
@@ -513,31 +922,17 @@ def build(
                 metrics["funcs_total"],
             )
 
-    # Persist
-
-    logger.info(
-        "Persisting artifacts: %d nodes, %d edges, %d node text rows",
-        len(nodes),
-        len(edges),
-        len(node_text_rows),
-    )
-    write_nodes(os.path.join(out_dir, "nodes.jsonl"), nodes)
-    write_edges(os.path.join(out_dir, "edges.jsonl"), edges)
-    write_jsonl(os.path.join(out_dir, "node_texts.jsonl"), node_text_rows)
-    if enrich_enabled:
-        write_xref_calls(os.path.join(out_dir, "xref_calls.jsonl"), callsites)
-
     # BM25
-    bm25 = BM25Index()
-    for row in node_text_rows:
-        bm25.add_doc(row["node_id"], row["text"])
     bm25.finalize()
-    bm25.save(os.path.join(out_dir, "bm25.json"))
-    logger.debug("BM25 index persisted to %s", os.path.join(out_dir, "bm25.json"))
-
-    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
-        json.dump(
-            {"repo_id": repo_id, "created": True, "langs": ["python", "js", "ts"]}, f
+    bm25_path = os.path.join(out_dir, BM25_FILENAME)
+    bm25.save(bm25_path)
+    logger.debug("BM25 index persisted to %s", bm25_path)
+
+    with open(os.path.join(out_dir, "meta.json"), "wb") as f:
+        f.write(
+            json_dumps(
+                {"repo_id": repo_id, "created": True, "langs": ["python", "js", "ts"]}
+            )
         )
 
     logger.info("Build artifacts written to %s", out_dir)
@@ -7,14 +7,23 @@ in the code tree to decide which branches to explore and which nodes answer the
 
 from __future__ import annotations
 
-import json
+import asyncio
+import hashlib
+import heapq
+import itertools
+import logging
 import os
-from dataclasses import dataclass
-from typing import Optional
+import sqlite3
+from dataclasses import asdict, dataclass
+from typing import Any
 
 from openai import AsyncOpenAI
 
 from .logger import logger
+from .store import json_dumps, json_loads
+from .summarizer import pooled_http_client
+
+LLM_CACHE_DIRNAME = ".llm_cache"
 
 
 @dataclass
@@ -36,13 +45,69 @@ class ChildRanking:
     reasoning: str
 
 
+class EvalCache:
+    """Persistent cache of LLM evaluations, shared across searches.
+
+    Keys hash everything that goes into a prompt (model, query, node
+    context), so entries go stale on their own when an index is rebuilt
+    with different summaries.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS evals (key TEXT PRIMARY KEY, result BLOB)"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_index(cls, index_dir: str) -> EvalCache | None:
+        path = os.path.join(index_dir, LLM_CACHE_DIRNAME, "evals.sqlite")
+        try:
+            return cls(path)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("LLM eval cache disabled (%s): %s", path, e)
+            return None
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Any:
+        row = self._conn.execute(
+            "SELECT result FROM evals WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json_loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO evals (key, result) VALUES (?, ?)",
+                (key, json_dumps(value)),
+            )
+        except sqlite3.Error as e:
+            logger.debug("Could not store LLM eval %s: %s", key, e)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
 async def evaluate_node_relevance(
     node: dict,
     query: str,
     *,
     model: str = "gpt-4o-mini",
-    client: Optional[AsyncOpenAI] = None,
+    client: AsyncOpenAI | None = None,
     reasoning_effort: str = "low",
+    cache: EvalCache | None = None,
 ) -> NodeRelevance:
     """
     Ask LLM: Is this node relevant to the query?
@@ -52,10 +117,28 @@ async def evaluate_node_relevance(
         query: User's natural language query
         model: OpenAI model to use
         client: Optional pre-initialized client
+        cache: Optional persistent cache of earlier evaluations
 
     Returns:
         NodeRelevance with LLM's assessment
     """
+    # Build context about the node
+    node_context = f"""
+Node Type: {node["kind"]}
+Symbol: {node.get("symbol", "(anonymous)")}
+Path: {node.get("path", "unknown")}
+Summary: {node.get("summary", "No summary available")}
+"""
+
+    cache_key = None
+    if cache is not None:
+        cache_key = EvalCache.key(
+            "evaluate", model, reasoning_effort, query, node_context
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return NodeRelevance(**cached)
+
     should_close = False
     if client is None:
         api_key = os.getenv("OPENAI_API_KEY")
@@ -65,14 +148,6 @@ async def evaluate_node_relevance(
         should_close = True
 
     try:
-        # Build context about the node
-        node_context = f"""
-Node Type: {node["kind"]}
-Symbol: {node.get("symbol", "(anonymous)")}
-Path: {node.get("path", "unknown")}
-Summary: {node.get("summary", "No summary available")}
-"""
-
         system_prompt = """You are a code navigation expert. Think first, then respond exactly in the requested JSON format. Stay factual—never invent behavior or files that are not in the input.
 
 Respond in JSON format:
@@ -119,16 +194,20 @@ Is this node relevant? Does it answer the query?"""
             logger.warning("Empty response from LLM for node %s", node.get("node_id"))
             return NodeRelevance(False, 0.0, "No response", False)
 
-        result = json.loads(content)
-        return NodeRelevance(
+        result = json_loads(content)
+        relevance = NodeRelevance(
             relevant=result.get("relevant", False),
             confidence=result.get("confidence", 0.0),
             reasoning=result.get("reasoning", ""),
             is_answer=result.get("is_answer", False),
         )
+        if cache_key is not None:
+            cache.put(cache_key, asdict(relevance))
+        return relevance
 
     except Exception as e:
         logger.error("LLM evaluation failed for node %s: %s", node.get("node_id"), e)
+        logger.debug("LLM evaluation traceback", exc_info=True)
         return NodeRelevance(False, 0.0, f"Error: {e}", False)
 
     finally:
@@ -142,9 +221,10 @@ async def rank_children(
     parent_context: str = "",
     *,
     model: str = "gpt-4o-mini",
-    client: Optional[AsyncOpenAI] = None,
+    client: AsyncOpenAI | None = None,
     top_k: int = 5,
     reasoning_effort: str = "low",
+    cache: EvalCache | None = None,
 ) -> list[ChildRanking]:
     """
     Ask LLM: Which children should we explore?
@@ -157,6 +237,7 @@ async def rank_children(
         client: Optional pre-initialized client
         top_k: Max children to rank
         reasoning_effort: GPT-5 reasoning effort level when applicable
+        cache: Optional persistent cache of earlier rankings
 
     Returns:
         List of ChildRanking sorted by relevance
@@ -164,6 +245,30 @@ async def rank_children(
     if not children:
         return []
 
+    # Build context about children
+    children_context = []
+    for i, child in enumerate(children[:20], 1):  # Limit to 20 for context length
+        summary = child.get("summary") or "No summary"
+        children_context.append(
+            f"{i}. {child['kind']} '{child.get('symbol', '?')}' - {summary[:100]}"
+        )
+
+    cache_key = None
+    if cache is not None:
+        cache_key = EvalCache.key(
+            "rank",
+            model,
+            reasoning_effort,
+            str(top_k),
+            query,
+            parent_context,
+            *children_context,
+            *(child["node_id"] for child in children),
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return [ChildRanking(**r) for r in cached]
+
     should_close = False
     if client is None:
         api_key = os.getenv("OPENAI_API_KEY")
@@ -173,14 +278,6 @@ async def rank_children(
         should_close = True
 
     try:
-        # Build context about children
-        children_context = []
-        for i, child in enumerate(children[:20], 1):  # Limit to 20 for context length
-            summary = child.get("summary") or "No summary"
-            children_context.append(
-                f"{i}. {child['kind']} '{child.get('symbol', '?')}' - {summary[:100]}"
-            )
-
         system_prompt = """You are a code navigation expert. Given a query and a list of code nodes, rank which ones are MOST LIKELY to contain relevant information.
 
 Respond in JSON format:
@@ -224,7 +321,7 @@ Which children should we explore?"""
             logger.warning("Empty response from LLM for child ranking")
             return []
 
-        result = json.loads(content)
+        result = json_loads(content)
         rankings = []
 
         for ranking in result.get("rankings", []):
@@ -238,10 +335,15 @@ Which children should we explore?"""
                     )
                 )
 
-        return sorted(rankings, key=lambda r: r.relevance_score, reverse=True)[:top_k]
+        rankings.sort(key=lambda r: r.relevance_score, reverse=True)
+        del rankings[top_k:]
+        if cache_key is not None:
+            cache.put(cache_key, [asdict(r) for r in rankings])
+        return rankings
 
     except Exception as e:
         logger.error("LLM child ranking failed: %s", e)
+        logger.debug("LLM child ranking traceback", exc_info=True)
         return []
 
     finally:
@@ -258,6 +360,8 @@ async def llm_guided_search(
     budget: int = 50,
     top: int = 10,
     reasoning_effort: str = "low",
+    beam: int = 6,
+    cache: EvalCache | None = None,
 ) -> dict:
     """
     Perform LLM-guided tree search through the code.
@@ -270,14 +374,19 @@ async def llm_guided_search(
         budget: Max number of nodes to evaluate
         top: Max number of answer nodes to return
         reasoning_effort: GPT-5 reasoning effort when applicable
+        beam: Max nodes evaluated concurrently per round
+        cache: Optional persistent cache of LLM evaluations
 
     Returns:
         Dict with results and trace of LLM reasoning
     """
+    # One pooled client for the whole search; each round makes up to `beam`
+    # concurrent calls, which then reuse keep-alive connections.
     client = AsyncOpenAI(
         api_key=os.getenv("OPENAI_API_KEY"),
         timeout=30.0,
         max_retries=2,
+        http_client=pooled_http_client(max(beam, 1)),
     )
 
     # Find root node
@@ -285,126 +394,161 @@ async def llm_guided_search(
     if not root:
         raise ValueError("No root node found")
 
-    frontier = [(root, 1.0)]  # (node_id, score)
+    # Max-heap on score; the push counter keeps equal scores in FIFO order
+    frontier = [(-1.0, 0, root)]  # (-score, seq, node_id)
+    pushed = itertools.count(1)
     visited = set()
     answers = []  # (node_id, score, reasoning)
     trace = []
     steps = 0
 
     logger.info("Starting LLM-guided search: query='%s' budget=%d", query, budget)
+    debug = logger.isEnabledFor(logging.DEBUG)
 
     try:
         while frontier and steps < budget:
-            steps += 1
-
-            # Pop highest scored node
-            frontier.sort(key=lambda x: x[1], reverse=True)
-            node_id, parent_score = frontier.pop(0)
-
-            if node_id in visited:
+            # Pop the `beam` highest scored unvisited nodes
+            batch: list[tuple[int, str]] = []  # (step, node_id)
+            while frontier and steps < budget and len(batch) < beam:
+                steps += 1
+                _, _, node_id = heapq.heappop(frontier)
+                if node_id in visited:
+                    continue
+                visited.add(node_id)
+                batch.append((steps, node_id))
+            if not batch:
                 continue
 
-            visited.add(node_id)
-            node = nodes[node_id]
-
-            # Ask LLM: Is this node relevant?
-            relevance = await evaluate_node_relevance(
-                node,
-                query,
-                model=model,
-                client=client,
-                reasoning_effort=reasoning_effort,
-            )
-
-            trace.append(
-                {
-                    "step": steps,
-                    "event": "evaluate",
-                    "node_id": node_id,
-                    "symbol": node.get("symbol", "?"),
-                    "path": node.get("path", "?"),
-                    "relevant": relevance.relevant,
-                    "confidence": relevance.confidence,
-                    "reasoning": relevance.reasoning,
-                    "is_answer": relevance.is_answer,
-                }
-            )
-
-            logger.debug(
-                "Step %d: Evaluated %s - relevant=%s conf=%.2f answer=%s",
-                steps,
-                node.get("symbol", "?"),
-                relevance.relevant,
-                relevance.confidence,
-                relevance.is_answer,
+            # Ask LLM about the whole beam at once: is each node relevant?
+            relevances = await asyncio.gather(
+                *(
+                    evaluate_node_relevance(
+                        nodes[node_id],
+                        query,
+                        model=model,
+                        client=client,
+                        reasoning_effort=reasoning_effort,
+                        cache=cache,
+                    )
+                    for _, node_id in batch
+                )
             )
 
-            # If this is an answer node, add it
-            if relevance.is_answer and node["kind"] in (
-                "func",
-                "block",
-                "const",
-                "class",
-            ):
-                answers.append((node_id, relevance.confidence, relevance.reasoning))
+            to_expand = []  # (step, parent_context, child_nodes)
+            for (step, node_id), relevance in zip(batch, relevances):
+                node = nodes[node_id]
                 trace.append(
                     {
-                        "step": steps,
-                        "event": "answer",
+                        "step": step,
+                        "event": "evaluate",
                         "node_id": node_id,
-                        "score": relevance.confidence,
+                        "symbol": node.get("symbol", "?"),
+                        "path": node.get("path", "?"),
+                        "relevant": relevance.relevant,
+                        "confidence": relevance.confidence,
                         "reasoning": relevance.reasoning,
+                        "is_answer": relevance.is_answer,
                     }
                 )
-                continue
 
-            # ALWAYS explore container nodes (repo/pkg/file/class) - they're just organizational
-            # For other nodes, only explore if relevant
-            is_container = node["kind"] in ("repo", "pkg", "file", "class")
-            should_explore = (
-                is_container  # Always explore containers
-                or (relevance.relevant and relevance.confidence > 0.3)
-                or relevance.confidence > 0.15
-            )
+                if debug:
+                    logger.debug(
+                        "Step %d: Evaluated %s - relevant=%s conf=%.2f answer=%s",
+                        step,
+                        node.get("symbol", "?"),
+                        relevance.relevant,
+                        relevance.confidence,
+                        relevance.is_answer,
+                    )
 
-            if should_explore:
-                child_ids = children_index.get(node_id, [])
-                logger.debug(
-                    "Node %s has %d children, exploring...",
-                    node.get("symbol", "?"),
-                    len(child_ids),
+                # If this is an answer node, add it
+                if relevance.is_answer and node["kind"] in (
+                    "func",
+                    "block",
+                    "const",
+                    "class",
+                ):
+                    answers.append((node_id, relevance.confidence, relevance.reasoning))
+                    trace.append(
+                        {
+                            "step": step,
+                            "event": "answer",
+                            "node_id": node_id,
+                            "score": relevance.confidence,
+                            "reasoning": relevance.reasoning,
+                        }
+                    )
+                    continue
+
+                # ALWAYS explore container nodes (repo/pkg/file/class) - they're just organizational
+                # For other nodes, only explore if relevant
+                is_container = node["kind"] in ("repo", "pkg", "file", "class")
+                should_explore = (
+                    is_container  # Always explore containers
+                    or (relevance.relevant and relevance.confidence > 0.3)
+                    or relevance.confidence > 0.15
                 )
-                if child_ids:
-                    child_nodes = [nodes[cid] for cid in child_ids if cid in nodes]
 
-                    # Ask LLM to rank children
-                    parent_summary = node.get("summary") or ""
-                    rankings = await rank_children(
+                if should_explore:
+                    child_ids = children_index.get(node_id, [])
+                    if debug:
+                        logger.debug(
+                            "Node %s has %d children, exploring...",
+                            node.get("symbol", "?"),
+                            len(child_ids),
+                        )
+                    if child_ids:
+                        child_nodes = [nodes[cid] for cid in child_ids if cid in nodes]
+                        parent_summary = node.get("summary") or ""
+                        to_expand.append(
+                            (
+                                step,
+                                f"Parent: {node.get('symbol', '?')} - {parent_summary[:100]}",
+                                child_nodes,
+                            )
+                        )
+
+            if not to_expand:
+                continue
+
+            # Ask LLM to rank children of every expanded node concurrently
+            all_rankings = await asyncio.gather(
+                *(
+                    rank_children(
                         child_nodes,
                         query,
-                        parent_context=f"Parent: {node.get('symbol', '?')} - {parent_summary[:100]}",
+                        parent_context=parent_context,
                         model=model,
                         client=client,
                         reasoning_effort=reasoning_effort,
+                        cache=cache,
                     )
+                    for _, parent_context, child_nodes in to_expand
+                )
+            )
 
+            for (step, _, child_nodes), rankings in zip(to_expand, all_rankings):
+                if debug:
                     logger.debug(
                         "LLM ranked %d/%d children for exploration",
                         len(rankings),
                         len(child_nodes),
                     )
 
-                    for ranking in rankings:
-                        frontier.append((ranking.child_id, ranking.relevance_score))
-                        trace.append(
-                            {
-                                "step": steps,
-                                "event": "expand",
-                                "node_id": ranking.child_id,
-                                "score": ranking.relevance_score,
-                                "reasoning": ranking.reasoning,
-                            }
-                        )
+                for ranking in rankings:
+                    heapq.heappush(
+                        frontier,
+                        (-ranking.relevance_score, next(pushed), ranking.child_id),
+                    )
+                    trace.append(
+                        {
+                            "step": step,
+                            "event": "expand",
+                            "node_id": ranking.child_id,
+                            "score": ranking.relevance_score,
+                            "reasoning": ranking.reasoning,
+                        }
+                    )
 
         # Sort answers by confidence
         answers.sort(key=lambda x: x[1], reverse=True)
@@ -428,6 +572,10 @@ async def llm_guided_search(
             len(visited),
             len(results),
         )
+        if cache is not None:
+            logger.info(
+                "LLM eval cache: %d hit(s), %d miss(es)", cache.hits, cache.misses
+            )
 
         return {
             "query": query,
@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 import os
 import sys
-from typing import NoReturn, Optional, Union
+from typing import NoReturn
 
 from dotenv import load_dotenv
 
@@ -15,12 +15,15 @@ except ImportError:  # pragma: no cover - optional dependency
     colorlog = None
 
 
+TRACE = 5
+
+
 class AppLogger(logging.Logger):
     def error_raise(
         self,
         message: str,
         *,
-        exc: Optional[Union[BaseException, type[BaseException]]] = None,
+        exc: BaseException | type[BaseException] | None = None,
     ) -> NoReturn:
         """
         Emit an error message and raise an exception afterwards.
@@ -34,13 +37,6 @@ class AppLogger(logging.Logger):
         raise exc
 
 
-class ContextFilter(logging.Filter):
-    def filter(self, record: logging.LogRecord) -> bool:  # pragma: no cover - trivial
-        record.classname = record.module
-        record.funcname = record.funcName
-        return True
-
-
 def _determine_level() -> int:
     raw_level = (os.getenv("LOG_LEVEL") or "").upper()
     return {
@@ -49,24 +45,26 @@ def _determine_level() -> int:
         "WARNING": logging.WARNING,
         "ERROR": logging.ERROR,
         "CRITICAL": logging.CRITICAL,
-        "TRACE": 5,
+        "TRACE": TRACE,
     }.get(raw_level, logging.INFO)
 
 
 def _ensure_trace_level():
     if not hasattr(logging, "TRACE"):
-        logging.TRACE = 5  # type: ignore[attr-defined]
+        logging.TRACE = TRACE  # type: ignore[attr-defined]
         logging.addLevelName(logging.TRACE, "TRACE")  # type: ignore[attr-defined]
 
         def trace(self: logging.Logger, message: str, *args, **kwargs):
             if self.isEnabledFor(logging.TRACE):  # type: ignore[attr-defined]
+                # Report the caller, not this wrapper, as the record's origin
+                kwargs.setdefault("stacklevel", 2)
                 self._log(logging.TRACE, message, args, **kwargs)  # type: ignore[attr-defined]
 
         logging.Logger.trace = trace  # type: ignore[attr-defined]
 
 
 def _build_formatter() -> logging.Formatter:
-    base_format = "[%(levelname)s] %(asctime)s - %(classname)s:%(lineno)d %(funcname)s(): %(message)s"
+    base_format = "[%(levelname)s] %(asctime)s - %(module)s:%(lineno)d %(funcName)s(): %(message)s"
     date_format = "%Y-%m-%d %H:%M:%S"
     if colorlog is not None:
         return colorlog.ColoredFormatter(
@@ -108,11 +106,10 @@ def setup_logger(name: str) -> AppLogger:
 
     logger.addHandler(stdout_handler)
     logger.addHandler(stderr_handler)
-    logger.addFilter(ContextFilter())
     logger._logger_initialized = True  # type: ignore[attr-defined]
     return logger  # type: ignore[return-value]
 
 
 logger: AppLogger = setup_logger("codeindex")
 
-__all__ = ["logger", "setup_logger", "AppLogger"]
+__all__ = ["TRACE", "AppLogger", "logger", "setup_logger"]
@@ -69,7 +69,7 @@ class CallsiteRecord(TypedDict):
     snippet: str | None
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     node_id: str
     parent_id: str | None
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import heapq
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from operator import itemgetter
+from typing import NamedTuple
 
-from .bm25 import BM25Index
-from .llm_search import llm_guided_search
-from .store import load_jsonl
+from .bm25 import BM25Index, index_path
+from .llm_search import EvalCache, llm_guided_search
+from .store import json_dumps, json_loads, load_jsonl
 
 
 @dataclass
 class TraceStep:
+    """Shape of a BM25 search trace entry (search() writes plain dicts)."""
+
     event: str
     node_id: str
     score: float
@@ -40,6 +45,55 @@ def children_index(nodes: dict) -> dict:
     return ch
 
 
+def name_index(nodes: dict) -> dict:
+    """Lowercased ``(symbol, path)`` per node, for query-term bonuses."""
+    return {
+        nid: ((n.get("symbol") or "").lower(), (n.get("path") or "").lower())
+        for nid, n in nodes.items()
+    }
+
+
+class Tree(NamedTuple):
+    nodes: dict
+    parents: dict
+    children: dict
+    root: str | None
+    names: dict
+
+
+def _stat_key(path: str) -> tuple[str, int, int]:
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+
+def load_tree(index_dir: str) -> Tree:
+    """Nodes, parent/child/name maps and root id for an index, memoized per process.
+
+    Entries are keyed on the nodes file's size and mtime, so a rebuilt
+    index is reloaded. Callers must treat the returned maps as read-only.
+    """
+    return _load_tree(*_stat_key(os.path.join(index_dir, "nodes.jsonl")))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_tree(path: str, mtime_ns: int, size: int) -> Tree:
+    nodes = load_nodes(os.path.dirname(path))
+    root = next((nid for nid, n in nodes.items() if n["parent_id"] is None), None)
+    return Tree(
+        nodes, parent_index(nodes), children_index(nodes), root, name_index(nodes)
+    )
+
+
+def load_bm25(index_dir: str) -> BM25Index:
+    """The index's BM25 model, memoized like :func:`load_tree`."""
+    return _load_bm25(*_stat_key(index_path(index_dir)))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_bm25(path: str, mtime_ns: int, size: int) -> BM25Index:
+    return BM25Index.load(path)
+
+
 def aggregate_desc_scores(node_id: str, children: dict, local_scores: dict) -> float:
     total = local_scores.get(node_id, 0.0)
     for c in children.get(node_id, []):
@@ -47,37 +101,112 @@ def aggregate_desc_scores(node_id: str, children: dict, local_scores: dict) -> f
     return total
 
 
+def aggregate_scores(
+    root: str, children: dict, local_scores: dict, parents: dict | None = None
+) -> dict:
+    """``aggregate_desc_scores`` for every node under ``root`` in one
+    iterative post-order pass; sums run in the same order, so values match.
+
+    With ``parents``, only ancestors of scored nodes are visited: every other
+    subtree sums to 0.0 and is left out of the result.
+    """
+    live = None
+    if parents is not None:
+        live = set()
+        for nid in local_scores:
+            while nid is not None and nid not in live:
+                live.add(nid)
+                nid = parents.get(nid)
+    agg: dict[str, float] = {}
+    seen = {root}
+    stack: list[tuple[str, bool]] = [(root, False)]
+    while stack:
+        nid, done = stack.pop()
+        kids = children.get(nid, ())
+        if live is not None:
+            kids = [c for c in kids if c in live]
+        if done:
+            total = local_scores.get(nid, 0.0)
+            for c in kids:
+                total += agg.get(c, 0.0)
+            agg[nid] = total
+            continue
+        stack.append((nid, True))
+        for c in kids:
+            if c not in seen:  # guards against cycles in malformed indexes
+                seen.add(c)
+                stack.append((c, False))
+    return agg
+
+
 def search(
-    index_dir: str, query: str, *, top: int = 10, budget: int = 120, gate: str = "off"
+    index_dir: str,
+    query: str,
+    *,
+    top: int = 10,
+    budget: int = 120,
+    gate: str = "off",
+    emit_trace: bool = True,
+    emit_html: bool = True,
+) -> dict:
+    # The BM25 load + query and the node tree load are independent, so a cold
+    # search overlaps them; warm searches hit the memoized loaders either way.
+    def bm25_hits() -> list[tuple[str, float]]:
+        return load_bm25(index_dir).search(query, top_k=max(top * 20, 200))
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        bm25_future = pool.submit(bm25_hits)
+        tree = load_tree(index_dir)
+        top_bm25 = bm25_future.result()
+    result = _tree_search(
+        query, tree, top_bm25, top=top, budget=budget, record=emit_trace
+    )
+    return {
+        "results": result["results"],
+        **write_trace(index_dir, result, emit_trace=emit_trace, emit_html=emit_html),
+    }
+
+
+def _tree_search(
+    query: str,
+    tree: Tree,
+    top_bm25: list[tuple[str, float]],
+    *,
+    top: int,
+    budget: int,
+    record: bool = True,
 ) -> dict:
-    bm25 = BM25Index.load(os.path.join(index_dir, "bm25.json"))
-    nodes = load_nodes(index_dir)
-    parents = parent_index(nodes)
-    children = children_index(nodes)
-    top_bm25 = bm25.search(query, top_k=max(top * 20, 200))
+    nodes, parents, children, root, names = tree
     local_scores = {doc: sc for doc, sc in top_bm25}
-    cand = set(local_scores.keys())
-    for nid in list(cand):
-        p = parents.get(nid)
-        while p:
-            cand.add(p)
-            p = parents.get(p)
+
+    q_terms = query.lower().split()
+    bonuses: dict[str, float] = {}
 
     def node_score(nid: str) -> float:
-        n = nodes[nid]
-        bonus = 0.0
-        for w in query.lower().split():
-            if (n.get("symbol") and w in (n["symbol"] or "").lower()) or (
-                n.get("path") and w in (n["path"] or "").lower()
-            ):
-                bonus += 0.1
-        return aggregate_desc_scores(nid, children, local_scores) + bonus
+        bonus = bonuses.get(nid)
+        if bonus is None:
+            symbol, path = names[nid]
+            bonus = 0.0
+            for w in q_terms:
+                if w in symbol or w in path:
+                    bonus += 0.1
+            bonuses[nid] = bonus
+        return agg.get(nid, 0.0) + bonus
 
     frontier: list[tuple[float, str]] = []
-    root = [nid for nid, n in nodes.items() if n["parent_id"] is None][0]
+    if root is None:
+        raise IndexError("index has no root node")
+    # Subtree sums are fixed per query, so compute them all once up front.
+    agg = aggregate_scores(root, children, local_scores, parents)
     heapq.heappush(frontier, (-node_score(root), root))
     visited = set()
     answers: list[tuple[str, float]] = []
+    # Min-heap of the best ``top`` hybrid scores so far. BM25 scores are
+    # non-negative, so no leaf under a node can have a hybrid score above
+    # 3 * agg + the largest possible name bonus; once that bound falls below
+    # the current top-k, the subtree cannot change the results.
+    best: list[float] = []
+    bonus_cap = 0.1 * len(q_terms)
     trace: list[dict] = []
     steps = 0
     while frontier and steps < budget:
@@ -88,37 +217,61 @@ def search(
             continue
         visited.add(nid)
         n = nodes[nid]
-        reason = f"agg(desc BM25)={score:.3f}; symbol={n.get('symbol')}; path={n.get('path')}"
-        trace.append(
-            TraceStep(
-                event="expand",
-                node_id=nid,
-                score=score,
-                reason=reason,
-                meta={"kind": n["kind"]},
-            ).__dict__
-        )
-        if n["kind"] in ("func", "block", "const"):
+        is_leaf = n["kind"] in ("func", "block", "const")
+        if (
+            not is_leaf
+            and len(best) >= top > 0
+            and 3.0 * agg.get(nid, 0.0) + bonus_cap < best[0]
+        ):
+            if record:
+                trace.append(
+                    {
+                        "event": "prune",
+                        "node_id": nid,
+                        "score": score,
+                        "reason": f"subtree bound below top-{top} hybrid {best[0]:.3f}",
+                        "meta": {"kind": n["kind"]},
+                    }
+                )
+            continue
+        if record:
+            trace.append(
+                {
+                    "event": "expand",
+                    "node_id": nid,
+                    "score": score,
+                    "reason": f"agg(desc BM25)={score:.3f}; symbol={n.get('symbol')}; path={n.get('path')}",
+                    "meta": {"kind": n["kind"]},
+                }
+            )
+        if is_leaf:
             # Store both local BM25 score and aggregate score for better ranking
             local_bm25 = local_scores.get(nid, 0.0)
             agg_score = node_score(nid)
             # Use hybrid score: prioritize direct matches, but use aggregate for context
             hybrid_score = local_bm25 * 2.0 + agg_score
             answers.append((nid, local_bm25, agg_score, hybrid_score))
-            trace.append(
-                TraceStep(
-                    event="answer",
-                    node_id=nid,
-                    score=local_bm25,
-                    reason=f"leaf candidate; local={local_bm25:.3f} agg={agg_score:.3f}",
-                    meta={"aggregate_score": agg_score},
-                ).__dict__
-            )
+            if len(best) < top:
+                heapq.heappush(best, hybrid_score)
+            elif top > 0 and hybrid_score > best[0]:
+                heapq.heapreplace(best, hybrid_score)
+            if record:
+                trace.append(
+                    {
+                        "event": "answer",
+                        "node_id": nid,
+                        "score": local_bm25,
+                        "reason": f"leaf candidate; local={local_bm25:.3f} agg={agg_score:.3f}",
+                        "meta": {"aggregate_score": agg_score},
+                    }
+                )
             continue
-        kids = children.get(nid, [])
-        kids.sort(key=lambda k: node_score(k), reverse=True)
-        for k in kids[:10]:
-            heapq.heappush(frontier, (-node_score(k), k))
+        # Children with no BM25 hit below them and no name match score 0.0;
+        # they can only pad the frontier, so they are never pushed.
+        # Each child is scored once; nlargest is stable, so ties keep index order.
+        kids = [(sc, k) for k in children.get(nid, ()) if (sc := node_score(k)) > 0.0]
+        for sc, k in heapq.nlargest(10, kids, key=itemgetter(0)):
+            heapq.heappush(frontier, (-sc, k))
     # Sort by hybrid score: direct matches + hierarchical context
     answers.sort(key=lambda x: x[3], reverse=True)
     results = [
@@ -133,102 +286,94 @@ def search(
         }
         for nid, local_bm25, agg_score, hybrid_score in answers[:top]
     ]
-    tdir = os.path.join(index_dir, "trace")
-    os.makedirs(tdir, exist_ok=True)
-    with open(os.path.join(tdir, "last_trace.json"), "w", encoding="utf-8") as f:
-        json.dump(
-            {"query": query, "results": results, "trace": trace},
-            f,
-            ensure_ascii=False,
-            indent=2,
-        )
-    with open(os.path.join(tdir, "results.json"), "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
-    build_trace_html(index_dir)
-    return {
-        "results": results,
-        "trace_path": os.path.join(tdir, "last_trace.json"),
-        "html": os.path.join(tdir, "trace.html"),
-    }
+    return {"query": query, "results": results, "trace": trace}
 
 
-def build_trace_html(index_dir: str) -> bool:
-    """Generate enhanced HTML trace viewer with LLM reasoning visualization."""
-    tdir = os.path.join(index_dir, "trace")
-    data_path = os.path.join(tdir, "last_trace.json")
-    if not os.path.exists(data_path):
-        return False
-
-    with open(data_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
 
-    # Detect search mode
-    mode = data.get("mode", "bm25")
-    stats = data.get("stats", {})
 
-    # Load full nodes and edges for enhanced visualization
-    nodes_file = os.path.join(index_dir, "nodes.jsonl")
-    edges_file = os.path.join(index_dir, "edges.jsonl")
+def write_trace(
+    index_dir: str, trace_data: dict, *, emit_trace: bool = True, emit_html: bool = True
+) -> dict:
+    """Write ``last_trace.json``/``results.json`` and optionally the HTML viewer.
 
-    nodes_data = []
-    edges_data = []
+    Returns the ``trace_path`` and ``html`` entries of a search result; either
+    is None when not written. The viewer is built from the trace file, so
+    ``emit_html`` only applies when ``emit_trace`` is set.
+    """
+    if not emit_trace:
+        return {"trace_path": None, "html": None}
+    tdir = os.path.join(index_dir, "trace")
+    os.makedirs(tdir, exist_ok=True)
+    trace_path = os.path.join(tdir, "last_trace.json")
+    payload = json_dumps(trace_data, indent=True)
+    _write_atomic(trace_path, payload)
+    _write_atomic(
+        os.path.join(tdir, "results.json"),
+        json_dumps(trace_data["results"], indent=True),
+    )
+    html = None
+    if emit_html:
+        html = _render_trace_html(index_dir, trace_data, payload)
+    return {"trace_path": trace_path, "html": html}
 
-    if os.path.exists(nodes_file):
-        with open(nodes_file, "r", encoding="utf-8") as f:
-            nodes_data = [json.loads(line) for line in f if line.strip()]
 
-    if os.path.exists(edges_file):
-        with open(edges_file, "r", encoding="utf-8") as f:
-            edges_data = [json.loads(line) for line in f if line.strip()]
+TRACE_DATA_FILE = "trace_data.js"
+TRACE_NODES_FILE = "trace_nodes.js"
+TRACE_EDGES_FILE = "trace_edges.js"
 
-    html = (
-        """<!doctype html>
+# Filled in with str.format, so literal braces in the CSS/JS are doubled.
+_HTML_TEMPLATE = """<!doctype html>
 <html>
 <head>
 <meta charset="utf-8"/>
 <title>CodeIndex - Advanced Code Explorer</title>
 <style>
-* { box-sizing: border-box; }
-body {
+* {{ box-sizing: border-box; }}
+body {{
     font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
     margin: 0;
     padding: 0;
     background: #f5f7fa;
     overflow: hidden;
-}
-.header {
+}}
+.header {{
     background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
     color: white;
     padding: 20px 30px;
     box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-}
-.header h1 {
+}}
+.header h1 {{
     margin: 0 0 10px 0;
     font-size: 28px;
     font-weight: 700;
-}
-.stats {
+}}
+.stats {{
     display: flex;
     gap: 20px;
     margin-top: 12px;
-}
-.stat {
+}}
+.stat {{
     padding: 8px 16px;
     background: rgba(255,255,255,0.2);
     border-radius: 20px;
     font-size: 13px;
     backdrop-filter: blur(10px);
-}
-.stat strong { font-weight: 700; }
+}}
+.stat strong {{ font-weight: 700; }}
 
-.tabs {
+.tabs {{
     display: flex;
     gap: 0;
     background: white;
     border-bottom: 2px solid #e0e0e0;
     padding: 0 30px;
-}
-.tab {
+}}
+.tab {{
     padding: 15px 25px;
     cursor: pointer;
     border: none;
@@ -238,81 +383,81 @@ body {
     color: #666;
     border-bottom: 3px solid transparent;
     transition: all 0.3s;
-}
-.tab:hover { color: #667eea; }
-.tab.active {
+}}
+.tab:hover {{ color: #667eea; }}
+.tab.active {{
     color: #667eea;
     border-bottom-color: #667eea;
-}
+}}
 
-.content {
+.content {{
     height: calc(100vh - 180px);
     overflow: hidden;
-}
-.view {
+}}
+.view {{
     display: none;
     height: 100%;
     padding: 20px 30px;
     overflow-y: auto;
-}
-.view.active { display: block; }
+}}
+.view.active {{ display: block; }}
 
 /* Tree View */
-.tree-search {
+.tree-search {{
     margin-bottom: 15px;
     padding: 10px 15px;
     border: 2px solid #e0e0e0;
     border-radius: 8px;
     width: 100%;
     font-size: 14px;
-}
-.tree-container {
+}}
+.tree-container {{
     background: white;
     border-radius: 8px;
     padding: 20px;
     box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-}
-.tree-node {
+}}
+.tree-node {{
     padding: 6px 10px;
     margin: 2px 0;
     cursor: pointer;
     border-radius: 4px;
     transition: all 0.2s;
     user-select: none;
-}
-.tree-node:hover { background: #f0f4ff; }
-.tree-node.explored { background: #e3f2fd; }
-.tree-node.answer {
+}}
+.tree-node:hover {{ background: #f0f4ff; }}
+.tree-node.explored {{ background: #e3f2fd; }}
+.tree-node.answer {{
     background: #c8e6c9;
     font-weight: 600;
-}
-.node-header {
+}}
+.node-header {{
     display: flex;
     align-items: center;
     gap: 8px;
-}
-.toggle {
+}}
+.toggle {{
     display: inline-block;
     width: 16px;
     text-align: center;
     font-size: 10px;
     color: #999;
-}
-.children {
+}}
+.children {{
     margin-left: 20px;
     border-left: 1px dashed #ddd;
     padding-left: 5px;
-}
+}}
 
 /* Reasoning Tree View */
-.reasoning-tree {
+.reasoning-tree {{
     background: white;
     border-radius: 8px;
     padding: 20px;
     box-shadow: 0 2px 8px rgba(0,0,0,0.08);
     overflow-x: auto;
-}
-.reason-node {
+}}
+.reason-node {{
     position: relative;
     padding: 12px 16px;
     margin: 10px;
@@ -321,170 +466,156 @@ body {
     background: #f9f9f9;
     min-width: 250px;
     display: inline-block;
-}
-.reason-node.evaluate { border-left-color: #17a2b8; }
-.reason-node.answer { border-left-color: #28a745; background: #e8f5e9; }
-.reason-node.expand { border-left-color: #ffc107; }
-.reason-header {
+}}
+.reason-node.evaluate {{ border-left-color: #17a2b8; }}
+.reason-node.answer {{ border-left-color: #28a745; background: #e8f5e9; }}
+.reason-node.expand {{ border-left-color: #ffc107; }}
+.reason-header {{
     display: flex;
     justify-content: space-between;
     margin-bottom: 6px;
-}
-.reason-symbol {
+}}
+.reason-symbol {{
     font-weight: 600;
     font-size: 14px;
-}
-.reason-confidence {
+}}
+.reason-confidence {{
     padding: 2px 8px;
     border-radius: 12px;
     font-size: 11px;
     font-weight: 600;
-}
-.conf-high { background: #d4edda; color: #155724; }
-.conf-med { background: #fff3cd; color: #856404; }
-.conf-low { background: #f8d7da; color: #721c24; }
-.reason-path {
+}}
+.conf-high {{ background: #d4edda; color: #155724; }}
+.conf-med {{ background: #fff3cd; color: #856404; }}
+.conf-low {{ background: #f8d7da; color: #721c24; }}
+.reason-path {{
     font-size: 11px;
     color: #666;
     margin-bottom: 6px;
-}
-.reason-text {
+}}
+.reason-text {{
     font-size: 12px;
     color: #555;
     font-style: italic;
-}
+}}
 
 /* Impact Map */
-.impact-container {
+.impact-container {{
     background: white;
     border-radius: 8px;
     padding: 20px;
     box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-}
-#impact-canvas {
+}}
+#impact-canvas {{
     width: 100%;
     height: 600px;
     border: 1px solid #e0e0e0;
     border-radius: 8px;
-}
-.impact-legend {
+}}
+.impact-legend {{
     display: flex;
     gap: 20px;
     margin-top: 15px;
     padding: 15px;
     background: #f9f9f9;
     border-radius: 8px;
-}
-.legend-item {
+}}
+.legend-item {{
     display: flex;
     align-items: center;
     gap: 8px;
-}
-.legend-color {
+}}
+.legend-color {{
     width: 20px;
     height: 20px;
     border-radius: 4px;
-}
+}}
 
 /* Architecture View */
-.arch-container {
+.arch-container {{
     background: white;
     border-radius: 8px;
     padding: 20px;
     box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-}
-#arch-canvas {
+}}
+#arch-canvas {{
     width: 100%;
     height: 600px;
     border: 1px solid #e0e0e0;
     border-radius: 8px;
-}
-.component-box {
+}}
+.component-box {{
     padding: 15px;
     border-radius: 8px;
     margin: 10px;
     display: inline-block;
     box-shadow: 0 2px 6px rgba(0,0,0,0.1);
-}
-.component-title {
+}}
+.component-title {{
     font-weight: 700;
     font-size: 14px;
     margin-bottom: 8px;
-}
-.component-items {
+}}
+.component-items {{
     font-size: 12px;
     color: #666;
-}
+}}
 
 /* Results Panel */
-.results-grid {
+.results-grid {{
     display: grid;
     grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
     gap: 15px;
-}
-.result-card {
+}}
+.result-card {{
     background: white;
     border-radius: 8px;
     padding: 15px;
     box-shadow: 0 2px 6px rgba(0,0,0,0.08);
     border-left: 4px solid #28a745;
     transition: transform 0.2s;
-}
-.result-card:hover {
+}}
+.result-card:hover {{
     transform: translateY(-2px);
     box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-}
-.result-symbol {
+}}
+.result-symbol {{
     font-weight: 600;
     font-size: 15px;
     color: #333;
     margin-bottom: 6px;
-}
-.result-kind {
+}}
+.result-kind {{
     display: inline-block;
     padding: 2px 8px;
     background: #e3f2fd;
     border-radius: 4px;
     font-size: 11px;
     margin-right: 6px;
-}
-.result-path {
+}}
+.result-path {{
     font-size: 12px;
     color: #666;
     margin: 6px 0;
-}
-.result-reasoning {
+}}
+.result-reasoning {{
     font-size: 13px;
     color: #555;
     margin-top: 10px;
     font-style: italic;
     border-top: 1px solid #f0f0f0;
     padding-top: 10px;
-}
+}}
 </style>
 </head>
 <body>
 <div class="header">
-    <h1>🔍 """
-        + data.get("query", "Search Query")
-        + """</h1>
+    <h1>🔍 {query}</h1>
     <div class="stats">
-        <div class="stat">Mode: <strong>"""
-        + mode.upper()
-        + """</strong></div>
-        <div class="stat">Steps: <strong>"""
-        + str(stats.get("steps", len(data.get("trace", []))))
-        + """</strong></div>
-        <div class="stat">Results: <strong>"""
-        + str(len(data.get("results", [])))
-        + """</strong></div>
-        """
-        + (
-            f'<div class="stat">Budget: <strong>{stats.get("budget", "?")}</strong></div>'
-            if mode == "llm"
-            else ""
-        )
-        + """
+        <div class="stat">Mode: <strong>{mode}</strong></div>
+        <div class="stat">Steps: <strong>{steps}</strong></div>
+        <div class="stat">Results: <strong>{results_count}</strong></div>
+        {budget_stat}
     </div>
 </div>
 
@@ -540,72 +671,74 @@ body {
     </div>
 </div>
 
+<script src="{data_file}"></script>
+<script src="{nodes_file}"></script>
 <script>
-const DATA = """
-        + json.dumps(data)
-        + """;
-const NODES = """
-        + json.dumps(nodes_data)
-        + """;
-const EDGES = """
-        + json.dumps(edges_data)
-        + """;
-
 let exploredNodes = new Set();
 let answerNodes = new Set();
 
 // Extract explored and answer nodes from trace
-DATA.trace?.forEach(st => {
-    if (st.event === 'evaluate' || st.event === 'expand') {
+DATA.trace?.forEach(st => {{
+    if (st.event === 'evaluate' || st.event === 'expand') {{
         exploredNodes.add(st.node_id);
-    }
-    if (st.is_answer || st.event === 'answer') {
+    }}
+    if (st.is_answer || st.event === 'answer') {{
         answerNodes.add(st.node_id);
-    }
-});
+    }}
+}});
 
-function switchTab(view) {
+function switchTab(view) {{
     document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
     document.querySelectorAll('.view').forEach(v => v.classList.remove('active'));
     event.target.classList.add('active');
     document.getElementById(view + '-view').classList.add('active');
     
     // Render on first view
-    if (view === 'reasoning' && !document.getElementById('reasoning-tree').innerHTML) {
+    if (view === 'reasoning' && !document.getElementById('reasoning-tree').innerHTML) {{
         renderReasoningTree();
-    }
-    if (view === 'impact' && !document.getElementById('impact-canvas').dataset.rendered) {
-        renderImpactMap();
-    }
-    if (view === 'architecture' && !document.getElementById('arch-canvas').dataset.rendered) {
+    }}
+    if (view === 'impact' && !document.getElementById('impact-canvas').dataset.rendered) {{
+        withEdges(renderImpactMap);
+    }}
+    if (view === 'architecture' && !document.getElementById('arch-canvas').dataset.rendered) {{
         renderArchitecture();
-    }
-}
+    }}
+}}
+
+// Edges are only needed by the impact map, so they load on first use.
+function withEdges(fn) {{
+    if (window.EDGES) return fn();
+    const script = document.createElement('script');
+    script.src = '{edges_file}';
+    script.onload = fn;
+    script.onerror = () => {{ window.EDGES = []; fn(); }};
+    document.body.appendChild(script);
+}}
 
-function escapeHtml(s) {
-    return String(s || '').replace(/[&<>"']/g, c => ({
+function escapeHtml(s) {{
+    return String(s || '').replace(/[&<>"']/g, c => ({{
         '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
-    })[c]);
-}
+    }})[c]);
+}}
 
 // ==================== CODE TREE ====================
-function buildTreeStructure() {
-    const nodeMap = {};
-    NODES.forEach(n => { nodeMap[n.node_id] = {...n, children: []} });
+function buildTreeStructure() {{
+    const nodeMap = {{}};
+    NODES.forEach(n => {{ nodeMap[n.node_id] = {{...n, children: []}} }});
     
     const root = NODES.find(n => !n.parent_id);
     if (!root) return null;
     
-    NODES.forEach(n => {
-        if (n.parent_id && nodeMap[n.parent_id]) {
+    NODES.forEach(n => {{
+        if (n.parent_id && nodeMap[n.parent_id]) {{
             nodeMap[n.parent_id].children.push(nodeMap[n.node_id]);
-        }
-    });
+        }}
+    }});
     
     return nodeMap[root.node_id];
-}
+}}
 
-function renderTreeNode(node, container) {
+function renderTreeNode(node, container) {{
     const div = document.createElement('div');
     div.className = 'tree-node';
     div.dataset.nodeId = node.node_id;
@@ -613,10 +746,10 @@ function renderTreeNode(node, container) {
     if (exploredNodes.has(node.node_id)) div.classList.add('explored');
     if (answerNodes.has(node.node_id)) div.classList.add('answer');
     
-    const icon = {
+    const icon = {{
         'repo': '📦', 'pkg': '📁', 'file': '📄',
         'class': '🏛️', 'func': '⚡', 'const': '💎', 'block': '📦'
-    }[node.kind] || '•';
+    }}[node.kind] || '•';
     
     const header = document.createElement('div');
     header.className = 'node-header';
@@ -626,73 +759,73 @@ function renderTreeNode(node, container) {
     toggle.textContent = node.children.length > 0 ? '▼' : '';
     
     // FIX: Create proper closure for toggle handler
-    if (node.children.length > 0) {
+    if (node.children.length > 0) {{
         toggle.style.cursor = 'pointer';
-        toggle.addEventListener('click', function(e) {
+        toggle.addEventListener('click', function(e) {{
             e.stopPropagation();
             const childrenDiv = div.querySelector('.children');
-            if (childrenDiv) {
+            if (childrenDiv) {{
                 const isCollapsed = childrenDiv.style.display === 'none';
                 childrenDiv.style.display = isCollapsed ? 'block' : 'none';
                 toggle.textContent = isCollapsed ? '▼' : '▶';
-            }
-        });
-    }
+            }}
+        }});
+    }}
     
     const labelSpan = document.createElement('span');
-    labelSpan.innerHTML = `${icon} <strong>${escapeHtml(node.symbol || node.kind)}</strong>`;
+    labelSpan.innerHTML = `${{icon}} <strong>${{escapeHtml(node.symbol || node.kind)}}</strong>`;
     
     header.appendChild(toggle);
     header.appendChild(labelSpan);
     div.appendChild(header);
     
-    if (node.children.length > 0) {
+    if (node.children.length > 0) {{
         const childContainer = document.createElement('div');
         childContainer.className = 'children';
         node.children.forEach(child => renderTreeNode(child, childContainer));
         div.appendChild(childContainer);
-    }
+    }}
     
     container.appendChild(div);
-}
+}}
 
-function searchTree(event) {
+function searchTree(event) {{
     const query = event.target.value.toLowerCase();
     const nodes = document.querySelectorAll('.tree-node');
     
-    nodes.forEach(node => {
+    nodes.forEach(node => {{
         const text = node.textContent.toLowerCase();
-        if (text.includes(query)) {
+        if (text.includes(query)) {{
             node.style.display = 'block';
             // Expand parents
             let parent = node.parentElement;
-            while (parent) {
-                if (parent.classList.contains('tree-node')) {
+            while (parent) {{
+                if (parent.classList.contains('tree-node')) {{
                     parent.classList.remove('collapsed');
                     const toggle = parent.querySelector('.toggle');
                     if (toggle) toggle.textContent = '▼';
-                }
+                }}
                 parent = parent.parentElement;
-            }
-        } else if (query) {
+            }}
+        }} else if (query) {{
             node.style.display = 'none';
-        } else {
+        }} else {{
             node.style.display = 'block';
-        }
-    });
-}
+        }}
+    }});
+}}
 
 // ==================== REASONING TREE ====================
-function renderReasoningTree() {
+function renderReasoningTree() {{
     const container = document.getElementById('reasoning-tree');
     const trace = DATA.trace || [];
     
     // Build tree structure from trace
     const treeData = [];
-    const nodeMap = {};
+    const nodeMap = {{}};
     
-    trace.forEach((step, i) => {
-        const node = {
+    trace.forEach((step, i) => {{
+        const node = {{
             id: step.node_id,
             step: i + 1,
             event: step.event,
@@ -702,56 +835,56 @@ function renderReasoningTree() {
             reasoning: step.reasoning,
             is_answer: step.is_answer || step.event === 'answer',
             children: []
-        };
+        }};
         
         nodeMap[step.node_id] = node;
         
         // Find parent based on expand events
-        if (step.event === 'expand' && i > 0) {
+        if (step.event === 'expand' && i > 0) {{
             // This is a child being added to frontier
             const parentStep = trace.slice(0, i).reverse().find(s => s.event === 'evaluate');
-            if (parentStep && nodeMap[parentStep.node_id]) {
+            if (parentStep && nodeMap[parentStep.node_id]) {{
                 nodeMap[parentStep.node_id].children.push(node);
-            } else {
+            }} else {{
                 treeData.push(node);
-            }
-        } else if (step.event === 'evaluate') {
+            }}
+        }} else if (step.event === 'evaluate') {{
             treeData.push(node);
-        }
-    });
+        }}
+    }});
     
     // Render tree
-    if (treeData.length > 0) {
+    if (treeData.length > 0) {{
         treeData.forEach(node => renderReasonNode(node, container, 0));
-    } else {
+    }} else {{
         container.innerHTML = '<p style="color:#666">No reasoning trace available</p>';
-    }
-}
+    }}
+}}
 
-function renderReasonNode(node, container, depth) {
+function renderReasonNode(node, container, depth) {{
     const div = document.createElement('div');
-    div.className = `reason-node ${node.event}`;
+    div.className = `reason-node ${{node.event}}`;
     div.style.marginLeft = (depth * 30) + 'px';
     
     const confClass = node.confidence > 0.6 ? 'conf-high' : node.confidence > 0.3 ? 'conf-med' : 'conf-low';
     
     div.innerHTML = `
         <div class="reason-header">
-            <span class="reason-symbol">${node.step}. ${node.event === 'evaluate' ? '🔎' : node.event === 'answer' ? '✅' : '🔀'} ${escapeHtml(node.symbol)}</span>
-            <span class="reason-confidence ${confClass}">${(node.confidence * 100).toFixed(0)}%</span>
+            <span class="reason-symbol">${{node.step}}. ${{node.event === 'evaluate' ? '🔎' : node.event === 'answer' ? '✅' : '🔀'}} ${{escapeHtml(node.symbol)}}</span>
+            <span class="reason-confidence ${{confClass}}">${{(node.confidence * 100).toFixed(0)}}%</span>
         </div>
-        <div class="reason-path">${escapeHtml(node.path || '')}</div>
-        ${node.reasoning ? `<div class="reason-text">${escapeHtml(node.reasoning)}</div>` : ''}
-        ${node.is_answer ? '<div style="color:#28a745;font-weight:600;margin-top:6px">✓ ANSWER</div>' : ''}
+        <div class="reason-path">${{escapeHtml(node.path || '')}}</div>
+        ${{node.reasoning ? `<div class="reason-text">${{escapeHtml(node.reasoning)}}</div>` : ''}}
+        ${{node.is_answer ? '<div style="color:#28a745;font-weight:600;margin-top:6px">✓ ANSWER</div>' : ''}}
     `;
     
     container.appendChild(div);
     
     node.children.forEach(child => renderReasonNode(child, container, depth + 1));
-}
+}}
 
 // ==================== IMPACT MAP ====================
-function renderImpactMap() {
+function renderImpactMap() {{
     const canvas = document.getElementById('impact-canvas');
     canvas.dataset.rendered = 'true';
     const ctx = canvas.getContext('2d');
@@ -761,30 +894,30 @@ function renderImpactMap() {
     // Filter to relevant nodes (func/class only)
     const graphNodes = NODES.filter(n => n.kind === 'func' || n.kind === 'class');
     
-    if (graphNodes.length === 0) {
+    if (graphNodes.length === 0) {{
         ctx.fillStyle = '#666';
         ctx.font = '16px sans-serif';
         ctx.fillText('No functions or classes to display', 20, canvas.height / 2);
         return;
-    }
+    }}
     
     // Group by file for better organization
-    const byFile = {};
-    graphNodes.forEach(n => {
+    const byFile = {{}};
+    graphNodes.forEach(n => {{
         const file = n.path || 'unknown';
         if (!byFile[file]) byFile[file] = [];
         byFile[file].push(n);
-    });
+    }});
     
     const files = Object.keys(byFile);
-    const nodeMap = {};
+    const nodeMap = {{}};
     
     // Grid layout: arrange files in columns, nodes in rows within each file
     const cols = Math.min(files.length, 5);
     const colWidth = canvas.width / cols;
     const padding = 40;
     
-    files.forEach((file, fileIdx) => {
+    files.forEach((file, fileIdx) => {{
         const col = fileIdx % cols;
         const row = Math.floor(fileIdx / cols);
         const nodes = byFile[file];
@@ -799,68 +932,68 @@ function renderImpactMap() {
         const nodesPerRow = Math.ceil(Math.sqrt(nodes.length));
         const nodeSpacing = Math.min(60, (colWidth - padding) / nodesPerRow);
         
-        nodes.forEach((node, idx) => {
+        nodes.forEach((node, idx) => {{
             const nodeCol = idx % nodesPerRow;
             const nodeRow = Math.floor(idx / nodesPerRow);
             
-            nodeMap[node.node_id] = {
+            nodeMap[node.node_id] = {{
                 ...node,
                 x: col * colWidth + padding + nodeCol * nodeSpacing,
                 y: row * 200 + 40 + nodeRow * 40
-            };
-        });
-    });
+            }};
+        }});
+    }});
     
     // Build edge map for only nodes we're displaying
     const edgeSet = new Set();
-    EDGES.forEach(edge => {
-        if (nodeMap[edge.src] && nodeMap[edge.dst]) {
+    EDGES.forEach(edge => {{
+        if (nodeMap[edge.src] && nodeMap[edge.dst]) {{
             edgeSet.add(JSON.stringify([edge.src, edge.dst]));
-        }
-    });
+        }}
+    }});
     
     // Draw edges (only between displayed nodes)
     ctx.strokeStyle = 'rgba(150, 150, 150, 0.3)';
     ctx.lineWidth = 1;
-    edgeSet.forEach(edgeStr => {
+    edgeSet.forEach(edgeStr => {{
         const [srcId, dstId] = JSON.parse(edgeStr);
         const src = nodeMap[srcId];
         const dst = nodeMap[dstId];
-        if (src && dst && src !== dst) {
+        if (src && dst && src !== dst) {{
             ctx.beginPath();
             ctx.moveTo(src.x, src.y);
             ctx.lineTo(dst.x, dst.y);
             ctx.stroke();
-        }
-    });
+        }}
+    }});
     
     // Draw nodes
-    Object.values(nodeMap).forEach(node => {
+    Object.values(nodeMap).forEach(node => {{
         // Node circle
         ctx.beginPath();
         const radius = answerNodes.has(node.node_id) ? 10 : 6;
         ctx.arc(node.x, node.y, radius, 0, Math.PI * 2);
         
-        if (answerNodes.has(node.node_id)) {
+        if (answerNodes.has(node.node_id)) {{
             ctx.fillStyle = '#28a745';
             ctx.strokeStyle = '#1e7e34';
             ctx.lineWidth = 2;
-        } else if (exploredNodes.has(node.node_id)) {
+        }} else if (exploredNodes.has(node.node_id)) {{
             ctx.fillStyle = '#ffc107';
             ctx.strokeStyle = '#e0a800';
             ctx.lineWidth = 2;
-        } else {
+        }} else {{
             ctx.fillStyle = '#667eea';
             ctx.strokeStyle = '#5568d3';
             ctx.lineWidth = 1;
-        }
+        }}
         ctx.fill();
         ctx.stroke();
         
         // Label with background (only for answer and explored nodes)
-        if (answerNodes.has(node.node_id) || exploredNodes.has(node.node_id)) {
+        if (answerNodes.has(node.node_id) || exploredNodes.has(node.node_id)) {{
             const label = node.symbol || '';
-            if (label && label.length < 20) {
+            if (label && label.length < 20) {{
                 ctx.font = 'bold 11px sans-serif';
                 const metrics = ctx.measureText(label);
                 ctx.fillStyle = 'rgba(255,255,255,0.95)';
@@ -872,18 +1005,18 @@ function renderImpactMap() {
                 ctx.strokeRect(boxX, boxY, metrics.width + 6, 16);
                 ctx.fillStyle = '#333';
                 ctx.fillText(label, node.x - metrics.width / 2, node.y + 24);
-            }
-        }
-    });
+            }}
+        }}
+    }});
     
     // Draw legend
     ctx.font = '12px sans-serif';
     ctx.fillStyle = '#666';
-    ctx.fillText(`Showing ${graphNodes.length} functions/classes grouped by file`, 10, canvas.height - 10);
-}
+    ctx.fillText(`Showing ${{graphNodes.length}} functions/classes grouped by file`, 10, canvas.height - 10);
+}}
 
 // ==================== ARCHITECTURE ====================
-function renderArchitecture() {
+function renderArchitecture() {{
     const canvas = document.getElementById('arch-canvas');
     canvas.dataset.rendered = 'true';
     const ctx = canvas.getContext('2d');
@@ -891,31 +1024,31 @@ function renderArchitecture() {
     canvas.height = 600;
     
     // Group nodes by package
-    const packages = {};
-    NODES.forEach(node => {
-        if (node.kind === 'pkg') {
-            packages[node.symbol] = {
+    const packages = {{}};
+    NODES.forEach(node => {{
+        if (node.kind === 'pkg') {{
+            packages[node.symbol] = {{
                 files: [],
                 functions: [],
                 classes: []
-            };
-        }
-    });
+            }};
+        }}
+    }});
     
-    NODES.forEach(node => {
+    NODES.forEach(node => {{
         const pkg = node.path?.split('/')[0];
-        if (pkg && packages[pkg]) {
+        if (pkg && packages[pkg]) {{
             if (node.kind === 'file') packages[pkg].files.push(node);
             else if (node.kind === 'func') packages[pkg].functions.push(node);
             else if (node.kind === 'class') packages[pkg].classes.push(node);
-        }
-    });
+        }}
+    }});
     
     // Draw package boxes
     const colors = ['#667eea', '#f093fb', '#4facfe', '#43e97b', '#fa709a'];
     let x = 50, y = 50;
     
-    Object.keys(packages).forEach((pkgName, i) => {
+    Object.keys(packages).forEach((pkgName, i) => {{
         const pkg = packages[pkgName];
         const width = 200;
         const height = 150;
@@ -932,60 +1065,149 @@ function renderArchitecture() {
         
         ctx.font = '11px sans-serif';
         ctx.fillStyle = '#666';
-        ctx.fillText(`Files: ${pkg.files.length}`, x + 10, y + 50);
-        ctx.fillText(`Classes: ${pkg.classes.length}`, x + 10, y + 70);
-        ctx.fillText(`Functions: ${pkg.functions.length}`, x + 10, y + 90);
+        ctx.fillText(`Files: ${{pkg.files.length}}`, x + 10, y + 50);
+        ctx.fillText(`Classes: ${{pkg.classes.length}}`, x + 10, y + 70);
+        ctx.fillText(`Functions: ${{pkg.functions.length}}`, x + 10, y + 90);
         
         x += 250;
-        if (x > canvas.width - 200) {
+        if (x > canvas.width - 200) {{
             x = 50;
             y += 200;
-        }
-    });
-}
+        }}
+    }});
+}}
 
 // ==================== RESULTS ====================
-function renderResults() {
+function renderResults() {{
     const container = document.getElementById('results-grid');
     const results = DATA.results || [];
     
-    results.forEach(r => {
+    results.forEach(r => {{
         const card = document.createElement('div');
         card.className = 'result-card';
         card.innerHTML = `
             <div class="result-symbol">
-                <span class="result-kind">${r.kind}</span>
-                ${escapeHtml(r.symbol || '(anonymous)')}
+                <span class="result-kind">${{r.kind}}</span>
+                ${{escapeHtml(r.symbol || '(anonymous)')}}
             </div>
-            <div class="result-path">${escapeHtml(r.path || '')}</div>
+            <div class="result-path">${{escapeHtml(r.path || '')}}</div>
             <div style="margin-top:8px">
                 <span class="conf-high" style="padding:4px 10px;border-radius:12px;font-size:12px">
-                    ${((r.score || 0) * 100).toFixed(0)}% confidence
+                    ${{((r.score || 0) * 100).toFixed(0)}}% confidence
                 </span>
             </div>
-            ${r.reasoning ? `<div class="result-reasoning">"${escapeHtml(r.reasoning)}"</div>` : ''}
+            ${{r.reasoning ? `<div class="result-reasoning">"${{escapeHtml(r.reasoning)}}"</div>` : ''}}
         `;
         container.appendChild(card);
-    });
-}
+    }});
+}}
 
 // Initialize
 const treeRoot = buildTreeStructure();
-if (treeRoot) {
+if (treeRoot) {{
     renderTreeNode(treeRoot, document.getElementById('tree-container'));
-}
+}}
 renderResults();
 </script>
 </body>
 </html>
 """
-    )
 
-    with open(os.path.join(tdir, "trace.html"), "w", encoding="utf-8") as f:
-        f.write(html)
+
+def _write_jsonl_script(out_path: str, name: str, jsonl_path: str) -> None:
+    """Expose a JSONL file to the viewer as ``window.<name> = [...]``.
+
+    Nodes and edges only change when the index is rebuilt, so the script is
+    rewritten only when it is older than its source.
+    """
+    try:
+        if os.stat(out_path).st_mtime_ns >= os.stat(jsonl_path).st_mtime_ns:
+            return
+    except FileNotFoundError:
+        pass
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as out:
+        out.write(f"window.{name} = ".encode())
+        _write_jsonl_array(out, jsonl_path)
+        out.write(b";\n")
+    os.replace(tmp, out_path)
+
+
+def _write_jsonl_array(out, path: str) -> None:
+    """Copy a JSONL file into ``out`` as a JSON array without decoding rows."""
+    out.write(b"[")
+    if os.path.exists(path):
+        first = True
+        with open(path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if not first:
+                    out.write(b",")
+                out.write(line)
+                first = False
+    out.write(b"]")
+
+
+def build_trace_html(index_dir: str) -> bool:
+    """Generate enhanced HTML trace viewer with LLM reasoning visualization."""
+    tdir = os.path.join(index_dir, "trace")
+    data_path = os.path.join(tdir, "last_trace.json")
+    if not os.path.exists(data_path):
+        return False
+
+    with open(data_path, "rb") as f:
+        raw = f.read()
+    _render_trace_html(index_dir, json_loads(raw), raw)
     return True
 
 
+def _render_trace_html(index_dir: str, data: dict, raw: bytes) -> str:
+    """Write the viewer for trace ``data`` (serialized as ``raw``); returns
+    the path of ``trace.html``."""
+    tdir = os.path.join(index_dir, "trace")
+
+    # Detect search mode
+    mode = data.get("mode", "bm25")
+    stats = data.get("stats", {})
+
+    # The trace, nodes and edges go to sibling scripts the page loads, so the
+    # large payloads are copied as bytes rather than re-encoded into the HTML
+    # string. A <script src> (unlike fetch) also works from file://.
+    _write_atomic(os.path.join(tdir, TRACE_DATA_FILE), b"window.DATA = " + raw + b";\n")
+    _write_jsonl_script(
+        os.path.join(tdir, TRACE_NODES_FILE),
+        "NODES",
+        os.path.join(index_dir, "nodes.jsonl"),
+    )
+    _write_jsonl_script(
+        os.path.join(tdir, TRACE_EDGES_FILE),
+        "EDGES",
+        os.path.join(index_dir, "edges.jsonl"),
+    )
+
+    budget_stat = (
+        f'<div class="stat">Budget: <strong>{stats.get("budget", "?")}</strong></div>'
+        if mode == "llm"
+        else ""
+    )
+    html = _HTML_TEMPLATE.format(
+        query=data.get("query", "Search Query"),
+        mode=mode.upper(),
+        steps=stats.get("steps", len(data.get("trace", []))),
+        results_count=len(data.get("results", [])),
+        budget_stat=budget_stat,
+        data_file=TRACE_DATA_FILE,
+        nodes_file=TRACE_NODES_FILE,
+        edges_file=TRACE_EDGES_FILE,
+    )
+
+    html_path = os.path.join(tdir, "trace.html")
+    _write_atomic(html_path, html.encode("utf-8"))
+    return html_path
+
+
 def search_llm(
     index_dir: str,
     query: str,
@@ -993,6 +1215,8 @@ def search_llm(
     top: int = 10,
     budget: int = 50,
     model: str = "gpt-4o-mini",
+    emit_trace: bool = True,
+    emit_html: bool = True,
 ) -> dict:
     """
     Perform LLM-guided reasoning search through the code tree.
@@ -1003,22 +1227,18 @@ def search_llm(
         top: Max results to return
         budget: Max nodes to evaluate (LLM calls)
         model: OpenAI model for reasoning
+        emit_trace: Write last_trace.json and results.json
+        emit_html: Also rebuild the HTML trace viewer
 
     Returns:
-        Dict with results, trace, and paths to trace files
+        Dict with results, trace, and paths to trace files (None if not written)
     """
-    nodes = load_nodes(index_dir)
-    children = children_index(nodes)
-
-    # Run async LLM search
+    # Run async LLM search; evaluations are cached across searches
     result = asyncio.run(
-        llm_guided_search(nodes, children, query, model=model, budget=budget, top=top)
+        _llm_search_async(index_dir, query, top=top, budget=budget, model=model)
     )
 
     # Save trace and results
-    tdir = os.path.join(index_dir, "trace")
-    os.makedirs(tdir, exist_ok=True)
-
     trace_data = {
         "query": query,
         "results": result["results"],
@@ -1027,17 +1247,34 @@ def search_llm(
         "mode": "llm",
     }
 
-    with open(os.path.join(tdir, "last_trace.json"), "w", encoding="utf-8") as f:
-        json.dump(trace_data, f, ensure_ascii=False, indent=2)
-
-    with open(os.path.join(tdir, "results.json"), "w", encoding="utf-8") as f:
-        json.dump(result["results"], f, ensure_ascii=False, indent=2)
-
-    build_trace_html(index_dir)
-
     return {
         "results": result["results"],
-        "trace_path": os.path.join(tdir, "last_trace.json"),
-        "html": os.path.join(tdir, "trace.html"),
+        **write_trace(
+            index_dir, trace_data, emit_trace=emit_trace, emit_html=emit_html
+        ),
         "stats": result["stats"],
     }
+
+
+async def _llm_search_async(
+    index_dir: str, query: str, *, top: int, budget: int, model: str
+) -> dict:
+    # Load the tree off-loop while the cache opens; the sqlite connection is
+    # created here because it may only be used from the thread that made it.
+    tree_load = asyncio.ensure_future(asyncio.to_thread(load_tree, index_dir))
+    cache = EvalCache.for_index(index_dir)
+    try:
+        tree = await tree_load
+        nodes, children = tree.nodes, tree.children
+        return await llm_guided_search(
+            nodes,
+            children,
+            query,
+            model=model,
+            budget=budget,
+            top=top,
+            cache=cache,
+        )
+    finally:
+        if cache is not None:
+            cache.close()
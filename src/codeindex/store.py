@@ -1,27 +1,82 @@
 from __future__ import annotations
-import os
+
 import json
+import os
+from collections.abc import Iterable
 from dataclasses import asdict
-from typing import Iterable
+from typing import Any, Self
+
 from .nodes import CallsiteRecord, Node
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
 
-def write_jsonl(path: str, items: Iterable[dict]):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
+
+def json_dumps(obj: Any, *, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode(
+        "utf-8"
+    )
+
+
+def _json_line(obj: Any) -> bytes:
+    # Node dataclasses are serialized directly: orjson handles them natively,
+    # and the stdlib fallback converts them only when it meets one.
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False, default=asdict) + "\n").encode("utf-8")
+
+
+def json_loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class JsonlWriter:
+    """Write JSON lines incrementally so rows need not be held in memory."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+
+    def write(self, obj: dict) -> None:
+        self._f.write(_json_line(obj))
+        self.count += 1
+
+    def write_many(self, items: Iterable[dict]) -> None:
         for obj in items:
-            f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+            self.write(obj)
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> Self:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._f = open(self.path, "wb", buffering=1 << 20)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def write_jsonl(path: str, items: Iterable[dict]):
+    with JsonlWriter(path) as writer:
+        writer.write_many(items)
 
 
 def load_jsonl(path: str):
-    with open(path, "r", encoding="utf-8") as f:
+    with open(path, "rb") as f:
         for line in f:
             if line.strip():
-                yield json.loads(line)
+                yield json_loads(line)
 
 
 def write_nodes(path: str, nodes: Iterable[Node]):
-    write_jsonl(path, (asdict(n) for n in nodes))
+    write_jsonl(path, nodes)
 
 
 def write_edges(path: str, edges: Iterable[dict]):
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
 
 from dotenv import load_dotenv
 
 from .logger import logger
+from .store import json_dumps, json_loads
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional accelerator
+    uvloop = None
 
 load_dotenv()
 
@@ -24,8 +31,131 @@ _SUMMARY_PROMPT = (
 )
 
 
+def run_async(coro):
+    """``asyncio.run`` on a uvloop event loop when uvloop is installed."""
+    if uvloop is not None:
+        return asyncio.run(coro, loop_factory=uvloop.new_event_loop)
+    return asyncio.run(coro)
+
+
+def pooled_http_client(concurrency: int):
+    """aiohttp-backed transport (openai[aiohttp]) pooled to the batch concurrency."""
+    try:
+        from openai import DEFAULT_CONNECTION_LIMITS, DefaultAioHttpClient
+
+        # Built from openai's own Limits type so this tracks whichever httpx
+        # flavour the installed SDK uses.
+        limits = type(DEFAULT_CONNECTION_LIMITS)(
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency,
+            keepalive_expiry=60,
+        )
+        return DefaultAioHttpClient(limits=limits)
+    except (ImportError, RuntimeError) as e:
+        logger.warning(
+            "aiohttp transport unavailable (%s); using the default OpenAI client", e
+        )
+        return None
+
+
+# Below this many snippets a batch job's queueing delay outweighs its savings.
+_BATCH_API_MIN = 50
+_BATCH_DONE = ("completed", "failed", "expired", "cancelled")
+
+
+async def _summarize_via_batch(client, bodies: list[dict]) -> list[str | None]:
+    """Run chat completion ``bodies`` as one Batch API job and wait for it."""
+    payload = b"".join(
+        json_dumps(
+            {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }
+        )
+        + b"\n"
+        for i, body in enumerate(bodies)
+    )
+    upload = await client.files.create(
+        file=("codeindex-summaries.jsonl", payload), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=upload.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    logger.info("Submitted summary batch %s (%d requests)", batch.id, len(bodies))
+    poll = float(os.getenv("CODEINDEX_BATCH_POLL", "30"))
+    while batch.status not in _BATCH_DONE:
+        await asyncio.sleep(poll)
+        batch = await client.batches.retrieve(batch.id)
+
+    results: list[str | None] = [None] * len(bodies)
+    if batch.output_file_id:
+        output = await client.files.content(batch.output_file_id)
+        for line in output.content.splitlines():
+            if not line.strip():
+                continue
+            row = json_loads(line)
+            try:
+                content = row["response"]["body"]["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                continue
+            if content:
+                results[int(row["custom_id"])] = content.strip()
+    failed = results.count(None)
+    if failed:
+        logger.warning(
+            "Summary batch %s (%s): %d/%d requests without a summary",
+            batch.id,
+            batch.status,
+            failed,
+            len(bodies),
+        )
+    return results
+
+
+def _summary_key(request: dict) -> str:
+    return hashlib.blake2b(json_dumps(request), digest_size=16).hexdigest()
+
+
+def _read_summary(cache_dir: str, key: str) -> str | None:
+    path = os.path.join(cache_dir, f"{key}.txt")
+    try:
+        with open(path, encoding="utf-8") as f:
+            summary = f.read()
+    except FileNotFoundError:
+        return None
+    except (OSError, UnicodeDecodeError) as e:
+        logger.debug("Ignoring unreadable summary cache entry %s: %s", key, e)
+        return None
+    # Refresh the mtime so the entry survives the build's cache pruning.
+    try:
+        os.utime(path)
+    except OSError as e:
+        logger.debug("Could not touch summary cache entry %s: %s", path, e)
+    return summary
+
+
+def _write_summary(cache_dir: str, key: str, summary: str) -> None:
+    path = os.path.join(cache_dir, f"{key}.txt")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(summary)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug("Could not write summary cache entry %s: %s", path, e)
+
+
 async def summarize_many_async(
-    texts: list[str], *, model: str, concurrency: int = 10
+    texts: list[str],
+    *,
+    model: str,
+    concurrency: int = 10,
+    cache_dir: str | None = None,
 ) -> list[str | None]:
     """
     Concurrent async batch summarization using AsyncOpenAI chat.completions API.
@@ -34,19 +164,83 @@ async def summarize_many_async(
         texts: Code snippets to summarize
         model: OpenAI model to use (e.g., 'gpt-5-nano-2025-08-07', 'gpt-4o-mini', 'gpt-4o')
         concurrency: Max parallel requests (limited by semaphore)
+        cache_dir: Directory of summaries keyed by request hash; hits skip the API
 
     Returns:
-        List of summaries (None on failure) preserving input order
+        List of summaries (None on failure) preserving input order. Identical
+        requests are only sent once.
 
     Environment variables:
         CODEINDEX_SUMMARY_TIMEOUT: Request timeout in seconds (default: 30)
         CODEINDEX_SUMMARY_RETRIES: Max retry attempts (default: 2)
+        CODEINDEX_USE_BATCH_API: Submit batches of more than 50 snippets as one
+            OpenAI Batch API job instead of concurrent requests (default: off)
+        CODEINDEX_BATCH_POLL: Batch job polling interval in seconds (default: 30)
 
     Note:
         - Uses max_completion_tokens instead of deprecated max_tokens parameter
         - Temperature (0.3) is only set for non-nano models, as nano models don't support it
         - Recommended: gpt-5-nano-2025-08-07 (fastest), gpt-4o-mini (balanced), gpt-4o (quality)
     """
+    # Request parameters that only depend on the model
+    model_lc = model.lower()
+    is_reasoning_model = "gpt-5" in model_lc
+    is_nano_or_o1 = "nano" in model_lc or "o1" in model_lc
+    base_params: dict = {
+        "model": model,
+        "max_completion_tokens": 1000 if is_nano_or_o1 else 200,
+    }
+    if is_reasoning_model:
+        base_params["reasoning_effort"] = os.getenv(
+            "CODEINDEX_SUMMARY_REASONING", "minimal"
+        )
+    elif not is_nano_or_o1:
+        base_params["temperature"] = 0.3
+    system_message = {
+        "role": "system",
+        "content": (
+            "You are a concise code documenter for search indexing. "
+            "Reason internally, then respond exactly as instructed."
+        ),
+    }
+
+    def _request(t: str | None) -> dict:
+        return {
+            **base_params,
+            "messages": [
+                system_message,
+                {
+                    "role": "user",
+                    "content": _SUMMARY_PROMPT
+                    + "\n\n--- CODE/CONTEXT ---\n"
+                    + (t or "")[:4000],
+                },
+            ],
+        }
+
+    # Group identical requests and answer what we can from the cache
+    results: list[str | None] = [None] * len(texts)
+    groups: dict[str, list[int]] = {}
+    cached = 0
+    for i, t in enumerate(texts):
+        key = _summary_key(_request(t))
+        hit = _read_summary(cache_dir, key) if cache_dir else None
+        if hit is not None:
+            results[i] = hit
+            cached += 1
+        else:
+            groups.setdefault(key, []).append(i)
+    keys = list(groups)
+    if cached or len(keys) < len(texts) - cached:
+        logger.info(
+            "Summaries: %d cached, %d duplicate, %d to request",
+            cached,
+            len(texts) - cached - len(keys),
+            len(keys),
+        )
+    if not keys:
+        return results
+
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY is not set")
@@ -56,13 +250,31 @@ async def summarize_many_async(
 
     from openai import AsyncOpenAI
 
-    sem = asyncio.Semaphore(max(1, concurrency))
+    concurrency = max(1, concurrency)
+    sem = asyncio.Semaphore(concurrency)
+    unique = [texts[groups[k][0]] for k in keys]
 
+    # One client for the whole batch so TLS connections are pooled and reused.
     async with AsyncOpenAI(
         api_key=api_key,
         timeout=default_timeout,
         max_retries=max_retries,
+        http_client=pooled_http_client(concurrency),
     ) as client:
+        fetched: list[str | None] | None = None
+        if len(unique) > _BATCH_API_MIN and os.getenv("CODEINDEX_USE_BATCH_API"):
+            try:
+                fetched = await _summarize_via_batch(
+                    client, [_request(t) for t in unique]
+                )
+            except Exception as e:
+                logger.warning(
+                    "Batch API summarization failed (%s: %s); "
+                    "falling back to concurrent requests",
+                    type(e).__name__,
+                    str(e)[:100],
+                )
+                logger.debug("Batch API traceback", exc_info=True)
 
         async def _one(i: int, t: str):
             async with sem:
@@ -70,44 +282,13 @@ async def summarize_many_async(
                     logger.debug(
                         "Summarizing snippet %d/%d: model=%s, timeout=%.1fs, text_len=%d",
                         i + 1,
-                        len(texts),
+                        len(unique),
                         model,
                         default_timeout,
                         len(t or ""),
                     )
 
-                    # Build API call parameters
-                    is_reasoning_model = "gpt-5" in model.lower()
-                    params = {
-                        "model": model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": (
-                                    "You are a concise code documenter for search indexing. "
-                                    "Reason internally, then respond exactly as instructed."
-                                ),
-                            },
-                            {
-                                "role": "user",
-                                "content": _SUMMARY_PROMPT
-                                + "\n\n--- CODE/CONTEXT ---\n"
-                                + (t or "")[:4000],
-                            },
-                        ],
-                        "max_completion_tokens": 1000
-                        if "nano" in model.lower() or "o1" in model.lower()
-                        else 200,
-                    }
-
-                    if is_reasoning_model:
-                        params["reasoning_effort"] = os.getenv(
-                            "CODEINDEX_SUMMARY_REASONING", "minimal"
-                        )
-                    elif "nano" not in model.lower() and "o1" not in model.lower():
-                        params["temperature"] = 0.3
-
-                    resp = await client.chat.completions.create(**params)
+                    resp = await client.chat.completions.create(**_request(t))
 
                     content = resp.choices[0].message.content
                     if content:
@@ -127,11 +308,19 @@ async def summarize_many_async(
                         type(e).__name__,
                         str(e)[:100],  # Truncate long error messages
                     )
+                    logger.debug("Summary %d traceback", i + 1, exc_info=True)
                     return i, None
 
-        tasks = [asyncio.create_task(_one(i, txt)) for i, txt in enumerate(texts)]
-        results: list[str | None] = [None] * len(texts)
-        for fut in asyncio.as_completed(tasks):
-            i, val = await fut
+        if fetched is None:
+            # gather keeps input order, so no per-result index bookkeeping
+            pairs = await asyncio.gather(*(_one(i, t) for i, t in enumerate(unique)))
+            fetched = [val for _, val in pairs]
+
+    for key, val in zip(keys, fetched):
+        if val is None:
+            continue
+        for i in groups[key]:
             results[i] = val
-        return results
+        if cache_dir:
+            _write_summary(cache_dir, key, val)
+    return results
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 import os
+import threading
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 
-from tree_sitter import Parser
+from tree_sitter import Parser, Query
 
 try:
     from tree_sitter_languages import get_language
-except Exception:
+except ImportError:
     get_language = None  # user must install tree_sitter_languages
 
-from .ast_indexer import DEFAULT_CALLSITE_CAP, stable_id
+from .ast_indexer import DEFAULT_CALLSITE_CAP, count_lines, stable_id
 from .logger import logger
 from .nodes import (
     CallsiteRecord,
@@ -21,25 +23,46 @@ from .nodes import (
     NodeKind,
 )
 
+# Bump when the emitted nodes/edges change so cached per-file results are dropped.
+INDEXER_VERSION = 8
+
 LANG_BY_EXT = {
     ".js": "javascript",
     ".jsx": "javascript",  # grammar usually has JSX enabled
     ".ts": "typescript",
     ".tsx": "tsx",  # if unavailable, we fall back to 'typescript'
 }
+_TS_EXTS = frozenset({".ts", ".tsx"})
+
+# Child node kinds the handlers match on.
+_CLASS_NAME_TYPES = frozenset({"identifier", "type_identifier"})
+_CLASS_BODY_TYPES = frozenset({"class_body", "declaration_list"})
+_METHOD_TYPES = frozenset({"method_definition", "method_signature"})
+_STRING_TYPES = frozenset({"string", "string_literal"})
+_MEMBER_NAME_TYPES = frozenset({"property_identifier", "identifier"})
+_BINDING_TYPES = frozenset({"identifier", "array_pattern", "object_pattern"})
+_FUNC_EXPR_TYPES = frozenset(
+    {"arrow_function", "function", "generator_function", "function_expression"}
+)
+
 
+class TSParseError(RuntimeError):
+    """No grammar or parser for a file, or tree-sitter failed to parse it."""
 
+
+@lru_cache(maxsize=8)
 def _get_language_for_ext(ext: str):
     if get_language is None:
-        raise RuntimeError(
+        raise TSParseError(
             "tree_sitter_languages is required for JS/TS parsing. Install with: uv add tree_sitter tree_sitter_languages"
         )
-    lang_name = LANG_BY_EXT.get(ext.lower())
+    # callers pass the already-lowered extension
+    lang_name = LANG_BY_EXT.get(ext)
     if lang_name is None:
-        return None
+        return None, None
     try:
         return get_language(lang_name), lang_name
-    except Exception:
+    except AttributeError:  # grammar missing from the bundled languages.so
         # fallbacks
         if lang_name == "tsx":
             return get_language("typescript"), "typescript"
@@ -48,36 +71,67 @@ def _get_language_for_ext(ext: str):
         return None, None
 
 
-def _slice(text: str, node) -> str:
-    # node.start_point/end_point are (row, col), 0-based
-    (sr, sc) = node.start_point
-    (er, ec) = node.end_point
-    lines = text.splitlines()
-    seg = []
-    for i in range(sr, er + 1):
-        line = lines[i]
-        if i == sr and i == er:
-            seg.append(line[sc:ec])
-        elif i == sr:
-            seg.append(line[sc:])
-        elif i == er:
-            seg.append(line[:ec])
-        else:
-            seg.append(line)
-    return "\n".join(seg)
+_local = threading.local()
+
+
+def _get_parser(lang, lang_name: str) -> Parser:
+    """Per-thread parser for ``lang``; parsers are not safe to share."""
+    parsers = getattr(_local, "parsers", None)
+    if parsers is None:
+        parsers = _local.parsers = {}
+    parser = parsers.get(lang_name)
+    if parser is None:
+        parser = parsers[lang_name] = Parser()
+        parser.set_language(lang)
+    return parser
+
+
+_QUERIES: dict[tuple[str, tuple[str, ...]], Query] = {}
+
+
+def _node_query(lang, lang_name: str, kinds: tuple[str, ...]) -> Query:
+    """Compiled query capturing every node of ``kinds`` the grammar knows."""
+    key = (lang_name, kinds)
+    query = _QUERIES.get(key)
+    if query is None:
+        known = []
+        for kind in kinds:
+            try:
+                lang.query(f"({kind})")
+            except NameError:  # tree-sitter's "Invalid node type" error
+                logger.debug("%s grammar has no %s nodes", lang_name, kind)
+                continue
+            known.append(kind)
+        query = lang.query("[" + " ".join(f"({k})" for k in known) + "] @node")
+        _QUERIES[key] = query
+    return query
+
+
+@lru_cache(maxsize=4096)
+def _visibility(name: str) -> str:
+    if name.startswith("__") and not name.endswith("__"):
+        return "private"
+    if name.startswith("_"):
+        return "protected"
+    return "public"
+
+
+def _slice(src: bytes, node) -> str:
+    # tree-sitter offsets index the UTF-8 buffer the tree was parsed from
+    return src[node.start_byte : node.end_byte].decode("utf-8")
 
 
-def _node_text(text: str, node) -> str:
-    return _slice(text, node)
+def _node_text(src: bytes, node) -> str:
+    return _slice(src, node)
 
 
-def _id_text(text: str, node) -> str | None:
+def _id_text(src: bytes, node) -> str | None:
     if node is None:
         return None
-    return _slice(text, node).strip()
+    return _slice(src, node).strip()
 
 
-@dataclass
+@dataclass(slots=True)
 class _Ctx:
     text: str
     nodes: list[Node]
@@ -92,13 +146,20 @@ class TSFileIndexer:
     def __init__(
         self,
         rel_path: str,
-        file_text: str,
+        file_text: str | bytes,
         *,
         enrich: bool = False,
         call_cap: int = DEFAULT_CALLSITE_CAP,
     ):
         self.rel_path = rel_path
-        self.text = file_text
+        self._rel_path_b = rel_path.encode()
+        self._ext = os.path.splitext(rel_path)[1].lower()
+        # tree-sitter works on UTF-8 bytes; ``text`` is only decoded on demand.
+        if isinstance(file_text, bytes):
+            self.text_bytes = file_text
+        else:
+            self.text_bytes = file_text.encode("utf-8")
+            self.text = file_text
         self.nodes: list[Node] = []
         self.edges: list[dict] = []
         self.stack: list[str] = []
@@ -116,9 +177,18 @@ class TSFileIndexer:
             "callsites_total": 0,
             "callsite_cap_hits": 0,
         }
+        self.lang = None
         self.lang_name: str = ""
         self.class_stack: list[str] = []
         self.func_nodes: dict[str, Node] = {}
+        self._func_by_span: dict[tuple[int, int], str] = {}
+        # dict as an insertion-ordered set: callees in source order
+        self._call_edges: dict[str, dict[str, None]] = {}
+        self._pending_calls: dict[str, list[tuple]] = {}
+
+    @cached_property
+    def text(self) -> str:
+        return self.text_bytes.decode("utf-8")
 
     def _parent_id(self) -> str | None:
         return self.stack[-1] if self.stack else None
@@ -126,27 +196,33 @@ class TSFileIndexer:
     def index(
         self,
     ) -> tuple[list[Node], list[dict], list[CallsiteRecord], dict[str, int]]:
-        ext = os.path.splitext(self.rel_path)[1].lower()
-        lang, lang_name = _get_language_for_ext(ext)
+        try:
+            lang, lang_name = _get_language_for_ext(self._ext)
+        except (AttributeError, OSError) as e:  # grammar library failed to load
+            raise TSParseError(f"tree-sitter grammar unavailable: {e}") from e
         if not lang:
-            raise RuntimeError(f"No tree-sitter language available for extension {ext}")
-        parser = Parser()
-        parser.set_language(lang)
-        tree = parser.parse(bytes(self.text, "utf-8"))
+            raise TSParseError(
+                f"No tree-sitter language available for extension {self._ext}"
+            )
+        try:
+            tree = _get_parser(lang, lang_name).parse(self.text_bytes)
+        except ValueError as e:  # grammar/library version mismatch
+            raise TSParseError(f"tree-sitter parser setup failed: {e}") from e
         root = tree.root_node
+        self.lang = lang
         self.lang_name = lang_name or "typescript"
 
         # File node
-        total_lines = len(self.text.splitlines())
+        total_lines = count_lines(self.text_bytes)
         extra = {}
         if self.enrich:
             extra = {"doc": {"lang": self.lang_name}}
         fnode = Node(
-            node_id=stable_id("file", self.rel_path, None, 1, total_lines),
+            node_id=stable_id("file", self._rel_path_b, None, 1, total_lines),
             parent_id=None,
             kind=NodeKind.FILE,
             path=self.rel_path,
-            lang="typescript" if "ts" in ext else "javascript",
+            lang="typescript" if self._ext in _TS_EXTS else "javascript",
             symbol=os.path.basename(self.rel_path),
             start_line=1,
             end_line=total_lines,
@@ -158,198 +234,195 @@ class TSFileIndexer:
         self.nodes.append(fnode)
         self.stack.append(fnode.node_id)
 
-        # Walk and gather
-        self._walk(root, lang_name)
-
-        # imports
-        self._collect_imports(root, lang_name)
-        # calls
-        self._collect_calls(root)
+        # One pre-order pass; call edges resolve once every definition is known.
+        self._walk(root)
+        self._emit_calls()
 
         self.stack.pop()
         return self.nodes, self.edges, self.callsites, self.stats
 
     # ---- Walkers ----
-    def _walk(self, node, lang_name: str):
-        stack = [node]
-        while stack:
-            cur = stack.pop()
-            t = cur.type
-
-            if t == "class_declaration":
-                name = None
-                for ch in cur.children:
-                    if ch.type in ("identifier", "type_identifier"):
-                        name = _id_text(self.text, ch)
-                        break
-                start = cur.start_point[0] + 1
-                end = cur.end_point[0] + 1
-                extra = {}
-                if self.enrich:
-                    extra = {
-                        "doc": {
-                            "lang": self.lang_name or lang_name,
-                            "visibility": self._visibility(name or ""),
-                        }
-                    }
-                class_node = Node(
-                    node_id=stable_id("class", self.rel_path, name, start, end),
+    def _walk(self, root):
+        handlers = {
+            "class_declaration": self._on_class,
+            "function_declaration": self._on_function,
+            "generator_function_declaration": self._on_function,
+            "lexical_declaration": self._on_declaration,
+            "variable_declaration": self._on_declaration,
+            "import_statement": self._on_import,
+            "import_declaration": self._on_import,
+            "call_expression": self._on_call,
+        }
+        query = _node_query(self.lang, self.lang_name, tuple(handlers))
+        # Captures arrive in pre-order, so outer nodes are handled first.
+        for node, _ in query.captures(root):
+            handlers[node.type](node)
+
+    def _on_class(self, node) -> None:
+        # Node.children builds a fresh list on every access; fetch it once.
+        children = node.children
+        name = None
+        for ch in children:
+            if ch.type in _CLASS_NAME_TYPES:
+                name = _id_text(self.text_bytes, ch)
+                break
+        start = node.start_point[0] + 1
+        end = node.end_point[0] + 1
+        extra = {}
+        if self.enrich:
+            extra = {
+                "doc": {
+                    "lang": self.lang_name,
+                    "visibility": _visibility(name or ""),
+                }
+            }
+        class_node = Node(
+            node_id=stable_id("class", self._rel_path_b, name, start, end),
+            parent_id=self._parent_id(),
+            kind=NodeKind.CLASS,
+            path=self.rel_path,
+            symbol=name,
+            start_line=start,
+            end_line=end,
+            loc=end - start + 1,
+            summary=None,
+            extra=extra,
+        )
+        self.nodes.append(class_node)
+        if name:
+            self.defined[name] = class_node.node_id
+        body = None
+        for ch in children:
+            if ch.type in _CLASS_BODY_TYPES:
+                body = ch
+                break
+        if body:
+            owner = name or None
+            for md in body.children:
+                if md.type in _METHOD_TYPES:
+                    mname = None
+                    for c2 in md.children:
+                        if c2.type in _MEMBER_NAME_TYPES:
+                            mname = _id_text(self.text_bytes, c2)
+                            break
+                    if not mname:
+                        continue
+                    self._create_function_node(
+                        name=mname,
+                        ts_node=md,
+                        span_node=md,
+                        parent_id=class_node.node_id,
+                        kind=NodeKind.BLOCK,
+                        is_method=True,
+                        owner=owner,
+                        is_async=self._ts_is_async(md),
+                        is_generator=self._ts_is_generator(md),
+                    )
+
+    def _on_function(self, node) -> None:
+        name = None
+        for ch in node.children:
+            if ch.type == "identifier":
+                name = _id_text(self.text_bytes, ch)
+                break
+        self._create_function_node(
+            name=name,
+            ts_node=node,
+            span_node=node,
+            parent_id=self._parent_id(),
+            kind=NodeKind.FUNC,
+            is_method=False,
+            owner=None,
+            is_async=self._ts_is_async(node),
+            is_generator=self._ts_is_generator(node),
+        )
+
+    def _on_declaration(self, node) -> None:
+        for ch in node.children:
+            if ch.type != "variable_declarator":
+                continue
+            kind, name, init_node = self._classify_declarator(ch)
+            if kind is NodeKind.FUNC:
+                self._create_function_node(
+                    name=name,
+                    ts_node=init_node,
+                    span_node=ch,
+                    parent_id=self._parent_id(),
+                    kind=NodeKind.FUNC,
+                    is_method=False,
+                    owner=None,
+                    is_async=self._ts_is_async(init_node),
+                    is_generator=self._ts_is_generator(init_node),
+                )
+            elif kind is NodeKind.CONST:
+                start = ch.start_point[0] + 1
+                end = ch.end_point[0] + 1
+                const_node = Node(
+                    node_id=stable_id("const", self._rel_path_b, name, start, end),
                     parent_id=self._parent_id(),
-                    kind=NodeKind.CLASS,
+                    kind=NodeKind.CONST,
                     path=self.rel_path,
                     symbol=name,
                     start_line=start,
                     end_line=end,
                     loc=end - start + 1,
-                    summary=None,
-                    extra=extra,
                 )
-                self.nodes.append(class_node)
-                if name:
-                    self.defined[name] = class_node.node_id
-                body = None
-                for ch in cur.children:
-                    if ch.type in ("class_body", "declaration_list"):
-                        body = ch
-                        break
-                if body:
-                    owner = name or None
-                    for md in body.children:
-                        if md.type in ("method_definition", "method_signature"):
-                            mname = None
-                            for c2 in md.children:
-                                if c2.type in ("property_identifier", "identifier"):
-                                    mname = _id_text(self.text, c2)
-                                    break
-                            if not mname:
-                                continue
-                            self._create_function_node(
-                                name=mname,
-                                ts_node=md,
-                                span_node=md,
-                                parent_id=class_node.node_id,
-                                kind=NodeKind.BLOCK,
-                                is_method=True,
-                                owner=owner,
-                                is_async=self._ts_is_async(md),
-                                is_generator=self._ts_is_generator(md),
-                            )
-                # continue traversal
-            elif t in ("function_declaration", "generator_function_declaration"):
-                name = None
-                for ch in cur.children:
-                    if ch.type == "identifier":
-                        name = _id_text(self.text, ch)
-                        break
-                self._create_function_node(
-                    name=name,
-                    ts_node=cur,
-                    span_node=cur,
-                    parent_id=self._parent_id(),
-                    kind=NodeKind.FUNC,
-                    is_method=False,
-                    owner=None,
-                    is_async=self._ts_is_async(cur),
-                    is_generator=self._ts_is_generator(cur),
+                self.nodes.append(const_node)
+                self.defined[name] = const_node.node_id
+
+    def _classify_declarator(self, decl) -> tuple[NodeKind | None, str | None, object]:
+        """One pass over a declarator's children: ``(kind, name, init)``.
+
+        FUNC when it binds a function expression, CONST for an UPPER_CASE
+        name of two or more characters (the Python indexer's rule), else None.
+        """
+        name_node = None
+        init_node = None
+        for x in decl.children:
+            xt = x.type
+            if xt in _BINDING_TYPES:
+                name_node = x
+            elif xt in _FUNC_EXPR_TYPES:
+                init_node = x
+        name = _id_text(self.text_bytes, name_node) if name_node else None
+        if not name:
+            return None, None, None
+        if init_node is not None:
+            return NodeKind.FUNC, name, init_node
+        if len(name) >= 2 and name.isupper():
+            return NodeKind.CONST, name, None
+        return None, name, None
+
+    def _on_import(self, node) -> None:
+        src = None
+        for ch in node.children:
+            if ch.type in _STRING_TYPES:
+                src = _id_text(self.text_bytes, ch).strip("\"'")
+        if src:
+            self.edges.append(
+                {
+                    "src": self.nodes[0].node_id,
+                    "dst": src,
+                    "type": "import",
+                    "detail": src,
+                }
+            )
+
+    def _on_call(self, node) -> None:
+        edge_symbol, display_symbol = self._call_symbols(node)
+        caller_id = self._enclosing_func_id(node)
+        if caller_id and (edge_symbol or display_symbol):
+            self._call_edges.setdefault(caller_id, {})[
+                edge_symbol or display_symbol
+            ] = None
+            if self.enrich:
+                self._pending_calls.setdefault(caller_id, []).append(
+                    (edge_symbol, display_symbol, node)
                 )
-            elif t in ("lexical_declaration", "variable_declaration"):
-                for ch in cur.children:
-                    if ch.type == "variable_declarator":
-                        name_node = None
-                        init_node = None
-                        for x in ch.children:
-                            if x.type in (
-                                "identifier",
-                                "array_pattern",
-                                "object_pattern",
-                            ):
-                                name_node = x
-                            elif x.type in (
-                                "arrow_function",
-                                "function",
-                                "generator_function",
-                                "function_expression",
-                            ):
-                                init_node = x
-                        name = _id_text(self.text, name_node) if name_node else None
-                        if name and init_node is not None:
-                            self._create_function_node(
-                                name=name,
-                                ts_node=init_node,
-                                span_node=ch,
-                                parent_id=self._parent_id(),
-                                kind=NodeKind.FUNC,
-                                is_method=False,
-                                owner=None,
-                                is_async=self._ts_is_async(init_node),
-                                is_generator=self._ts_is_generator(init_node),
-                            )
-                        elif name and name.isupper():
-                            start = ch.start_point[0] + 1
-                            end = ch.end_point[0] + 1
-                            const_node = Node(
-                                node_id=stable_id(
-                                    "const", self.rel_path, name, start, end
-                                ),
-                                parent_id=self._parent_id(),
-                                kind=NodeKind.CONST,
-                                path=self.rel_path,
-                                symbol=name,
-                                start_line=start,
-                                end_line=end,
-                                loc=end - start + 1,
-                            )
-                            self.nodes.append(const_node)
-                            self.defined[name] = const_node.node_id
-
-            for child in reversed(cur.children):
-                stack.append(child)
-
-    def _collect_imports(self, root, lang_name: str):
-        stack = [root]
-        while stack:
-            n = stack.pop()
-            if n.type == "import_statement" or n.type == "import_declaration":
-                src = None
-                for ch in n.children:
-                    if ch.type in ("string", "string_literal"):
-                        src = _id_text(self.text, ch).strip("\"'")
-                if src:
-                    self.edges.append(
-                        {
-                            "src": self.nodes[0].node_id,
-                            "dst": src,
-                            "type": "import",
-                            "detail": src,
-                        }
-                    )
-            for c in n.children:
-                stack.append(c)
-
-    def _collect_calls(self, root):
-        call_edges: dict[str, set[str]] = {}
-        call_records: dict[str, list[CallsiteRecord]] = {}
-
-        stack = [root]
-        while stack:
-            node = stack.pop()
-            if node.type == "call_expression":
-                edge_symbol, display_symbol = self._call_symbols(node)
-                caller_id = self._enclosing_func_id(node)
-                if caller_id and (edge_symbol or display_symbol):
-                    symbol_key = edge_symbol or display_symbol
-                    call_edges.setdefault(caller_id, set()).add(symbol_key)
-                    if self.enrich:
-                        record = self._build_call_record(
-                            caller_id, edge_symbol, display_symbol, node
-                        )
-                        if record:
-                            call_records.setdefault(caller_id, []).append(record)
-            for child in node.children:
-                stack.append(child)
-
-        for fid, names in call_edges.items():
-            for nm in sorted(names):
+
+    def _emit_calls(self) -> None:
+        for fid, names in self._call_edges.items():
+            for nm in names:
                 dst = self.defined.get(nm, nm)
                 self.edges.append(
                     {"src": fid, "dst": dst, "type": "call", "detail": nm}
@@ -358,18 +431,21 @@ class TSFileIndexer:
         if not self.enrich:
             return
 
-        for fid, records in call_records.items():
-            capped = records[: self.call_cap]
-            if len(records) > self.call_cap:
+        # Cap before building so calls past the cap are never sliced out.
+        for fid, calls in self._pending_calls.items():
+            if len(calls) > self.call_cap:
                 self.stats["callsite_cap_hits"] += 1
                 logger.debug(
                     "DEBUG: callsite cap hit for %s (%d>%d)",
                     fid,
-                    len(records),
+                    len(calls),
                     self.call_cap,
                 )
-            self.callsites.extend(capped)
-            self.stats["callsites_total"] += len(capped)
+            for edge_symbol, display_symbol, node in calls[: self.call_cap]:
+                record = self._build_call_record(fid, edge_symbol, display_symbol, node)
+                if record:
+                    self.callsites.append(record)
+                    self.stats["callsites_total"] += 1
 
     # ------------------------------------------------------------------
 
@@ -392,7 +468,7 @@ class TSFileIndexer:
         node = Node(
             node_id=stable_id(
                 "block" if kind == NodeKind.BLOCK else "func",
-                self.rel_path,
+                self._rel_path_b,
                 name,
                 start,
                 end,
@@ -412,15 +488,16 @@ class TSFileIndexer:
             if owner:
                 self.defined[f"{owner}.{name}"] = node.node_id
         self.func_nodes[node.node_id] = node
+        self._func_by_span[(span_node.start_byte, span_node.end_byte)] = node.node_id
 
         self.stats["funcs_total"] += 1
 
         if self.enrich:
             meta: FunctionDocMetadata = {
                 "lang": self.lang_name
-                or ("typescript" if "ts" in self.rel_path else "javascript"),
+                or ("typescript" if self._ext in _TS_EXTS else "javascript"),
                 "params": params_meta,
-                "visibility": self._visibility(name or ""),
+                "visibility": _visibility(name or ""),
                 "is_async": is_async,
                 "flags": {"async": is_async, "generator": is_generator},
             }
@@ -432,122 +509,85 @@ class TSFileIndexer:
             node.extra = {"doc": meta}
 
     def _extract_ts_params(self, ts_node) -> tuple[str, list[FunctionParam]]:
-        params_node = None
-        for child in ts_node.children:
-            if child.type in (
-                "formal_parameters",
-                "parameters",
-                "call_signature",
-                "parameter_list",
-            ):
-                params_node = child
-                break
-        parts: list[str] = []
-        if params_node is None:
-            if ts_node.type == "arrow_function":
-                for child in ts_node.children:
-                    if child.type in ("identifier", "array_pattern", "object_pattern"):
-                        parts = [_slice(self.text, child).strip()]
-                        break
-            else:
-                parts = []
+        params_node = ts_node.child_by_field_name("parameters")
+        if params_node is not None:
+            params = [p for p in params_node.named_children if p.type != "comment"]
         else:
-            raw = _slice(self.text, params_node).strip()
-            if params_node.type == "identifier":
-                parts = [raw]
-            else:
-                inner = raw
-                if inner.startswith("(") and inner.endswith(")"):
-                    inner = inner[1:-1]
-                parts = [p.strip() for p in inner.split(",") if p.strip()]
+            # arrow functions may take a single bare parameter: `x => x`
+            single = ts_node.child_by_field_name("parameter")
+            params = [single] if single is not None else []
 
+        src = self.text_bytes
         params_meta: list[FunctionParam] = []
         parsed_parts: list[str] = []
-        for part in parts:
-            text = part.strip()
-            default = None
-            if "=" in text:
-                before, after = text.split("=", 1)
-                text = before.strip()
-                default = after.strip()
-            annotation = None
-            if ":" in text:
-                base, annot = text.split(":", 1)
-                text = base.strip()
-                annotation = annot.strip()
-            optional = text.endswith("?")
-            if optional:
-                text = text[:-1].strip()
-            is_rest = text.startswith("...")
-            if is_rest:
-                text = text[3:].strip()
-            name = text or part.strip()
-            meta: FunctionParam = {"name": name, "kind": "rest" if is_rest else "param"}
-            if annotation:
-                meta["annotation"] = annotation
-            if default is not None:
-                meta["default"] = default
+        for param in params:
+            pattern, type_node, value = param, None, None
+            if param.type in ("required_parameter", "optional_parameter"):
+                pattern = param.child_by_field_name("pattern") or param
+                type_node = param.child_by_field_name("type")
+                value = param.child_by_field_name("value")
+            elif param.type == "assignment_pattern":
+                pattern = param.child_by_field_name("left") or param
+                value = param.child_by_field_name("right")
+            is_rest = pattern.type == "rest_pattern"
+            if is_rest and pattern.named_child_count:
+                pattern = pattern.named_children[0]
+            meta: FunctionParam = {
+                "name": " ".join(_slice(src, pattern).split()),
+                "kind": "rest" if is_rest else "param",
+            }
+            if type_node is not None and type_node.named_child_count:
+                meta["annotation"] = _slice(src, type_node.named_children[0])
+            if value is not None:
+                meta["default"] = _slice(src, value)
             params_meta.append(meta)
-            cleaned = part.strip()
-            parsed_parts.append(cleaned)
+            parsed_parts.append(" ".join(_slice(src, param).split()))
 
         inner_sig = ", ".join(parsed_parts)
         signature = f"({inner_sig})" if inner_sig else "()"
         return signature, params_meta
 
-    def _visibility(self, name: str) -> str:
-        if name.startswith("__") and not name.endswith("__"):
-            return "private"
-        if name.startswith("_"):
-            return "protected"
-        return "public"
-
     def _ts_is_async(self, ts_node) -> bool:
-        snippet = _slice(self.text, ts_node).strip().lower()
-        if snippet.startswith("async ") or snippet.startswith("async("):
+        # JS/TS keywords are case-sensitive; check the prefix bytes as-is.
+        head = self.text_bytes[ts_node.start_byte : ts_node.start_byte + 6]
+        if head.startswith((b"async ", b"async(")):
             return True
-        for child in ts_node.children:
-            if getattr(child, "type", "") == "async":
-                return True
-        return False
+        return any(child.type == "async" for child in ts_node.children)
 
     def _ts_is_generator(self, ts_node) -> bool:
         if "generator" in ts_node.type:
             return True
-        snippet = _slice(self.text, ts_node).strip()
-        return "function*" in snippet
+        return (
+            self.text_bytes.find(b"function*", ts_node.start_byte, ts_node.end_byte)
+            != -1
+        )
 
     def _call_symbols(self, node) -> tuple[str | None, str | None]:
         if node.child_count == 0:
             return None, None
         fn = node.children[0]
         if fn.type == "identifier":
-            text = _id_text(self.text, fn)
+            text = _id_text(self.text_bytes, fn)
             return text, text
         if fn.type == "member_expression":
             prop = None
             for ch in fn.children[::-1]:
-                if ch.type in ("property_identifier", "identifier"):
-                    prop = _id_text(self.text, ch)
+                if ch.type in _MEMBER_NAME_TYPES:
+                    prop = _id_text(self.text_bytes, ch)
                     break
-            display = _id_text(self.text, fn)
+            display = _id_text(self.text_bytes, fn)
             return prop, display
         return None, None
 
     def _enclosing_func_id(self, node) -> str | None:
-        row = node.start_point[0] + 1
-        best: Node | None = None
-        for nd in self.nodes:
-            if (
-                nd.kind in (NodeKind.FUNC, NodeKind.BLOCK)
-                and nd.start_line
-                and nd.end_line
-            ):
-                if nd.start_line <= row <= nd.end_line:
-                    span = nd.end_line - nd.start_line
-                    if best is None or span < (best.end_line - best.start_line):
-                        best = nd
-        return best.node_id if best else None
+        # Nearest ancestor that produced a function/method node.
+        cur = node.parent
+        while cur is not None:
+            fid = self._func_by_span.get((cur.start_byte, cur.end_byte))
+            if fid is not None:
+                return fid
+            cur = cur.parent
+        return None
 
     def _build_call_record(
         self,
@@ -559,13 +599,11 @@ class TSFileIndexer:
         symbol_hint = display_symbol or edge_symbol
         if symbol_hint is None:
             return None
-        resolved_id = None
-        if edge_symbol and edge_symbol in self.defined:
-            resolved_id = self.defined[edge_symbol]
-        elif display_symbol and display_symbol in self.defined:
-            resolved_id = self.defined[display_symbol]
+        resolved_id = self.defined.get(edge_symbol) if edge_symbol else None
+        if resolved_id is None and display_symbol:
+            resolved_id = self.defined.get(display_symbol)
         line = node.start_point[0] + 1
-        snippet = _slice(self.text, node).strip()
+        snippet = _slice(self.text_bytes, node).strip()
         if resolved_id is None:
             logger.debug(
                 "DEBUG: unresolved callee %s in %s:%d (%s)",
@@ -594,3 +632,18 @@ class TSFileIndexer:
             "line": line,
             "snippet": snippet,
         }
+
+
+def index_file(
+    rel_path: str,
+    text: str | bytes,
+    *,
+    enrich: bool = False,
+    call_cap: int = DEFAULT_CALLSITE_CAP,
+) -> tuple[list[Node], list[dict], list[CallsiteRecord], dict[str, int]]:
+    """Index one JS/TS file; a picklable entry point for worker processes.
+
+    Only plain nodes, edges and records are returned, never tree-sitter
+    objects, so results cross process boundaries cheaply.
+    """
+    return TSFileIndexer(rel_path, text, enrich=enrich, call_cap=call_cap).index()
@@ -0,0 +1,2 @@
+# Manual connectivity check (needs OPENAI_API_KEY); run it directly as a script.
+collect_ignore = ["test_openai_connection.py"]
@@ -0,0 +1,45 @@
+import { formatName, retry } from "./util";
+
+export interface User {
+  id: number;
+  name: string;
+}
+
+export class UserService {
+  private cache = new Map<number, User>();
+
+  constructor(private readonly baseUrl: string) {}
+
+  async fetchUser(id: number, retries = 2): Promise<User> {
+    const cached = this.lookup(id);
+    if (cached) {
+      return cached;
+    }
+    const user = await retry(() => this.request(id), retries);
+    this.cache.set(id, user);
+    return user;
+  }
+
+  displayName(user: User, ...titles: string[]): string {
+    return formatName(user.name, titles);
+  }
+
+  private lookup(id: number): User | undefined {
+    return this.cache.get(id);
+  }
+
+  private async request(id: number): Promise<User> {
+    const res = await fetch(`${this.baseUrl}/users/${id}`);
+    return res.json();
+  }
+}
+
+export const createService = (baseUrl: string): UserService =>
+  new UserService(baseUrl);
+
+export function loadUsers(service: UserService, ids: number[]) {
+  function one(id: number) {
+    return service.fetchUser(id);
+  }
+  return Promise.all(ids.map(one));
+}
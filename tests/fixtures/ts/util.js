@@ -0,0 +1,37 @@
+const DEFAULT_DELAY = 100;
+
+function sleep(ms) {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+async function retry(fn, attempts = 3) {
+  for (let i = 0; i < attempts; i++) {
+    try {
+      return await fn();
+    } catch (err) {
+      await sleep(DEFAULT_DELAY * (i + 1));
+    }
+  }
+  throw new Error("retry: attempts exhausted");
+}
+
+const formatName = function (name, titles) {
+  return [...titles, name].join(" ");
+};
+
+class Cache {
+  constructor() {
+    this.items = {};
+  }
+
+  get(key) {
+    return this.items[key];
+  }
+
+  set(key, value) {
+    this.items[key] = value;
+    return this.get(key);
+  }
+}
+
+module.exports = { retry, formatName, Cache };
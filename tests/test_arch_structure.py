@@ -50,8 +50,16 @@ def test_generate_architecture_outputs(tmp_path):
 
     nodes = [
         _node(repo_id, parent_id=None, kind="repo", path="/tmp/repo", symbol="repo"),
-        _node(pkg_codeindex, parent_id=repo_id, kind="pkg", path="src/codeindex", symbol="codeindex"),
-        _node(pkg_utils, parent_id=repo_id, kind="pkg", path="src/utils", symbol="utils"),
+        _node(
+            pkg_codeindex,
+            parent_id=repo_id,
+            kind="pkg",
+            path="src/codeindex",
+            symbol="codeindex",
+        ),
+        _node(
+            pkg_utils, parent_id=repo_id, kind="pkg", path="src/utils", symbol="utils"
+        ),
         _node(
             "file-cli",
             parent_id=pkg_codeindex,
@@ -99,7 +107,12 @@ def test_generate_architecture_outputs(tmp_path):
         ),
     ]
     edges = [
-        {"src": "file-cli", "dst": "utils.helper", "type": "import", "detail": "helper"},
+        {
+            "src": "file-cli",
+            "dst": "utils.helper",
+            "type": "import",
+            "detail": "helper",
+        },
     ]
     _write_jsonl(index_dir / "nodes.jsonl", nodes)
     _write_jsonl(index_dir / "edges.jsonl", edges)
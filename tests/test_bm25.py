@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+from codeindex.bm25 import BM25Index, index_path
+
+
+def _sample_index() -> BM25Index:
+    bm25 = BM25Index()
+    bm25.add_doc("a", "parse config file loader")
+    bm25.add_doc("b", "write index to disk")
+    bm25.add_doc("c", "load config from environment")
+    bm25.finalize()
+    return bm25
+
+
+def test_save_load_roundtrip(tmp_path: Path):
+    bm25 = _sample_index()
+    path = tmp_path / "bm25.bin"
+    bm25.save(str(path))
+
+    loaded = BM25Index.load(str(path))
+    assert loaded.N == bm25.N
+    assert loaded.avgdl == bm25.avgdl
+    assert loaded.search("config loader") == bm25.search("config loader")
+
+
+def test_save_load_roundtrip_big_endian(tmp_path: Path, monkeypatch):
+    bm25 = _sample_index()
+    path = tmp_path / "bm25.bin"
+    monkeypatch.setattr(sys, "byteorder", "big")
+    bm25.save(str(path))
+
+    loaded = BM25Index.load(str(path))
+    assert list(loaded.doc_len) == list(bm25.doc_len)
+    assert list(loaded.post_docs) == list(bm25.post_docs)
+    assert loaded.search("config loader") == bm25.search("config loader")
+
+
+def test_load_legacy_json(tmp_path: Path):
+    bm25 = _sample_index()
+    (tmp_path / "bm25.json").write_text(
+        json.dumps(
+            {
+                "k1": 1.5,
+                "b": 0.75,
+                "N": 3,
+                "avgdl": 4.0,
+                "df": {"parse": 1, "config": 2, "file": 1, "loader": 1},
+                "docs": {
+                    "a": {
+                        "dl": 4,
+                        "tf": {"parse": 1, "config": 1, "file": 1, "loader": 1},
+                    },
+                    "b": {"dl": 4, "tf": {"write": 1, "index": 1, "to": 1, "disk": 1}},
+                    "c": {
+                        "dl": 4,
+                        "tf": {"load": 1, "config": 1, "from": 1, "environment": 1},
+                    },
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    path = index_path(str(tmp_path))
+    assert path.endswith("bm25.json")
+    loaded = BM25Index.load(path)
+    assert loaded.search("config") == bm25.search("config")
@@ -12,7 +12,7 @@ from codeindex.doc_agent import render_node_doc
 from codeindex.indexer import build
 from codeindex.nodes import Node, NodeKind
 from codeindex.store import load_jsonl
-from codeindex.ts_indexer import TSFileIndexer
+from codeindex.ts_indexer import TSFileIndexer, TSParseError
 
 
 def _node_by_symbol(nodes, name, kind):
@@ -60,10 +60,33 @@ def boom(flag: bool) -> None:
     nodes, _, _, stats = indexer.index()
     func = _node_by_symbol(nodes, "boom", NodeKind.FUNC)
     raises = set(func.extra["doc"]["raises"])
-    assert raises == {"CustomError('wrapped')", "ValueError('bad flag')", "RuntimeError"}
+    assert raises == {
+        "CustomError('wrapped')",
+        "ValueError('bad flag')",
+        "RuntimeError",
+    }
     assert stats["funcs_with_raises"] == 1
 
 
+def test_python_generator_flag_ignores_nested_scopes():
+    source = """
+def outer():
+    def inner():
+        yield 1
+    return inner
+
+
+def gen(items):
+    yield from items
+"""
+    indexer = PyFileIndexer("gens.py", source, enrich=True, call_cap=50)
+    nodes, _, _, _ = indexer.index()
+    outer = _node_by_symbol(nodes, "outer", NodeKind.FUNC)
+    gen = _node_by_symbol(nodes, "gen", NodeKind.FUNC)
+    assert outer.extra["doc"]["flags"] == {"generator": False}
+    assert gen.extra["doc"]["flags"] == {"generator": True}
+
+
 def test_python_callsite_records_resolve_and_log():
     source = """
 def helper():
@@ -172,15 +195,87 @@ export function caller(msg: string) {
         assert func_row["extra"]["doc"]["params"]
 
         xref_path = out_dir / "xref_calls.jsonl"
-        xrefs = [json.loads(line) for line in xref_path.read_text(encoding="utf-8").splitlines() if line]
+        xrefs = [
+            json.loads(line)
+            for line in xref_path.read_text(encoding="utf-8").splitlines()
+            if line
+        ]
         assert any(entry["caller_id"] == func_row["node_id"] for entry in xrefs)
 
-        formatted = render_node_doc(_node_by_symbol(
-            [node_from_dict(r) for r in node_rows], "public_api", NodeKind.FUNC
-        ))
+        formatted = render_node_doc(
+            _node_by_symbol(
+                [node_from_dict(r) for r in node_rows], "public_api", NodeKind.FUNC
+            )
+        )
         assert "Args:" in formatted
 
 
+def test_rebuild_reuses_index_cache(tmp_path: Path, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "mod.py").write_text("def helper():\n    return 1\n", encoding="utf-8")
+    out_dir = tmp_path / "out"
+
+    build(str(repo), str(out_dir), summarizer="off", summary_scope="none")
+    first = (out_dir / "nodes.jsonl").read_text(encoding="utf-8")
+    assert list((out_dir / ".cache" / "ast").glob("*.pkl"))
+
+    def fail_index(*args, **kwargs):
+        raise AssertionError("cached file was re-indexed")
+
+    monkeypatch.setattr("codeindex.indexer.PyFileIndexer", fail_index)
+    build(str(repo), str(out_dir), summarizer="off", summary_scope="none")
+    assert (out_dir / "nodes.jsonl").read_text(encoding="utf-8") == first
+
+
+def test_rebuild_prunes_stale_index_cache(tmp_path: Path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    mod = repo / "mod.py"
+    mod.write_text("def helper():\n    return 1\n", encoding="utf-8")
+    out_dir = tmp_path / "out"
+    cache_dir = out_dir / ".cache" / "ast"
+
+    build(str(repo), str(out_dir), summarizer="off", summary_scope="none")
+    (stale,) = cache_dir.glob("*.pkl")
+    os.utime(stale, (0, 0))
+
+    mod.write_text("def helper():\n    return 2\n", encoding="utf-8")
+    build(str(repo), str(out_dir), summarizer="off", summary_scope="none")
+    entries = list(cache_dir.glob("*.pkl"))
+    assert len(entries) == 1
+    assert stale not in entries
+
+
+def test_ts_parse_failure_falls_back_to_file_node(tmp_path: Path, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "app.ts").write_text("export const a = 1;\n", encoding="utf-8")
+    out_dir = tmp_path / "out"
+
+    def fail_parse(*args, **kwargs):
+        raise TSParseError("no grammar")
+
+    monkeypatch.setattr("codeindex.indexer.index_file", fail_parse)
+    build(str(repo), str(out_dir), summarizer="off", summary_scope="none")
+    rows = list(load_jsonl(str(out_dir / "nodes.jsonl")))
+    (file_row,) = [r for r in rows if r["path"] == "app.ts"]
+    assert file_row["kind"] == NodeKind.FILE.value
+
+
+def test_ts_indexer_bug_is_not_swallowed(tmp_path: Path, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "app.ts").write_text("export const a = 1;\n", encoding="utf-8")
+
+    def buggy_index(*args, **kwargs):
+        raise KeyError("bug")
+
+    monkeypatch.setattr("codeindex.indexer.index_file", buggy_index)
+    with pytest.raises(KeyError):
+        build(str(repo), str(tmp_path / "out"), summarizer="off", summary_scope="none")
+
+
 def node_from_dict(data: dict) -> Node:
     return Node(
         node_id=data["node_id"],
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from codeindex.llm_search import (
+    EvalCache,
+    evaluate_node_relevance,
+    llm_guided_search,
+    rank_children,
+)
+
+
+class _StubClient:
+    """Records chat requests and answers them from canned JSON payloads."""
+
+    def __init__(self, evaluate: dict | None = None, rank: dict | None = None):
+        self.requests: list[dict] = []
+        self._evaluate = evaluate or {"relevant": False, "confidence": 0.0}
+        self._rank = rank or {"rankings": []}
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **params):
+        self.requests.append(params)
+        ranking = "rank which ones" in params["messages"][0]["content"]
+        payload = self._rank if ranking else self._evaluate
+        message = SimpleNamespace(content=json.dumps(payload))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def close(self):
+        pass
+
+
+def _node(node_id: str, kind: str, parent_id: str | None = None, **extra) -> dict:
+    return {
+        "node_id": node_id,
+        "parent_id": parent_id,
+        "kind": kind,
+        "symbol": node_id,
+        "path": f"{node_id}.py",
+        **extra,
+    }
+
+
+def test_eval_cache_roundtrip_and_persistence(tmp_path: Path):
+    cache = EvalCache.for_index(str(tmp_path))
+    key = EvalCache.key("evaluate", "model", "query")
+
+    assert cache.get(key) is None
+    cache.put(key, {"relevant": True})
+    assert cache.get(key) == {"relevant": True}
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+    reopened = EvalCache.for_index(str(tmp_path))
+    assert reopened.get(key) == {"relevant": True}
+    reopened.close()
+
+
+def test_eval_cache_key_is_stable_and_separates_parts():
+    assert EvalCache.key("a", "b") == EvalCache.key("a", "b")
+    assert EvalCache.key("ab", "c") != EvalCache.key("a", "bc")
+
+
+def test_evaluate_node_relevance_uses_cache(tmp_path: Path):
+    cache = EvalCache.for_index(str(tmp_path))
+    client = _StubClient(
+        evaluate={"relevant": True, "confidence": 0.8, "is_answer": True}
+    )
+    node = _node("f", "func", summary="parses config")
+
+    async def evaluate(node: dict, model: str = "m"):
+        return await evaluate_node_relevance(
+            node, "config", model=model, client=client, cache=cache
+        )
+
+    first = asyncio.run(evaluate(node))
+    second = asyncio.run(evaluate(node))
+    assert first == second
+    assert first.confidence == 0.8
+    assert len(client.requests) == 1
+
+    # Anything that changes the prompt is a different key
+    asyncio.run(evaluate({**node, "summary": "writes config"}))
+    asyncio.run(evaluate(node, model="other"))
+    assert len(client.requests) == 3
+    cache.close()
+
+
+def test_rank_children_cache_key_covers_parent_context(tmp_path: Path):
+    cache = EvalCache.for_index(str(tmp_path))
+    client = _StubClient(rank={"rankings": [{"index": 1, "score": 0.7}]})
+    children = [_node("a", "file", "root"), _node("b", "file", "root")]
+
+    async def rank(parent_context: str):
+        return await rank_children(
+            children,
+            "config",
+            parent_context=parent_context,
+            model="m",
+            client=client,
+            cache=cache,
+        )
+
+    first = asyncio.run(rank("Parent: pkg"))
+    assert [r.child_id for r in first] == ["a"]
+    assert asyncio.run(rank("Parent: pkg")) == first
+    assert len(client.requests) == 1
+
+    asyncio.run(rank("Parent: other"))
+    assert len(client.requests) == 2
+    cache.close()
+
+
+def test_llm_search_pops_ties_in_push_order(monkeypatch):
+    nodes = {
+        "root": _node("root", "repo"),
+        "n_a": _node("n_a", "file", "root"),
+        "n_b": _node("n_b", "file", "root"),
+        "n_c": _node("n_c", "file", "root"),
+    }
+    children_index = {"root": ["n_a", "n_b", "n_c"]}
+    # Ranked c, b, a: b scores highest, then the tied c and a in that order.
+    client = _StubClient(
+        rank={
+            "rankings": [
+                {"index": 3, "score": 0.5},
+                {"index": 2, "score": 0.9},
+                {"index": 1, "score": 0.5},
+            ]
+        }
+    )
+    monkeypatch.setattr("codeindex.llm_search.AsyncOpenAI", lambda **kw: client)
+    monkeypatch.setattr("codeindex.llm_search.pooled_http_client", lambda n: None)
+
+    result = asyncio.run(
+        llm_guided_search(nodes, children_index, "config", model="m", beam=1)
+    )
+
+    evaluated = [e["node_id"] for e in result["trace"] if e["event"] == "evaluate"]
+    assert evaluated == ["root", "n_b", "n_c", "n_a"]
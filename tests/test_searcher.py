@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import heapq
+import json
+from pathlib import Path
+
+import pytest
+
+from codeindex.indexer import build
+from codeindex.searcher import (
+    aggregate_desc_scores,
+    aggregate_scores,
+    load_bm25,
+    load_tree,
+    search,
+)
+
+_FILES = {
+    "config/loader.py": """
+def load_config(path):
+    return parse_config(read_file(path))
+
+
+def parse_config(text):
+    return dict(line.split("=") for line in text.splitlines())
+
+
+def read_file(path):
+    with open(path) as f:
+        return f.read()
+""",
+    "config/env.py": """
+def config_from_env(environ):
+    return {k: v for k, v in environ.items() if k.startswith("APP_")}
+
+
+def merge_config(base, override):
+    return {**base, **override}
+""",
+    "store/writer.py": """
+class IndexWriter:
+    def write_index(self, rows):
+        for row in rows:
+            self.write_row(row)
+
+    def write_row(self, row):
+        self.rows.append(row)
+
+
+def flush_index(writer, path):
+    writer.write_index([])
+""",
+    "store/reader.py": """
+def read_index(path):
+    return load_rows(path)
+
+
+def load_rows(path):
+    return [line for line in open(path)]
+""",
+}
+
+
+@pytest.fixture(scope="module")
+def index_dir(tmp_path_factory) -> str:
+    root = tmp_path_factory.mktemp("search")
+    repo = root / "repo"
+    for rel, source in _FILES.items():
+        (repo / rel).parent.mkdir(parents=True, exist_ok=True)
+        (repo / rel).write_text(source, encoding="utf-8")
+    out = root / "index"
+    build(str(repo), str(out), summarizer="off", summary_scope="none")
+    return str(out)
+
+
+def _reference_search(index_dir: str, query: str, top: int, budget: int) -> list:
+    """The original best-first search: recursive subtree sums, every child
+    pushed (top 10 by score), no pruning. Zero-score answers, which only
+    padded short result lists, are dropped as search() now does."""
+    nodes, _, children, root, _ = load_tree(index_dir)
+    top_bm25 = load_bm25(index_dir).search(query, top_k=max(top * 20, 200))
+    local_scores = dict(top_bm25)
+
+    def node_score(nid: str) -> float:
+        n = nodes[nid]
+        bonus = sum(
+            0.1
+            for w in query.lower().split()
+            if w in (n.get("symbol") or "").lower()
+            or w in (n.get("path") or "").lower()
+        )
+        return aggregate_desc_scores(nid, children, local_scores) + bonus
+
+    frontier = [(-node_score(root), root)]
+    visited: set[str] = set()
+    answers = []
+    steps = 0
+    while frontier and steps < budget:
+        steps += 1
+        _, nid = heapq.heappop(frontier)
+        if nid in visited:
+            continue
+        visited.add(nid)
+        if nodes[nid]["kind"] in ("func", "block", "const"):
+            local = local_scores.get(nid, 0.0)
+            answers.append((nid, local * 2.0 + node_score(nid)))
+            continue
+        kids = sorted(children.get(nid, []), key=node_score, reverse=True)
+        for k in kids[:10]:
+            heapq.heappush(frontier, (-node_score(k), k))
+    answers.sort(key=lambda a: a[1], reverse=True)
+    return [a for a in answers if a[1] > 0.0][:top]
+
+
+@pytest.mark.parametrize("top", [1, 3])
+@pytest.mark.parametrize(
+    "query", ["config", "load config", "write index", "read path", "rows"]
+)
+def test_search_matches_reference_ranking(index_dir: str, query: str, top: int):
+    res = search(index_dir, query, top=top, emit_trace=False)
+
+    expected = _reference_search(index_dir, query, top=top, budget=120)
+    assert [r["node_id"] for r in res["results"]] == [nid for nid, _ in expected]
+    for r, (_, hybrid) in zip(res["results"], expected):
+        assert r["hybrid_score"] == pytest.approx(hybrid)
+
+
+def test_search_skips_unscored_nodes(index_dir: str):
+    res = search(index_dir, "merge", top=10, emit_trace=False)
+
+    assert [r["symbol"] for r in res["results"]] == ["merge_config"]
+    assert all(r["hybrid_score"] > 0.0 for r in res["results"])
+
+
+def test_aggregate_scores_only_visits_scored_ancestors(index_dir: str):
+    _, parents, children, root, _ = load_tree(index_dir)
+    local = dict(load_bm25(index_dir).search("config", top_k=200))
+
+    agg = aggregate_scores(root, children, local, parents)
+    full = aggregate_scores(root, children, local)
+
+    assert agg[root] == full[root] == aggregate_desc_scores(root, children, local)
+    for nid, score in full.items():
+        if score > 0.0:
+            assert agg[nid] == score
+        else:
+            assert nid not in agg
+
+
+def test_index_loaders_reload_rebuilt_index(tmp_path: Path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    mod = repo / "mod.py"
+    mod.write_text("def alpha():\n    return 1\n", encoding="utf-8")
+    out = str(tmp_path / "index")
+    build(str(repo), out, summarizer="off", summary_scope="none")
+
+    tree = load_tree(out)
+    bm25 = load_bm25(out)
+    assert load_tree(out) is tree
+    assert load_bm25(out) is bm25
+
+    mod.write_text(
+        "def alpha():\n    return 1\n\n\ndef beta_helper():\n    return 2\n",
+        encoding="utf-8",
+    )
+    build(str(repo), out, summarizer="off", summary_scope="none")
+
+    assert load_tree(out) is not tree
+    assert load_bm25(out) is not bm25
+    res = search(out, "beta", top=5, emit_trace=False)
+    assert [r["symbol"] for r in res["results"]] == ["beta_helper"]
+
+
+def _script_rows(path: Path, name: str) -> list:
+    raw = path.read_text(encoding="utf-8")
+    prefix = f"window.{name} = "
+    assert raw.startswith(prefix)
+    return json.loads(raw[len(prefix) :].rstrip().rstrip(";"))
+
+
+def test_trace_viewer_files(tmp_path: Path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    mod = repo / "mod.py"
+    mod.write_text(
+        "def alpha():\n    return beta()\n\n\ndef beta():\n    return 1\n",
+        encoding="utf-8",
+    )
+    out = str(tmp_path / "index")
+    build(str(repo), out, summarizer="off", summary_scope="none")
+    tdir = Path(out) / "trace"
+
+    res = search(out, "alpha", emit_trace=False)
+    assert res["trace_path"] is None
+    assert not tdir.exists()
+
+    res = search(out, "alpha", emit_html=False)
+    assert res["html"] is None
+    assert sorted(p.name for p in tdir.iterdir()) == ["last_trace.json", "results.json"]
+
+    res = search(out, "alpha")
+    assert res["html"] == str(tdir / "trace.html")
+    html = (tdir / "trace.html").read_text(encoding="utf-8")
+    assert '<script src="trace_data.js">' in html
+    assert '<script src="trace_nodes.js">' in html
+    # Edges are only loaded on demand, not by a <script> tag in the page
+    assert '<script src="trace_edges.js">' not in html
+    assert "'trace_edges.js'" in html
+    assert _script_rows(tdir / "trace_data.js", "DATA")["query"] == "alpha"
+    nodes = _script_rows(tdir / "trace_nodes.js", "NODES")
+    assert len(nodes) == len(
+        (Path(out) / "nodes.jsonl").read_text(encoding="utf-8").splitlines()
+    )
+    assert _script_rows(tdir / "trace_edges.js", "EDGES")
+
+    # Node/edge scripts are kept while the index is unchanged...
+    nodes_mtime = (tdir / "trace_nodes.js").stat().st_mtime_ns
+    search(out, "beta")
+    assert _script_rows(tdir / "trace_data.js", "DATA")["query"] == "beta"
+    assert (tdir / "trace_nodes.js").stat().st_mtime_ns == nodes_mtime
+
+    # ...and rewritten once it is rebuilt.
+    mod.write_text(
+        mod.read_text(encoding="utf-8") + "\n\ndef gamma():\n    return 2\n",
+        encoding="utf-8",
+    )
+    build(str(repo), out, summarizer="off", summary_scope="none")
+    search(out, "gamma")
+    symbols = {n["symbol"] for n in _script_rows(tdir / "trace_nodes.js", "NODES")}
+    assert "gamma" in symbols
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import ClassVar
+
+import pytest
+
+from codeindex.indexer import build
+from codeindex.summarizer import pooled_http_client, summarize_many_async
+
+
+class _StubOpenAI:
+    """AsyncOpenAI stand-in that counts chat requests across instances."""
+
+    requests: ClassVar[list[dict]] = []
+
+    def __init__(self, **kwargs):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **params):
+        self.requests.append(params)
+        code = params["messages"][-1]["content"].rsplit("--- CODE/CONTEXT ---\n", 1)
+        message = SimpleNamespace(content=f"summary of {code[-1]}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+@pytest.fixture
+def stub_openai(monkeypatch) -> type[_StubOpenAI]:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr("openai.AsyncOpenAI", _StubOpenAI)
+    monkeypatch.setattr("codeindex.summarizer.pooled_http_client", lambda n: None)
+    monkeypatch.setattr(_StubOpenAI, "requests", [])
+    return _StubOpenAI
+
+
+def test_pooled_http_client_with_aiohttp_extra():
+    pytest.importorskip("aiohttp")
+
+    client = pooled_http_client(4)
+
+    assert client is not None
+    assert client._transport.limits.max_connections == 4
+    assert client._transport.limits.max_keepalive_connections == 4
+    asyncio.run(client.aclose())
+
+
+def test_summaries_are_deduped_and_cached(tmp_path: Path, stub_openai):
+    cache_dir = str(tmp_path / "summaries")
+    texts = ["def a(): pass", "def b(): pass", "def a(): pass"]
+
+    first = asyncio.run(summarize_many_async(texts, model="m", cache_dir=cache_dir))
+    assert first == [f"summary of {t}" for t in texts]
+    assert len(stub_openai.requests) == 2
+
+    second = asyncio.run(summarize_many_async(texts, model="m", cache_dir=cache_dir))
+    assert second == first
+    assert len(stub_openai.requests) == 2
+
+
+def test_rebuild_prunes_stale_summary_cache(tmp_path: Path, stub_openai):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    mod = repo / "mod.py"
+    mod.write_text("def helper():\n    return 1\n", encoding="utf-8")
+    out_dir = tmp_path / "out"
+    cache_dir = out_dir / ".cache" / "summaries"
+
+    def rebuild():
+        build(str(repo), str(out_dir), summarizer="m", min_loc_for_summary=1)
+
+    rebuild()
+    stale = set(cache_dir.glob("*.txt"))
+    assert stale
+    for entry in stale:
+        os.utime(entry, (0, 0))
+
+    mod.write_text("def helper():\n    return 2\n", encoding="utf-8")
+    rebuild()
+    entries = set(cache_dir.glob("*.txt"))
+    assert entries
+    assert not entries & stale
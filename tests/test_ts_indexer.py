@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from codeindex.ts_indexer import TSFileIndexer
+
+FIXTURES = Path(__file__).parent / "fixtures" / "ts"
+GOLDEN = FIXTURES / "golden.json"
+SOURCES = ["service.ts", "util.js"]
+
+
+def _index(name: str) -> dict:
+    source = (FIXTURES / name).read_text(encoding="utf-8")
+    nodes, edges, callsites, stats = TSFileIndexer(name, source, enrich=True).index()
+    result = {"nodes": nodes, "edges": edges, "callsites": callsites, "stats": stats}
+    return json.loads(json.dumps(result, default=asdict))
+
+
+@pytest.mark.skipif(os.getenv("CI") == "true", reason="tree-sitter setup required")
+@pytest.mark.parametrize("name", SOURCES)
+def test_ts_indexer_matches_golden(name: str):
+    """Nodes, edges, callsites and stats for each fixture are pinned in
+    golden.json; regenerate it with CODEINDEX_UPDATE_GOLDEN=1 after an
+    intended output change (and bump ts_indexer.INDEXER_VERSION)."""
+    actual = _index(name)
+    if os.getenv("CODEINDEX_UPDATE_GOLDEN") == "1":
+        golden = (
+            json.loads(GOLDEN.read_text(encoding="utf-8")) if GOLDEN.exists() else {}
+        )
+        golden[name] = actual
+        GOLDEN.write_text(
+            json.dumps(golden, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+
+    expected = json.loads(GOLDEN.read_text(encoding="utf-8"))[name]
+    assert actual == expected